@@ -0,0 +1,197 @@
+"""챗봇 답변 캐시
+
+키 = (정규화된 질문, 시트 스냅샷 버전). 같은 프로필에 같은 질문이면 LLM 을 다시
+부르지 않는다. LRU + TTL 로 크기를 제한하고, 글자 bigram 유사도로
+"MBTI가 어떻게 되나요?" / "MBTI는 어떻게 되나요" 같은 거의 같은 질문도 잡아낸다.
+backend(shared_cache.SQLiteCache)를 주면 워커 프로세스끼리 답변을 나눠 쓴다 — 로컬에 없으면
+공유 캐시에서 같은 키 1건만 찾아 보고, 만든 답변은 양쪽에 저장. 다른 워커 답변 전체(비슷한 질문 찾기용)는
+SYNC_INTERVAL 마다 한 번, 지난번 이후 새로 들어온 것만 가져온다.
+FAQ 미리 만들기는 질문마다 잠금을 잡은 워커 1개만.
+"""
+import re
+import threading
+import time
+from collections import OrderedDict
+
+PREWARM_LEASE = 120   # FAQ 답변 1개를 만드는 동안 다른 워커가 같은 질문을 건너뛰는 시간 (초)
+SYNC_INTERVAL = 30    # 다른 워커 답변을 한꺼번에 가져오는 최소 간격 (초, 버전별)
+SYNC_OVERLAP = 2      # 가져온 시점보다 이만큼 앞부터 다시 본다 (쓰는 중이던 행을 놓치지 않도록)
+
+_NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+
+def normalize_question(text):
+    # 소문자 + 공백/문장부호 제거 ("MBTI가 어떻게 되나요?" → "mbti가어떻게되나요")
+    return _NON_WORD.sub("", str(text).lower())
+
+
+def char_bigrams(text):
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def dice_similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class AnswerCache:
+    def __init__(self, maxsize=512, ttl=6 * 3600, similarity=0.8, backend=None):
+        # similarity=None 이면 정확히 같은 질문만 히트
+        # backend: 워커끼리 같이 쓰는 캐시 (없으면 프로세스 메모리만)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.similarity = similarity
+        self.backend = backend
+        self._entries = OrderedDict()   # (version, 정규화 질문) → (답변, bigram, 만료시각)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.shared_hits = 0   # 로컬에 없고 다른 워커가 만든 답변으로 히트 (hits / near_hits 에도 포함)
+        self._synced = {}      # version → (마지막으로 가져온 시각, 다음에 볼 stored_at 하한)
+
+    @staticmethod
+    def _shared_key(version, norm):
+        return f"answer:{version}:{norm}"
+
+    def _store(self, version, rows):
+        """(정규화 질문, 답변, 만료시각) 들을 로컬에 — 로컬 것이 더 오래 유효하면 그대로 → 넣은 수"""
+        stored = 0
+        with self._lock:
+            for norm, answer, expires in rows:
+                entry = self._entries.get((version, norm))
+                if entry is not None and entry[2] >= expires:
+                    continue
+                self._entries[(version, norm)] = (answer, char_bigrams(norm), expires)
+                self._entries.move_to_end((version, norm))
+                stored += 1
+            if stored:
+                self._evict()
+        return stored
+
+    def _sync(self, version, force=False):
+        """다른 워커가 이 버전에 새로 넣은 답변을 가져온다 (SYNC_INTERVAL 에 1번) → 가져온 수"""
+        if self.backend is None:
+            return 0
+        now = time.time()
+        with self._lock:
+            last_sync, watermark = self._synced.get(version, (0.0, None))
+            if not force and now - last_sync < SYNC_INTERVAL:
+                return 0
+            self._synced[version] = (now, now - SYNC_OVERLAP)
+        prefix = self._shared_key(version, "")
+        rows = self.backend.scan(prefix, since=watermark)
+        return self._store(version, [(key[len(prefix):], answer, expires or now + self.ttl)
+                                     for key, answer, expires in rows])
+
+    def get(self, question, version):
+        norm = normalize_question(question)
+        answer = self._lookup(norm, version)
+        if answer is None and self.backend is not None:
+            # 같은 질문을 다른 워커가 만들었는지만 키 1건으로 (어차피 LLM 으로 갈 요청이라 전체는 보지 않음)
+            answer = self.backend.get(self._shared_key(version, norm))
+            if answer is not None:
+                self._store(version, [(norm, answer, time.time() + self.ttl)])
+                self.hits += 1
+                self.shared_hits += 1
+            elif self._sync(version):
+                answer = self._lookup(norm, version)   # 새로 받은 답변 중 비슷한 질문
+                if answer is not None:
+                    self.shared_hits += 1
+        if answer is None:
+            self.misses += 1
+        return answer
+
+    def _lookup(self, norm, version):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get((version, norm))
+            if entry is not None and entry[2] > now:
+                self._entries.move_to_end((version, norm))
+                self.hits += 1
+                return entry[0]
+
+            if self.similarity is not None:
+                grams = char_bigrams(norm)
+                best, best_score = None, self.similarity
+                for key, (answer, other, expires) in self._entries.items():
+                    if key[0] != version or expires <= now:
+                        continue
+                    score = dice_similarity(grams, other)
+                    if score >= best_score:
+                        best, best_score = key, score
+                if best is not None:
+                    self._entries.move_to_end(best)
+                    self.near_hits += 1
+                    return self._entries[best][0]
+            return None
+
+    def closest(self, question, version, min_similarity=0.3):
+        """한도 초과 등으로 LLM 을 못 부를 때 — 같은 버전에서 가장 비슷한 답변 (만료된 것 포함)"""
+        self._sync(version)
+        grams = char_bigrams(normalize_question(question))
+        best, best_score = None, min_similarity
+        with self._lock:
+            for key, (answer, other, _) in self._entries.items():
+                if key[0] != version:
+                    continue
+                score = dice_similarity(grams, other)
+                if score >= best_score:
+                    best, best_score = answer, score
+        return best
+
+    def put(self, question, version, answer):
+        norm = normalize_question(question)
+        with self._lock:
+            self._entries[(version, norm)] = (answer, char_bigrams(norm), time.time() + self.ttl)
+            self._entries.move_to_end((version, norm))
+            self._evict()
+        if self.backend is not None:
+            self.backend.put(self._shared_key(version, norm), answer, ttl=self.ttl)
+
+    def _evict(self):
+        now = time.time()
+        # 만료 항목 정리 후 오래 안 쓰인 순서로 제거
+        # (이전 스냅샷 버전 답변은 더 이상 조회되지 않으므로 자연히 밀려난다)
+        for key in [k for k, v in self._entries.items() if v[2] <= now]:
+            del self._entries[key]
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def prewarm(self, questions, answer_fn, version):
+        """캐시에 없는 질문만 answer_fn 으로 미리 만들어 둔다 (백그라운드 스레드용)
+        공유 캐시가 있으면 다른 워커가 이미 만들었거나 만드는 중인 질문은 건너뛴다"""
+        self._sync(version, force=True)
+        warmed = 0
+        for q in questions:
+            norm = normalize_question(q)
+            if (version, norm) in self._entries:
+                continue
+            try:
+                if self.backend is None:
+                    self.put(q, version, answer_fn(q))
+                    warmed += 1
+                    continue
+                key = self._shared_key(version, norm)
+                with self.backend.lease(key, PREWARM_LEASE) as owned:
+                    # 잠금을 잡는 사이 다른 워커가 끝냈을 수 있다
+                    if owned and self.backend.get(key) is None:
+                        self.put(q, version, answer_fn(q))
+                        warmed += 1
+            except Exception:
+                continue
+        return warmed
+
+    def stats(self):
+        lookups = self.hits + self.near_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "near_hits": self.near_hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "hit_ratio": round((self.hits + self.near_hits) / lookups, 3) if lookups else 0.0,
+        }
@@ -0,0 +1,186 @@
+"""상호작용 1회당 스크립트 실행 시간 — 전체 재실행 vs fragment 재실행
+
+브라우저에서 @st.fragment 안의 위젯을 누르면 그 fragment 함수만 다시 실행된다.
+AppTest 는 항상 스크립트 전체를 다시 실행하므로, fragment 모드에서는 재실행 요청에
+해당 fragment id 를 실어 보내 브라우저와 같은 부분 재실행을 흉내 낸다.
+
+시간은 스크립트 스레드 안의 실행 시간 (AppTest 가 결과를 기다리며 폴링하는 시간 제외,
+st.rerun() 으로 한 번 더 돈 실행은 합산). 다시 보낸 화면 요소(delta) 수도 같이 센다.
+실제 서버처럼 스크립트 바이트코드 캐시(ScriptCache)를 실행 사이에 공유한다 —
+AppTest 기본값은 실행마다 새로 컴파일해서 (~40ms) 스크립트 자체 시간을 가린다.
+
+    python bench/bench_fragments.py                 # 상호작용별 app / fragment 재실행 시간
+    python bench/bench_fragments.py --repeat 20 --json out.json
+
+시트는 로컬 서버(fixtures), OpenAI 는 가짜 클라이언트 (bench_routes 와 같은 대역).
+"""
+import argparse
+import functools
+import inspect
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from unittest import mock
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+os.environ.setdefault("QR_LANDING_CACHE_DIR", tempfile.mkdtemp(prefix="qr-bench-"))
+
+from streamlit.runtime.scriptrunner import RerunData  # noqa: E402
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache  # noqa: E402
+from streamlit.testing.v1 import local_script_runner  # noqa: E402
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner  # noqa: E402
+
+from bench_routes import _new_app, setup  # noqa: E402
+from fake_services import SheetServer  # noqa: E402
+
+
+# -----------------------------
+# 상호작용 — (라우트, 준비 단계, 측정할 단계, 다시 실행될 fragment 함수 이름)
+# -----------------------------
+def _click(label):
+    def step(at):
+        next(b for b in at.button if label in b.label).click()
+    return step
+
+
+def _select(label, index):
+    def step(at):
+        next(s for s in at.selectbox if label in s.label).select_index(index)
+    return step
+
+
+def _type(text):
+    def step(at):
+        at.text_input[0].input(text)
+    return step
+
+
+def _ask(question):
+    def step(at):
+        next(t for t in at.text_input if "질문" in t.label).input(question)
+        next(b for b in at.button if b.label == "전송").click()
+    return step
+
+
+INTERACTIONS = {
+    "etc_sido": ("etc", [], _select("1단계", 1), "region_picker"),
+    "etc_search": ("etc", [], _type("ㅇㅅ"), "region_picker"),
+    "etc_recommend": ("etc", [_click("추천")], _click("추천"), "recommendation_result"),   # 두 번째는 저장소 적중
+    "contact_faq": ("contact", [], _click("취미"), "chat_panel"),
+    "contact_ask": ("contact", [], _ask("취미는 뭐에요?"), "chat_panel"),
+}
+
+
+def fragment_id(at, name):
+    """직전 실행에서 등록된 fragment 중 함수 이름이 name 인 것의 id (없으면 None)"""
+    for fid, fragment in at._fragment_storage._fragments.items():
+        func = inspect.getclosurevars(fragment).nonlocals.get("non_optional_func")
+        if func is not None and func.__name__ == name:
+            return fid
+    return None
+
+
+def run_scoped(at, fid):
+    # 다음 at.run() 한 번만 fragment 재실행 요청으로 바꾼다 (브라우저가 보내는 요청과 같은 모양).
+    # 러너가 만들 때 넣는 기본 요청(전체 실행)과 합쳐지면 전체 실행이 되므로 둘 다 바꾼다
+    scoped = functools.partial(RerunData, fragment_id_queue=[fid])
+    with mock.patch.object(local_script_runner, "RerunData", scoped):
+        at.run()
+
+
+_script_runs = []   # 스크립트 스레드가 기록하는 (실행 시간, delta 수)
+
+
+def _timed_run_script(original):
+    def run_script(self, rerun_data):
+        sent = len(self.forward_msg_queue._queue)
+        start = time.perf_counter()
+        try:
+            return original(self, rerun_data)
+        finally:
+            deltas = sum(1 for msg in self.forward_msg_queue._queue[sent:] if msg.HasField("delta"))
+            _script_runs.append((time.perf_counter() - start, deltas))
+    return run_script
+
+
+def measure(name, mode):
+    """상호작용 1회 → (스크립트 실행 시간 초, delta 수). fragment 모드인데 fragment 가 없으면 None"""
+    route, prepare, action, fragment = INTERACTIONS[name]
+    at = _new_app(route)
+    at.run()
+    for step in prepare:
+        step(at)
+        at.run()
+    fid = fragment_id(at, fragment) if mode == "fragment" else None
+    if mode == "fragment" and fid is None:
+        return None
+    action(at)
+    del _script_runs[:]
+    if fid is None:
+        at.run()
+    else:
+        run_scoped(at, fid)
+    if at.exception:
+        raise RuntimeError(f"{name}/{mode}: {at.exception[0].value}")
+    return sum(t for t, _ in _script_runs), sum(d for _, d in _script_runs)
+
+
+def summarize(samples):
+    if not samples:
+        return None
+    ms = sorted(t * 1000 for t, _ in samples)
+    return {
+        "p50": round(statistics.median(ms), 2),
+        "min": round(ms[0], 2),
+        "deltas": samples[-1][1],
+        "n": len(ms),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="상호작용별 전체 / fragment 재실행 시간")
+    parser.add_argument("--interaction", action="append", choices=list(INTERACTIONS))
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args(argv)
+
+    results = {}
+    timed = _timed_run_script(LocalScriptRunner._run_script)
+    script_cache = ScriptCache()
+    with SheetServer() as server, \
+            mock.patch.object(LocalScriptRunner, "_run_script", timed), \
+            mock.patch.object(local_script_runner, "ScriptCache", lambda: script_cache):
+        setup({name: server.url(name) for name in ("profile", "career", "mbti")},
+              llm_latency=0.0, token_latency=0.0)
+        for name in args.interaction or INTERACTIONS:
+            results[name] = {}
+            for mode in ("app", "fragment"):
+                samples = [measure(name, mode) for _ in range(args.repeat)]
+                results[name][mode] = summarize([s for s in samples if s is not None])
+
+    header = (f"{'interaction':<16}{'app ms':>9}{'deltas':>8}"
+              f"{'fragment ms':>13}{'deltas':>8}{'speedup':>9}")
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        app, frag = r["app"], r["fragment"] or {}
+        speedup = f"x{app['p50'] / frag['p50']:.1f}" if frag else "-"
+        print(f"{name:<16}{app['p50']:>9}{app['deltas']:>8}"
+              f"{frag.get('p50', '-'):>13}{frag.get('deltas', '-'):>8}{speedup:>9}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,202 @@
+"""시작 시간(import) 벤치마크 — python -X importtime
+
+라우트마다 새 프로세스(= 막 뜬 앱 워커)에서 첫 화면을 한 번 그리고, 그동안 새로 import 된
+모듈과 누적 import 시간을 -X importtime 출력에서 모은다. streamlit 자체 import 는 제외.
+시트는 로컬 서버(fixtures), OpenAI 는 가짜 클라이언트 (bench_routes 와 같은 대역).
+
+홈/기타 화면은 무거운 라이브러리(LAZY_MODULES) 없이 떠야 한다 — 시트 파싱(pandas),
+OpenAI 클라이언트(openai/httpx), 사진 변환(Pillow), 시트/사진 요청(requests)은 처음 쓸 때 import.
+
+    python bench/bench_imports.py                   # 라우트별 import 시간 + 무거운 모듈 상위 목록
+    python bench/bench_imports.py --check           # 금지 모듈 import / 기준선 대비 회귀 시 exit 1
+    python bench/bench_imports.py --save-baseline   # 결과를 bench/import_baseline.json 에 저장
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_PATH = os.path.join(BENCH_DIR, "import_baseline.json")
+
+ROUTES = ["home", "about", "career", "contact", "etc"]
+# 처음 쓸 때까지 import 하지 않는 무거운 라이브러리
+LAZY_MODULES = ["pandas", "numpy", "openai", "httpx", "PIL", "requests"]
+# LAZY_MODULES 를 하나도 import 하지 않아야 하는 화면
+LEAN_ROUTES = ["home", "etc"]
+
+MARKER = "-- bench_imports: first run --"
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_importtime(stderr, marker=None):
+    """-X importtime 출력 → [(모듈, 누적 µs)] (최상위 import 만, marker 이후만)"""
+    lines = stderr.splitlines()
+    if marker is not None:
+        lines = lines[lines.index(marker) + 1:] if marker in lines else []
+    top = []
+    for line in lines:
+        m = _LINE_RE.match(line)
+        # 들여쓰기 1칸 = 최상위 (중첩 import 는 상위 항목의 누적 시간에 이미 포함)
+        if m and len(m.group(3)) == 1:
+            top.append((m.group(4), int(m.group(2))))
+    return top
+
+
+def route_worker(route, env):
+    """(워커 프로세스) 첫 화면 1회 — 새로 import 된 모듈 목록을 stdout 에 JSON 으로"""
+    from bench_routes import _new_app, setup
+
+    before = set(sys.modules)
+    print(MARKER, file=sys.stderr, flush=True)
+    setup(**env)
+    at = _new_app(route)
+    at.run()
+    return {
+        "modules": sorted(set(sys.modules) - before),
+        "exception": at.exception[0].value if at.exception else "",
+    }
+
+
+def measure_route(route, env):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", __file__, "--worker", route, "--env", json.dumps(env)],
+        capture_output=True,
+        text=True,
+    )
+    out = proc.stdout.strip().splitlines()
+    if proc.returncode != 0 or not out:
+        raise RuntimeError(f"{route}: worker exit {proc.returncode}\n{proc.stderr[-2000:]}")
+    result = json.loads(out[-1])
+    top = parse_importtime(proc.stderr, MARKER)
+    roots = {name.split(".")[0] for name in result["modules"]}
+    return {
+        "import_ms": round(sum(us for _, us in top) / 1000, 1),
+        "modules": len(result["modules"]),
+        "lazy_loaded": [name for name in LAZY_MODULES if name in roots],
+        "top": [(name, round(us / 1000, 1)) for name, us in sorted(top, key=lambda x: -x[1])[:10]],
+        "exception": result["exception"],
+    }
+
+
+def measure_module(name):
+    """무거운 라이브러리 하나의 단독 import 시간 (ms, 새 프로세스)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {name}"],
+        capture_output=True,
+        text=True,
+    )
+    return round(sum(us for _, us in parse_importtime(proc.stderr)) / 1000, 1)
+
+
+def best_of(repeat, fn, *args):
+    # import 시간은 디스크 캐시 상태에 따라 흔들리므로 여러 번 재서 가장 빠른 값
+    runs = [fn(*args) for _ in range(repeat)]
+    return min(runs, key=lambda r: r["import_ms"])
+
+
+# -----------------------------
+# 기준선
+# -----------------------------
+def check(results, baseline, tolerance):
+    problems = []
+    for route, r in results.items():
+        if r["exception"]:
+            problems.append(f"{route}: 예외 {r['exception']}")
+        if route in LEAN_ROUTES and r["lazy_loaded"]:
+            problems.append(f"{route}: 지연 import 대상이 import 됨 {r['lazy_loaded']}")
+        base = baseline.get("results", {}).get(route)
+        if base and base.get("import_ms"):
+            ratio = r["import_ms"] / base["import_ms"]
+            r["vs_baseline"] = round(ratio, 2)
+            if ratio > 1 + tolerance:
+                problems.append(f"{route}: import {base['import_ms']}ms → {r['import_ms']}ms (x{ratio:.2f})")
+    return problems
+
+
+def print_table(results, lazy_costs):
+    header = f"{'route':<10}{'import ms':>11}{'modules':>9}{'vs base':>9}  heavy libs"
+    print(header)
+    print("-" * len(header))
+    for route, r in results.items():
+        print(f"{route:<10}{r['import_ms']:>11}{r['modules']:>9}{r.get('vs_baseline', ''):>9}  "
+              f"{', '.join(r['lazy_loaded']) or '-'}")
+    print()
+    print("지연 import 대상 (단독 import ms): "
+          + ", ".join(f"{name} {ms}" for name, ms in lazy_costs.items()))
+    for route, r in results.items():
+        print(f"\n[{route}] 상위 import")
+        for name, ms in r["top"]:
+            print(f"  {ms:>8} ms  {name}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QR 랜딩 import 시간 벤치마크")
+    parser.add_argument("--route", action="append", choices=ROUTES, help="특정 라우트만 (여러 번 지정 가능)")
+    parser.add_argument("--repeat", type=int, default=3, help="라우트별 측정 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--check", action="store_true", help="금지 모듈 import / 기준선 대비 회귀가 있으면 exit 1")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="허용 회귀 비율 (0.5 = 50%%)")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    # 내부용: 라우트 워커 프로세스
+    parser.add_argument("--worker", choices=ROUTES, help=argparse.SUPPRESS)
+    parser.add_argument("--env", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, BENCH_DIR)
+    if args.worker:
+        print(json.dumps(route_worker(args.worker, json.loads(args.env))))
+        return 0
+
+    from fake_services import SheetServer
+
+    routes = args.route or ROUTES
+    results = {}
+    with SheetServer() as server:
+        env = {
+            "sheet_urls": {name: server.url(name) for name in ("profile", "career", "mbti")},
+            "llm_latency": 0.0,
+            "token_latency": 0.0,
+        }
+        for route in routes:
+            print(f"▶ {route} (x{args.repeat})", file=sys.stderr)
+            results[route] = best_of(args.repeat, measure_route, route, env)
+    lazy_costs = {name: measure_module(name) for name in LAZY_MODULES}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    problems = check(results, baseline, args.tolerance)
+
+    print_table(results, lazy_costs)
+    for line in problems:
+        print(f"⚠️ {line}")
+
+    payload = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+        "lazy_modules_ms": lazy_costs,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"기준선 저장: {args.baseline}")
+
+    if args.check and problems:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""프로필 사실 질문 라우터 벤치마크 — 로컬 답변 비율 / 오분류 / 분류 시간
+
+fixtures/profile.csv 로 라우터를 만들고, 정답(시트 키 또는 None=LLM)을 붙인 질문 목록을 분류한다.
+
+    python bench/bench_intents.py
+    python bench/bench_intents.py --threshold 0.6    # 임계값을 바꿔 보기
+    python bench/bench_intents.py --check            # 오분류(LLM 으로 가야 할 질문을 로컬로)가 있으면 exit 1
+"""
+import argparse
+import csv
+import os
+import statistics
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from intent_router import CONFIDENCE, IntentRouter  # noqa: E402
+from sheet_registry import normalize_key  # noqa: E402
+
+# (질문, 기대 키 — None 이면 LLM 으로 가야 함)
+QUESTIONS = [
+    ("사는곳이 어디에요", "사는곳"),
+    ("사는 곳이 어디예요?", "사는곳"),
+    ("어디 사세요?", "사는곳"),
+    ("거주지가 어떻게 되나요", "사는곳"),
+    ("취미는 뭐에요?", "취미"),
+    ("취미가 뭐예요", "취미"),
+    ("이름이 뭐에요", "이름"),
+    ("성함이 어떻게 되세요?", "이름"),
+    ("직업이 뭐에요", "직업"),
+    ("무슨 일 하세요?", "직업"),
+    ("연락처 알려주세요", "연락처"),
+    ("전화번호가 어떻게 되나요", "연락처"),
+    ("이메일 주소 알려줘", "이메일"),
+    ("메일 주소가 뭐에요?", "이메일"),
+    ("생일이 언제에요", "생년월일"),
+    ("사용 RPA툴이 뭐에요", "사용rpa툴"),
+    ("어떤 RPA 쓰세요?", "사용rpa툴"),
+    ("성별이 뭐에요", "성별"),
+    ("백민님 직업이 뭐에요?", "직업"),
+    ("간단히 자기소개 해주세요", None),
+    ("경력/프로젝트를 알려주세요", None),
+    ("MBTI가 어떻게 되나요?", None),
+    ("취미를 시작한 계기가 뭐에요?", None),
+    ("왜 자동화개발자가 되었나요?", None),
+    ("취미랑 사는곳 알려주세요", None),
+    ("RPA 프로젝트 경험을 알려주세요", None),
+    ("연락하고 싶어요", None),
+    ("서울 어디쯤 살아요?", None),
+    ("가장 자신 있는 기술은 무엇인가요?", None),
+    ("회사에서 어떤 일을 했는지 자세히 설명해주세요", None),
+    ("AI 를 업무에 어떻게 활용하나요?", None),
+    ("팀 이름이 뭐에요?", None),
+    ("회사 이름 알려주세요", None),
+    ("부모님 직업이 뭐에요?", None),
+    ("전 직업이 뭐에요?", None),
+    ("예전 취미는 뭐에요?", None),
+]
+
+
+def load_profile(path):
+    with open(path, encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))[1:]
+    return {normalize_key(row[0]): row[1].strip() for row in rows if len(row) >= 2}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="프로필 사실 질문 라우터 벤치마크")
+    parser.add_argument("--profile", default=os.path.join(BENCH_DIR, "fixtures", "profile.csv"))
+    parser.add_argument("--threshold", type=float, default=CONFIDENCE)
+    parser.add_argument("--repeat", type=int, default=200, help="질문별 분류 반복 횟수 (시간 측정)")
+    parser.add_argument("--check", action="store_true", help="오분류가 있으면 exit 1")
+    args = parser.parse_args(argv)
+
+    router = IntentRouter(load_profile(args.profile), threshold=args.threshold)
+    local = wrong = missed = 0
+    timings = []
+    for question, expected in QUESTIONS:
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            intent = router.classify(question)
+        timings.append((time.perf_counter() - start) / args.repeat * 1e6)
+        got = intent.key if intent else None
+        mark = "ok"
+        if got is not None:
+            local += 1
+        if got != expected:
+            if got is None:
+                missed += 1
+                mark = "missed"     # 로컬로 답할 수 있었는데 LLM 으로 (비용만 듦)
+            else:
+                wrong += 1
+                mark = "WRONG"      # 틀린 값을 답함
+        score = f"{intent.score:.2f}" if intent else "-"
+        print(f"{mark:<7}{score:>6}  {got or 'LLM':<10} {question}")
+
+    total = len(QUESTIONS)
+    answerable = sum(1 for _, expected in QUESTIONS if expected)
+    print()
+    print(f"임계값 {args.threshold} — 로컬 답변 {local}/{total} ({local / total:.0%}), "
+          f"답할 수 있는 질문 중 {local - wrong}/{answerable}, 오분류 {wrong}, 놓침 {missed}")
+    print(f"분류 시간 µs: p50 {statistics.median(timings):.1f} / max {max(timings):.1f}")
+
+    if args.check and wrong:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,314 @@
+"""라우트별 지연시간 / 처리량 벤치마크
+
+Streamlit AppTest 로 다섯 화면(home, about, career, contact, etc)과 주요 상호작용을
+N 개 세션이 동시에 반복 실행한다. 세션은 한 프로세스(= 앱 서버 1개)의 스레드라서
+실제 서버처럼 st.cache_resource 싱글턴(프로필 풀, 답변 캐시, LLM 게이트웨이, 속도 제한)과
+GIL 을 나눠 쓴다 — 잠금 경합이나 공유 캐시 효과가 그대로 측정된다. 구글 시트는 로컬 HTTP 서버(fixtures/*.csv),
+OpenAI 는 지연 시간을 조절할 수 있는 가짜 클라이언트로 대체한다.
+
+    python bench/bench_routes.py                        # 기본: 8 세션 x 5 회
+    python bench/bench_routes.py --sessions 32 --llm-latency 1.0
+    python bench/bench_routes.py --save-baseline        # 결과를 bench/baseline.json 에 저장
+    python bench/bench_routes.py --check                # 기준선보다 p95 가 느려지면 exit 1
+
+출력: 시나리오별 스크립트 실행시간 p50/p95/p99, 세션당 메모리, 전체 처리량
+"""
+import argparse
+import dataclasses
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+APP_PATH = os.path.join(ROOT_DIR, "qr_landing_app.py")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+# 앱이 쓰는 디스크 캐시를 임시 폴더로 분리 (개발용 .cache 를 덮어쓰지 않도록)
+os.environ.setdefault("QR_LANDING_CACHE_DIR", tempfile.mkdtemp(prefix="qr-bench-"))
+
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from fake_services import FakeOpenAI, SheetServer  # noqa: E402
+
+
+# -----------------------------
+# 시나리오 — AppTest 하나로 실행할 단계 목록
+# 각 단계 실행 시간(= 스크립트 1회 재실행)을 측정한다
+# -----------------------------
+def _new_app(route):
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.secrets["api_key"] = "sk-bench"
+    at.query_params["route"] = route
+    return at
+
+
+def _ask(question):
+    def step(at):
+        at.text_input[0].input(question)
+        next(b for b in at.button if b.label == "전송").click()
+    return step
+
+
+def _recommend(at):
+    next(b for b in at.button if "추천" in b.label).click()
+
+
+SCENARIOS = {
+    "home": ("home", []),
+    "about": ("about", []),
+    "career": ("career", []),
+    "contact": ("contact", []),
+    "contact_faq": ("contact", [_ask("경력/프로젝트를 알려주세요")]),   # 답변 캐시 적중 경로 (프로필 항목 질문은 intent 라우터가 먼저 답한다)
+    "contact_llm": ("contact", ["unique"]),               # 세션마다 다른 질문 → LLM 경로
+    "etc": ("etc", []),
+    "etc_recommend": ("etc", [_recommend]),
+}
+
+
+def run_scenario(name, session_id, iteration):
+    """시나리오 1회 실행 → 단계별 소요 시간 목록 (첫 단계 = 페이지 로드)"""
+    route, steps = SCENARIOS[name]
+    at = _new_app(route)
+    timings = []
+
+    started = time.perf_counter()
+    at.run()
+    timings.append(time.perf_counter() - started)
+
+    for step in steps:
+        if step == "unique":
+            step = _ask(f"세션 {session_id} 의 {iteration}번째 질문: 어떤 일을 하시나요?")
+        step(at)
+        started = time.perf_counter()
+        at.run()
+        timings.append(time.perf_counter() - started)
+
+    if at.exception:
+        raise RuntimeError(f"{name}: {at.exception[0].value}")
+    return timings
+
+
+def measure_memory(name):
+    """세션 1개가 시나리오를 한 번 돌 때 늘어나는 파이썬 힙 (KB, tracemalloc 기준)"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        run_scenario(name, "mem", 0)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round((peak - before) / 1024, 1)
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def setup(sheet_urls, llm_latency, token_latency):
+    """현재 프로세스의 앱 의존성을 로컬 대역으로 교체"""
+    # 앱 모듈은 여기서 import — bench_imports 가 재는 구간(첫 화면)에 앱 import 가 포함되도록
+    import llm_gateway
+    import profiles
+    import sheet_registry
+
+    FakeOpenAI.first_token_latency = llm_latency
+    FakeOpenAI.token_latency = token_latency
+    llm_gateway.make_client = FakeOpenAI
+    # 등록된 시트 URL 을 로컬 서버로 교체 (레지스트리 확장 지점 그대로 사용)
+    for name, url in sheet_urls.items():
+        if name in sheet_registry.SHEETS:
+            sheet_registry.SHEETS[name] = dataclasses.replace(sheet_registry.SHEETS[name], url=url)
+    profiles.PROFILES[profiles.DEFAULT_PROFILE] = dataclasses.replace(
+        profiles.PROFILES[profiles.DEFAULT_PROFILE],
+        profile_url=sheet_urls["profile"],
+        career_url=sheet_urls["career"],
+    )
+
+
+def share_apptest_globals():
+    """AppTest 여러 개를 한 프로세스의 스레드에서 동시에 돌릴 수 있게 한다
+
+    AppTest 는 실행마다 프로세스 전역(Runtime 인스턴스, global.appTest 설정)을 켰다가 끝나면 되돌린다.
+    먼저 끝난 세션이 아직 도는 세션의 런타임을 지우지 않도록 벤치 동안은 켜 둔 채로 둔다.
+    스크립트 바이트코드 캐시도 실제 서버처럼 세션끼리 하나를 쓴다
+    (실행마다 따로 컴파일하면 스레드 동시 compile 에서 파이썬 3.11 이 SystemError 를 낸다).
+    """
+    from contextlib import nullcontext
+
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+
+    class _KeepRuntime:
+        # AppTest 가 MagicMock(spec=Runtime) 을 만들 때도 쓰이므로 속성 목록도 Runtime 그대로
+        def __dir__(self):
+            return dir(Runtime)
+
+        def __getattr__(self, name):
+            return getattr(Runtime, name)
+
+        def __setattr__(self, name, value):
+            if not (name == "_instance" and value is None):
+                setattr(Runtime, name, value)
+
+    config.set_option("global.appTest", True)
+    app_test.patch_config_options = lambda options: nullcontext()
+    app_test.Runtime = _KeepRuntime()
+    script_cache = ScriptCache()
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+
+def session_worker(name, session_id, iterations, ready):
+    """세션 1개 (스레드) → 결과 dict — 모든 세션이 준비되면 같이 출발"""
+    ready.wait()
+    timings, errors = [], []
+    started = time.time()
+    for i in range(iterations):
+        try:
+            timings.extend(run_scenario(name, session_id, i))
+        except Exception as e:
+            errors.append(str(e))
+    return {"timings": timings, "errors": errors, "started": started, "finished": time.time()}
+
+
+def bench(name, sessions, iterations):
+    # 프로세스 공용 저장소/캐시 생성은 main 의 워밍업에서 끝났으므로 여기서는 세션 스레드만 돈다
+    share_apptest_globals()
+    ready = threading.Barrier(sessions)
+    with ThreadPoolExecutor(max_workers=sessions, thread_name_prefix="bench-session") as pool:
+        futures = [pool.submit(session_worker, name, s, iterations, ready) for s in range(sessions)]
+        collected = [f.result() for f in futures]
+
+    timings = [t for c in collected for t in c["timings"]]
+    errors = [e for c in collected for e in c["errors"]]
+    wall = max(c["finished"] for c in collected) - min(c["started"] for c in collected)
+
+    ms = [t * 1000 for t in timings]
+    return {
+        "runs": len(ms),
+        "errors": len(errors),
+        "mean_ms": round(statistics.fmean(ms), 1) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 1),
+        "p95_ms": round(percentile(ms, 95), 1),
+        "p99_ms": round(percentile(ms, 99), 1),
+        "throughput_rps": round(len(ms) / wall, 2) if wall else 0.0,
+        "first_error": errors[0] if errors else "",
+    }
+
+
+# -----------------------------
+# 기준선
+# -----------------------------
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("p95_ms"):
+            continue
+        ratio = result["p95_ms"] / base["p95_ms"]
+        result["vs_baseline"] = round(ratio, 2)
+        if ratio > 1 + tolerance:
+            regressions.append(f"{name}: p95 {base['p95_ms']}ms → {result['p95_ms']}ms (x{ratio:.2f})")
+    return regressions
+
+
+def print_table(results):
+    header = f"{'scenario':<15}{'runs':>6}{'err':>5}{'p50':>9}{'p95':>9}{'p99':>9}{'rps':>8}{'mem KB':>10}{'vs base':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<15}{r['runs']:>6}{r['errors']:>5}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}"
+            f"{r['throughput_rps']:>8}{r.get('mem_kb', ''):>10}{r.get('vs_baseline', ''):>9}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="QR 랜딩 라우트 벤치마크")
+    parser.add_argument("--sessions", type=int, default=8, help="동시 세션 수")
+    parser.add_argument("--iterations", type=int, default=5, help="세션당 반복 횟수")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="특정 시나리오만 (여러 번 지정 가능)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="가짜 OpenAI 첫 토큰 지연 (초)")
+    parser.add_argument("--token-latency", type=float, default=0.01, help="가짜 OpenAI 토큰 간 지연 (초)")
+    parser.add_argument("--sheet-latency", type=float, default=0.0, help="로컬 시트 서버 응답 지연 (초)")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준선으로 저장")
+    parser.add_argument("--check", action="store_true", help="기준선 대비 p95 회귀가 있으면 exit 1")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 회귀 비율 (0.25 = 25%%)")
+    parser.add_argument("--json", help="결과를 JSON 파일로도 저장")
+    args = parser.parse_args(argv)
+
+    import sheet_registry
+
+    names = args.scenario or list(SCENARIOS)
+    results = {}
+    with SheetServer(latency=args.sheet_latency) as server:
+        setup(
+            sheet_urls={name: server.url(name) for name in ("profile", "career", *sheet_registry.SHEETS)},
+            llm_latency=args.llm_latency,
+            token_latency=args.token_latency,
+        )
+        for name in names:
+            run_scenario(name, "warmup", 0)
+
+        for name in names:
+            print(f"▶ {name} ({args.sessions} sessions x {args.iterations})", file=sys.stderr)
+            results[name] = bench(name, args.sessions, args.iterations)
+            results[name]["mem_kb"] = measure_memory(name)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance) if baseline else []
+    params = {
+        "sessions": args.sessions,
+        "iterations": args.iterations,
+        "llm_latency": args.llm_latency,
+        "token_latency": args.token_latency,
+        "sheet_latency": args.sheet_latency,
+    }
+    if baseline and baseline.get("params") != params:
+        print(f"ℹ️ 기준선과 실행 조건이 다릅니다 — 비교는 참고용: {baseline.get('params')}")
+
+    print_table(results)
+    for line in regressions:
+        print(f"⚠️ REGRESSION {line}")
+
+    payload = {
+        "created_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": f"{platform.system()} {platform.machine()} / Python {platform.python_version()}",
+        "params": params,
+        "results": results,
+    }
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"기준선 저장: {args.baseline}")
+
+    if args.check and regressions:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
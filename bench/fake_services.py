@@ -0,0 +1,129 @@
+"""벤치마크용 로컬 대역
+
+- SheetServer: fixtures/*.csv 를 구글 시트 CSV export 처럼 내려주는 로컬 HTTP 서버
+- FakeOpenAI: chat.completions.create 만 흉내내는 가짜 클라이언트 (지연 시간 조절 가능)
+"""
+import functools
+import http.server
+import json
+import os
+import socketserver
+import threading
+import time
+import types
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class SheetServer:
+    """fixtures 폴더를 127.0.0.1 임의 포트로 서빙 (Last-Modified / 304 지원)"""
+
+    def __init__(self, directory=FIXTURES_DIR, latency=0.0):
+        self.latency = latency
+        server = self
+
+        class Handler(_QuietHandler):
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                super().do_GET()
+
+        self._httpd = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), functools.partial(Handler, directory=directory)
+        )
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.port}/{name}.csv"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+# -----------------------------
+# 가짜 OpenAI
+# -----------------------------
+FAKE_ANSWER = "저는 자동화 개발자입니다. RPA 와 AI 로 반복 업무를 줄이는 일을 합니다. (출처: 자기소개/경력기술서)"
+FAKE_PLACES = (
+    "1. 백민식당 | 한식 | 김치찌개가 맛있는 현지식당 | 김치찌개 | 서울 송파구 문정동 123-4\n"
+    "2. 문정분식 | 분식 | 떡볶이 맛집 | 떡볶이 | 서울 송파구 문정동 56\n"
+    "3. 가락국수 | 면요리 | 멸치육수 국수 | 잔치국수 | 서울 송파구 가락동 78\n"
+)
+# response_format(JSON 스키마)으로 요청하면 같은 내용을 JSON 으로
+FAKE_PLACES_JSON = json.dumps({"places": [
+    {"name": "백민식당", "kind": "한식", "description": "김치찌개가 맛있는 현지식당",
+     "highlight": "김치찌개", "address": "서울 송파구 문정동 123-4"},
+    {"name": "문정분식", "kind": "분식", "description": "떡볶이 맛집",
+     "highlight": "떡볶이", "address": "서울 송파구 문정동 56"},
+    {"name": "가락국수", "kind": "면요리", "description": "멸치육수 국수",
+     "highlight": "잔치국수", "address": "서울 송파구 가락동 78"},
+]}, ensure_ascii=False)
+
+
+def _chunk(text):
+    delta = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)], usage=None)
+
+
+def _usage_chunk(prompt_tokens, completion_tokens):
+    usage = types.SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    return types.SimpleNamespace(choices=[], usage=usage)
+
+
+class FakeCompletions:
+    def __init__(self, first_token_latency, token_latency, chunk_chars):
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.chunk_chars = chunk_chars
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, kwargs):
+        prompt = kwargs["messages"][-1]["content"]
+        if kwargs.get("response_format"):
+            return FAKE_PLACES_JSON
+        return FAKE_PLACES if "추천" in prompt or "여행지" in prompt else FAKE_ANSWER
+
+    def create(self, stream=False, **kwargs):
+        with self._lock:
+            self.calls += 1
+        text = self._answer(kwargs)
+        if not stream:
+            time.sleep(self.first_token_latency + self.token_latency * len(text) / self.chunk_chars)
+            message = types.SimpleNamespace(content=text)
+            usage = types.SimpleNamespace(prompt_tokens=len(str(kwargs["messages"])) // 2,
+                                          completion_tokens=len(text))
+            return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message)], usage=usage)
+        return self._stream(text, kwargs)
+
+    def _stream(self, text, kwargs):
+        time.sleep(self.first_token_latency)
+        for i in range(0, len(text), self.chunk_chars):
+            if i:
+                time.sleep(self.token_latency)
+            yield _chunk(text[i:i + self.chunk_chars])
+        yield _usage_chunk(len(str(kwargs["messages"])) // 2, len(text))
+
+
+class FakeOpenAI:
+    """OpenAI(api_key=..., http_client=...) 자리에 그대로 끼워 넣을 수 있는 가짜"""
+
+    first_token_latency = 0.3
+    token_latency = 0.01
+    chunk_chars = 4
+
+    def __init__(self, *args, **kwargs):
+        self.completions = FakeCompletions(self.first_token_latency, self.token_latency, self.chunk_chars)
+        self.chat = types.SimpleNamespace(completions=self.completions)
@@ -0,0 +1,110 @@
+"""전국 행정구역 자료 → regions.tsv 변환
+
+행정안전부에서 내려받은 행정구역 코드 파일을 앱이 읽는 regions.tsv(10자리 코드<TAB>이름)로 바꾼다.
+읽을 수 있는 형식 (인코딩은 UTF-8 / CP949 자동 판별):
+
+- 행정동 코드 (KIKcd_H 를 CSV 로 저장): 행정동코드, 시도명, 시군구명, 읍면동명[, 말소일자] 열
+- 법정동 코드 전체자료 (txt, 탭 구분): 법정동코드, 법정동명(전체 경로), 폐지여부
+
+    python build_regions.py KIKcd_H.csv                 # 행정동 기준 (권장, 읍·면·동 약 3,500개)
+    python build_regions.py 법정동코드_전체자료.txt --out regions.tsv
+
+리(里) 단위와 말소/폐지된 행은 뺀다. 시군구가 없는 시도(세종)는 시도 이름으로 시군구 단계를 채운다.
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+
+from regions import REGIONS_PATH, code_level, parent_code
+
+HEADER = "# 행정구역 (10자리 코드<TAB>이름) — build_regions.py 로 생성 ({source})\n"
+
+
+def read_text(path):
+    with open(path, "rb") as f:
+        raw = f.read()
+    for encoding in ("utf-8-sig", "cp949"):
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    raise ValueError(f"인코딩을 알 수 없습니다: {path}")
+
+
+def parse_admin_csv(text):
+    """행정동 코드 CSV → (코드, 단계별 이름 목록)"""
+    for row in csv.DictReader(io.StringIO(text)):
+        if (row.get("말소일자") or "").strip():
+            continue
+        code = int(row["행정동코드"])
+        parts = [(row.get(col) or "").strip() for col in ("시도명", "시군구명", "읍면동명")]
+        yield code, [p for p in parts if p]
+
+
+def parse_legal_txt(text):
+    """법정동 코드 전체자료 → (코드, 전체 경로를 띄어쓰기로 나눈 목록)"""
+    lines = text.splitlines()
+    for line in lines[1:]:
+        fields = line.split("\t")
+        if len(fields) < 3 or fields[2].strip() == "폐지":
+            continue
+        code = int(fields[0])
+        if code % 100:
+            continue   # 리(里)
+        yield code, fields[1].split()
+
+
+def build_rows(records):
+    """(코드, 경로 이름) → {코드: 이름} — 이름은 부모 경로를 뺀 나머지 ("수원시 장안구" 같은 2단어 시군구 포함)"""
+    paths = {}
+    for code, parts in records:
+        if parts:
+            paths[code] = parts
+    names = {}
+    for code, parts in paths.items():
+        parent = parent_code(code)
+        prefix = len(paths[parent]) if parent in paths else code_level(code) - 1
+        names[code] = " ".join(parts[prefix:]) or parts[-1]
+
+    # 부모 단계가 자료에 없는 행 — 시도 이름으로 채운다 (세종특별자치시 → 세종특별자치시 → 읍면동)
+    for code in list(names):
+        parent = parent_code(code)
+        while parent is not None and parent not in names:
+            sido = code - code % 10**8
+            names[parent] = names.get(sido) or paths[code][0]
+            parent = parent_code(parent)
+    return names
+
+
+def write_regions(names, out, source):
+    tmp = out + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(HEADER.format(source=source))
+        for code in sorted(names):
+            f.write(f"{code:010d}\t{names[code]}\n")
+    os.replace(tmp, out)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="행정구역 코드 파일 → regions.tsv")
+    parser.add_argument("source", help="행정동 코드 CSV 또는 법정동 코드 전체자료 txt")
+    parser.add_argument("--out", default=REGIONS_PATH, help="출력 경로")
+    args = parser.parse_args(argv)
+
+    text = read_text(args.source)
+    first = text.split("\n", 1)[0]
+    records = parse_admin_csv(text) if "행정동코드" in first else parse_legal_txt(text)
+    names = build_rows(records)
+    write_regions(names, args.out, os.path.basename(args.source))
+
+    counts = [0] * 3
+    for code in names:
+        counts[code_level(code) - 1] += 1
+    print(f"시도 {counts[0]} / 시군구 {counts[1]} / 읍면동 {counts[2]} → {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""경력 상세 페이지 사전 렌더링
+
+경력 시트가 바뀔 때만 pandas 문자열 연산으로 마크다운을 만들고,
+페이지 단위로 잘라 둔다. 렌더 시에는 st.markdown 한 번만 호출한다.
+행 단위로 렌더 결과를 기억해 두므로 한 행만 고치면 그 행만 다시 만든다.
+"""
+import threading
+from dataclasses import dataclass
+from html import escape
+
+from sheet_registry import CAREER_COLUMNS, hash_rows
+
+
+@dataclass(frozen=True)
+class CareerPages:
+    key: str
+    pages: tuple    # 페이지별 마크다운
+    total: int      # 경력 항목 수
+
+    def page(self, number):
+        if not self.pages:
+            return ""
+        number = min(max(number, 1), len(self.pages))
+        return self.pages[number - 1]
+
+
+def render_career_items(df):
+    """경력 한 줄 = 마크다운 한 블록 (행 반복 없이 컬럼 단위로 조립)"""
+    if df.empty:
+        return []
+    # 상세 내용 안의 줄바꿈은 같은 목록 항목 안에서 줄바꿈되도록 들여쓰기
+    detail = df["상세 내용"].astype(str).str.replace("\n", "  \n   ", regex=False)
+    items = (
+        "-  **" + df["기간"].astype(str) + "**  \n"
+        + "   " + df["회사/기관"].astype(str) + "  \n"
+        + "   " + df["직무"].astype(str) + "  \n"
+        + "   " + detail
+    )
+    return items.tolist()
+
+
+def render_career_html_items(df):
+    """render_career_items 의 HTML 버전 (정적 내보내기용, 시트 값은 escape)"""
+    if df.empty:
+        return []
+
+    def col(name):
+        return df[name].astype(str).map(escape)
+
+    detail = col("상세 내용").str.replace("\n", "<br>", regex=False)
+    items = (
+        "<li><b>" + col("기간") + "</b><br>"
+        + col("회사/기관") + "<br>"
+        + col("직무") + "<br>"
+        + detail + "</li>"
+    )
+    return items.tolist()
+
+
+def paginate(items, page_size):
+    if not page_size or page_size <= 0:
+        return ("\n\n---\n\n".join(items),) if items else ()
+    return tuple(
+        "\n\n---\n\n".join(items[i:i + page_size])
+        for i in range(0, len(items), page_size)
+    )
+
+
+class CareerViewCache:
+    """경력 시트 내용 해시 기준으로 CareerPages 를 1개만 유지 (행 렌더 결과는 행 해시로 재사용)"""
+
+    depends = ("career",)
+
+    def __init__(self, page_size=10):
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._current = None
+        self._rows = {}          # 행 내용 해시 → 마크다운
+        self.rows_rendered = 0   # 지금까지 새로 렌더링한 행 수
+
+    def get(self, store):
+        key = store.content_key(self.depends)
+        current = self._current
+        if current is not None and current.key == key:
+            return current
+
+        with self._lock:
+            if self._current is not None and self._current.key == key:
+                return self._current
+            items = self._render(store.get("career"))
+            self._current = CareerPages(key=key, pages=paginate(items, self.page_size), total=len(items))
+            return self._current
+
+    def _render(self, df):
+        if df.empty:
+            self._rows = {}
+            return []
+        hashes = hash_rows(df, CAREER_COLUMNS).tolist()
+        missing = [i for i, h in enumerate(hashes) if h not in self._rows]
+        if missing:
+            for i, item in zip(missing, render_career_items(df.iloc[missing])):
+                self._rows[hashes[i]] = item
+            self.rows_rendered += len(missing)
+        # 지금 시트에 없는 행은 버린다
+        self._rows = {h: self._rows[h] for h in hashes}
+        return [self._rows[h] for h in hashes]
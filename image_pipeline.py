@@ -0,0 +1,223 @@
+"""프로필 사진 파이프라인
+
+원본 사진을 한 번만 읽어 표시 크기(220px)에 맞춘 1x/2x WebP/JPEG 변형을 만들고,
+프로세스 메모리에 bytes 로 들고 있는다. 렌더할 때마다 원격 원본을 받지 않는다.
+- 원본: http(s) URL 또는 앱 폴더 기준 로컬 파일 경로
+- 원본을 못 읽으면 로컬에서 그린 '준비중' 자리표시 이미지 (외부 placeholder 서비스 없음)
+- 원격 원본은 ttl 이 지나면 ETag 조건부 요청으로 바뀌었는지만 확인
+- Pillow 는 실제로 변환할 때 import 한다 (사진이 없는 화면은 import 비용 없음)
+"""
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DISPLAY_WIDTH = 220
+SCALES = (1, 2)
+PLACEHOLDER_RATIO = 250 / 200   # 세로 / 가로
+
+# 포맷 → (Pillow 포맷, MIME, 확장자, 저장 옵션)
+FORMATS = {
+    "webp": ("WEBP", "image/webp", "webp", {"quality": 80, "method": 6}),
+    "jpeg": ("JPEG", "image/jpeg", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+@dataclass(frozen=True)
+class ImageVariant:
+    format: str
+    scale: int
+    width: int
+    height: int
+    data: bytes
+    digest: str   # 내용 해시 — 파일명/ETag 로 사용
+
+    @property
+    def mime(self):
+        return FORMATS[self.format][1]
+
+    def filename(self, stem="photo"):
+        # 내용이 바뀌면 이름도 바뀌므로 오래 캐시해도 된다
+        return f"{stem}-{self.width}w-{self.digest[:10]}.{FORMATS[self.format][2]}"
+
+
+@dataclass(frozen=True)
+class ProfileImage:
+    source: str
+    variants: tuple           # ImageVariant 목록
+    placeholder: bool = False
+    etag: str = ""            # 원격 원본 ETag (조건부 재확인용)
+    loaded_at: float = 0.0
+
+    @property
+    def key(self):
+        return "-".join(v.digest[:10] for v in self.variants)
+
+    def variant(self, format="webp", scale=2):
+        for v in self.variants:
+            if v.format == format and v.scale == scale:
+                return v
+        return self.variants[-1]
+
+
+# -----------------------------
+# 변환
+# -----------------------------
+def encode(img, format):
+    pil_format, _, _, options = FORMATS[format]
+    if pil_format == "JPEG" and img.mode != "RGB":
+        img = img.convert("RGB")
+    buf = io.BytesIO()
+    img.save(buf, pil_format, **options)
+    return buf.getvalue()
+
+
+def make_variants(img, width=DISPLAY_WIDTH):
+    """원본 PIL 이미지 → 포맷 x 배율 변형 (원본보다 크게 늘리지는 않음)"""
+    from PIL import Image, ImageOps
+
+    img = ImageOps.exif_transpose(img)   # 휴대폰 사진 회전 정보 반영
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGB")
+    variants = []
+    for scale in SCALES:
+        target = min(width * scale, img.width)
+        height = round(img.height * target / img.width)
+        resized = img.resize((target, height), Image.LANCZOS) if target != img.width else img
+        for format in FORMATS:
+            data = encode(resized, format)
+            variants.append(ImageVariant(
+                format=format, scale=scale, width=target, height=height,
+                data=data, digest=hashlib.sha256(data).hexdigest(),
+            ))
+    return tuple(variants)
+
+
+def render_placeholder(width=DISPLAY_WIDTH * max(SCALES)):
+    """사진이 없을 때 쓰는 회색 실루엣 (글꼴 없이 도형만)"""
+    from PIL import Image, ImageDraw
+
+    height = round(width * PLACEHOLDER_RATIO)
+    img = Image.new("RGB", (width, height), "#eceff3")
+    draw = ImageDraw.Draw(img)
+    cx, r = width / 2, width * 0.18
+    head_y = height * 0.36
+    draw.ellipse((cx - r, head_y - r, cx + r, head_y + r), fill="#c3c9d2")
+    draw.ellipse((cx - r * 2.1, head_y + r * 1.35, cx + r * 2.1, head_y + r * 5.2), fill="#c3c9d2")
+    return img
+
+
+# -----------------------------
+# 캐시
+# -----------------------------
+class ImagePipeline:
+    def __init__(self, session=None, base_dir=APP_DIR, width=DISPLAY_WIDTH, maxsize=256,
+                 ttl=3600, timeout=10):
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+        self.base_dir = base_dir
+        self.width = width
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.timeout = timeout
+
+        self._images = OrderedDict()   # source → ProfileImage (LRU)
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._placeholder = None
+
+        # 지표
+        self.hits = 0
+        self.loads = 0
+        self.errors = 0
+
+    def get(self, source):
+        """원본 주소/경로 → ProfileImage (변형 bytes 포함). 실패하면 자리표시 이미지"""
+        if not source:
+            return self.placeholder()
+        image = self._lookup(source)
+        if image is not None and time.time() - image.loaded_at < self.ttl:
+            return image
+
+        with self._lock:
+            load_lock = self._loading.setdefault(source, threading.Lock())
+        with load_lock:
+            current = self._lookup(source)
+            if current is not None and current is not image:
+                return current   # 기다리는 동안 다른 세션이 새로 만들었다
+            image = self._load(source, previous=image)
+            with self._lock:
+                self._images[source] = image
+                self._images.move_to_end(source)
+                while len(self._images) > self.maxsize:
+                    self._images.popitem(last=False)
+                self._loading.pop(source, None)
+            return image
+
+    def _lookup(self, source):
+        with self._lock:
+            image = self._images.get(source)
+            if image is not None:
+                self._images.move_to_end(source)
+                self.hits += 1
+            return image
+
+    def _load(self, source, previous=None):
+        try:
+            raw, etag = self._read(source, previous)
+            if raw is None:
+                # 304 — 원본 그대로, 확인 시각만 갱신
+                return ProfileImage(previous.source, previous.variants, previous.placeholder,
+                                    previous.etag, time.time())
+            from PIL import Image
+
+            with Image.open(io.BytesIO(raw)) as img:
+                variants = make_variants(img, self.width)
+            self.loads += 1
+            return ProfileImage(source, variants, etag=etag, loaded_at=time.time())
+        except Exception:
+            self.errors += 1
+            if previous is not None and not previous.placeholder:
+                # 갱신 실패 — 이전 변형을 계속 쓰고 ttl 뒤에 다시 시도
+                return ProfileImage(previous.source, previous.variants, False,
+                                    previous.etag, time.time())
+            placeholder = self.placeholder()
+            return ProfileImage(source, placeholder.variants, True, loaded_at=time.time())
+
+    def _read(self, source, previous):
+        """원본 bytes, ETag — 원격 원본이 안 바뀌었으면 (None, etag)"""
+        if not source.startswith(("http://", "https://")):
+            path = source if os.path.isabs(source) else os.path.join(self.base_dir, source)
+            with open(path, "rb") as f:
+                return f.read(), ""
+        headers = {}
+        if previous is not None and previous.etag and not previous.placeholder:
+            headers["If-None-Match"] = previous.etag
+        resp = self.session.get(source, headers=headers, timeout=self.timeout)
+        if resp.status_code == 304 and previous is not None:
+            return None, previous.etag
+        resp.raise_for_status()
+        return resp.content, resp.headers.get("ETag", "")
+
+    def placeholder(self):
+        if self._placeholder is None:
+            variants = make_variants(render_placeholder(self.width * max(SCALES)), self.width)
+            self._placeholder = ProfileImage("", variants, True, loaded_at=time.time())
+        return self._placeholder
+
+    def stats(self):
+        with self._lock:
+            return {
+                "images": len(self._images),
+                "bytes": sum(len(v.data) for image in self._images.values() for v in image.variants),
+                "hits": self.hits,
+                "loads": self.loads,
+                "errors": self.errors,
+            }
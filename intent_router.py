@@ -0,0 +1,171 @@
+"""프로필 사실 질문 라우터 — LLM 없이 시트 값으로 바로 답하기
+
+"사는곳이 어디에요", "취미는 뭐에요?" 처럼 답이 프로필 시트 항목 하나인 질문은
+시트 키 + 동의어 표를 글자 bigram 으로 맞춰 보고, 확신도가 임계값 이상이면 값을 바로 돌려준다.
+나머지(경력 설명, 이유/계기, 여러 항목을 한 번에 묻는 질문 등)는 None → LLM.
+
+확신도 = 구절 일치도 (키/동의어 구절의 bigram 중 질문에 있는 비율 — 띄어쓰기·조사 변형 허용)
+단, 질문의 모든 글자가 그 항목의 구절, 의문형 어미/조사("어디에요", "뭐에요", "은/는"), 본인 이름으로
+설명될 때만 답한다 — 남는 글자가 있으면 다른 것을 묻는 질문이다
+  → "취미를 시작한 계기가 뭐에요" 는 '시작한 계기', "팀 이름이 뭐에요" 는 '팀',
+    "부모님 직업이 뭐에요" 는 '부모' 가 남아서 LLM 으로 간다 ("백민님 직업이 뭐에요" 는 로컬)
+라우터는 프로필 스냅샷당 1번 만든다 (IntentCache, ContextCache 와 같은 방식).
+"""
+import re
+import threading
+from dataclasses import dataclass
+
+from answer_cache import normalize_question
+
+CONFIDENCE = 0.75   # 이 이상이면 시트 값으로 바로 답한다
+
+# 정규화된 시트 키 → (표시 이름, 동의어). 시트 키 자체는 항상 구절로 들어간다
+SYNONYMS = {
+    "이름": ("이름", ["성함"]),
+    "직업": ("직업", ["무슨일", "하는일", "직무", "무슨직업"]),
+    "사는곳": ("사는 곳", ["사시는곳", "거주지", "거주", "사는지역", "사는동네", "사세요", "살아요", "사나요"]),
+    "취미": ("취미", ["여가", "쉬는날", "좋아하는활동"]),
+    "연락처": ("연락처", ["전화번호", "휴대폰", "핸드폰", "폰번호", "연락"]),
+    "이메일": ("이메일", ["메일", "email", "메일주소"]),
+    "생년월일": ("생년월일", ["생일", "태어난날"]),
+    "성별": ("성별", []),
+    "사용rpa툴": ("사용 RPA 툴", ["rpa툴", "rpa도구", "rpa"]),
+    "한줄소개": ("한줄 소개", ["한마디"]),
+}
+
+# 다른 경로가 있는 항목 — MBTI 는 시트 요약 + 설명 (qr_landing_app.answer_chunks)
+EXCLUDED_KEYS = ("mbti",)
+
+# 질문에서 항목 이름 말고 남아도 되는 말 (긴 것부터 맞춘다)
+FILLERS = [
+    "어떻게되나요", "어떻게되세요", "어떻게돼요", "알려주세요", "알려줄래요", "궁금해요", "궁금합니다",
+    "무엇인가요", "무엇이에요", "알려줘", "뭐예요", "뭐에요", "뭔가요", "어디에요", "어디예요",
+    "어디인가요", "언제에요", "언제예요", "사용하세요", "하세요", "쓰세요", "쓰나요", "써요", "어디야", "뭐야",
+    "이에요", "인가요", "입니다", "혹시", "본인", "당신", "무엇", "어디", "언제", "어떤", "예요", "나요", "세요",
+    "님의", "님", "의", "은", "는", "이", "가", "을", "를", "요", "좀", "뭐",
+]
+_FILLER_RE = re.compile("|".join(sorted(map(re.escape, FILLERS), key=len, reverse=True)))
+
+SOURCE_NOTE = "(출처: 자기소개 시트)"
+
+
+def bigrams(text):
+    return frozenset(text[i:i + 2] for i in range(len(text) - 1))
+
+
+@dataclass(frozen=True)
+class Intent:
+    key: str       # 정규화된 시트 키
+    label: str
+    value: str
+    score: float
+
+
+class IntentRouter:
+    def __init__(self, profile, threshold=CONFIDENCE):
+        # profile: {정규화된 키: 값} (sheet_registry.profile_to_dict). 값이 빈 항목은 라우팅하지 않음
+        self.threshold = threshold
+        self.fields = {}
+        self._phrases = []   # (키, 구절 bigram)
+        self._names = set()  # 본인 이름 — "백민님 직업이 뭐에요" 의 '백민' 은 남는 글자가 아니다
+        for key, value in profile.items():
+            value = str(value).strip()
+            if key in EXCLUDED_KEYS or not value or value.lower() == "nan":
+                continue
+            label, synonyms = SYNONYMS.get(key, (key, []))
+            self.fields[key] = (label, value)
+            for phrase in {key, *map(normalize_question, synonyms)}:
+                if len(phrase) >= 2:
+                    self._phrases.append((key, bigrams(phrase)))
+        name = normalize_question(self.fields.get("이름", ("", ""))[1])
+        if len(name) >= 2:
+            self._names.add(name)
+            if len(name) == 3:
+                self._names.add(name[1:])   # 성 빼고 부르는 경우
+        self._filler_re = _FILLER_RE
+        if self._names:
+            words = sorted(map(re.escape, [*FILLERS, *self._names]), key=len, reverse=True)
+            self._filler_re = re.compile("|".join(words))
+
+    def classify(self, question):
+        """질문 → Intent (확신도가 임계값 미만이거나 설명 안 되는 글자가 남으면 None)"""
+        q = normalize_question(question)
+        if len(q) < 2 or not self._phrases:
+            return None
+        positions = {}
+        for i in range(len(q) - 1):
+            positions.setdefault(q[i:i + 2], []).append(i)
+        filler = {i for m in self._filler_re.finditer(q) for i in range(m.start(), m.end())}
+
+        # 항목별로 구절 일치도 중 가장 높은 값 + 그 항목 구절들이 덮는 글자
+        matches = {}
+        for key, grams in self._phrases:
+            hits = [g for g in grams if g in positions]
+            if not hits:
+                continue
+            score, covered = matches.get(key, (0.0, set(filler)))
+            for g in hits:
+                for i in positions[g]:
+                    covered.update((i, i + 1))
+            matches[key] = (max(score, len(hits) / len(grams)), covered)
+
+        best_key, best_score = None, 0.0
+        for key, (score, covered) in matches.items():
+            if len(covered) == len(q) and score > best_score:
+                best_key, best_score = key, score
+        if best_key is None or best_score < self.threshold:
+            return None
+        label, value = self.fields[best_key]
+        return Intent(best_key, label, value, round(best_score, 3))
+
+
+def render_intent_answer(intent):
+    return f"{intent.label}: {intent.value}\n\n{SOURCE_NOTE}"
+
+
+class IntentCache:
+    """SheetStore 스냅샷 기준으로 IntentRouter 를 1개만 유지 (프로필 시트가 바뀔 때만 다시 만든다)"""
+
+    depends = ("profile",)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = (None, None)   # (content_key, IntentRouter)
+        self.builds = 0
+
+    def get(self, store):
+        key = store.content_key(self.depends)
+        current_key, router = self._current
+        if current_key == key:
+            return router
+        with self._lock:
+            if self._current[0] != key:
+                self._current = (key, IntentRouter(store.get("profile")))
+                self.builds += 1
+            return self._current[1]
+
+
+class IntentStats:
+    """질문 중 로컬로 답한 비율 (프로세스 전체, 프로필 합산)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.local = 0
+        self.llm = 0
+
+    def record(self, local):
+        with self._lock:
+            if local:
+                self.local += 1
+            else:
+                self.llm += 1
+
+    def stats(self):
+        with self._lock:
+            total = self.local + self.llm
+            return {
+                "questions": total,
+                "local": self.local,
+                "llm": self.llm,
+                "local_ratio": round(self.local / total, 3) if total else 0.0,
+            }
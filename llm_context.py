@@ -0,0 +1,135 @@
+"""챗봇 시스템 프롬프트(컨텍스트) 캐시
+
+프로필/경력 시트 내용이 같으면 컨텍스트 문자열과 토큰 수를 다시 만들지 않는다.
+키는 두 시트의 원본 해시이므로 모든 세션이 같은 객체를 공유하고,
+프롬프트가 호출마다 바이트 단위로 동일해 OpenAI 프롬프트 캐싱이 적용된다.
+
+경력이 길어져 컨텍스트가 토큰 예산을 넘으면, 같이 만들어 둔 BM25 색인(retrieval)으로
+질문과 관련 있는 프로필 항목 / 경력 행만 골라 프롬프트를 만든다 (system_prompt_for).
+"""
+import threading
+from dataclasses import dataclass
+
+from retrieval import BM25Index, Chunk
+from tracing import span
+
+# 질문과 상관없이 항상 넣는 프로필 항목
+PINNED_FIELDS = ("이름", "직업", "한줄소개")
+
+
+@dataclass(frozen=True)
+class LLMContext:
+    key: str             # 프로필 + 경력 시트 내용 해시
+    profile_name: str
+    context: str         # [프로필] + [경력 요약]
+    system_prompt: str   # 일반 질문용 system 메시지 전체
+    tokens: int          # system_prompt 추정 토큰 수
+    index: BM25Index     # 프로필 항목 / 경력 행 색인
+
+    def system_prompt_for(self, question, budget, top_k=8):
+        """컨텍스트가 budget 토큰 이하면 전체 프롬프트 그대로 (프롬프트 캐싱 유지),
+        넘으면 질문과 관련 있는 조각만 골라 만든 프롬프트"""
+        if self.index.total_tokens <= budget:
+            return self.system_prompt
+        with span("llm.context_select") as s:
+            chunks, used = self.index.select(question, budget, top_k)
+            s.set(chunks=len(chunks), tokens=used)
+            return build_system_prompt(self.profile_name, render_context(chunks))
+
+
+def estimate_tokens(text):
+    # 대략치: 영문/숫자는 4글자당 1토큰, 한글 등 비ASCII 는 글자당 1토큰
+    ascii_chars = sum(1 for c in text if c.isascii())
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+# -----------------------------
+# Career 요약 & Context 생성
+# -----------------------------
+def career_lines(df, max_len=300):
+    if df.empty:
+        return []
+    detail = df["상세 내용"].astype(str)
+    detail = detail.where(detail.str.len() <= max_len, detail.str[:max_len] + "...")
+    lines = (
+        "- " + df["기간"].astype(str)
+        + " | " + df["회사/기관"].astype(str)
+        + " | " + df["직무"].astype(str)
+        + " | " + detail
+    )
+    return lines.tolist()
+
+
+def summarize_career(df, max_len=300):
+    return "\n".join(career_lines(df, max_len))
+
+
+def build_chunks(profile, career_df, max_len=300):
+    """프로필 항목 하나 / 경력 행 하나 = 조각 하나"""
+    chunks = []
+    for k, v in profile.items():
+        text = f"{k}: {v}"
+        chunks.append(Chunk(text, "profile", len(chunks), estimate_tokens(text), pinned=k in PINNED_FIELDS))
+    for text in career_lines(career_df, max_len):
+        chunks.append(Chunk(text, "career", len(chunks), estimate_tokens(text)))
+    return chunks
+
+
+def render_context(chunks):
+    lines = ["### [프로필]"]
+    lines.extend(c.text for c in chunks if c.section == "profile")
+    lines.append("\n### [경력 요약]")
+    lines.append("\n".join(c.text for c in chunks if c.section == "career"))
+    return "\n".join(lines)
+
+
+def build_context(profile, career_df):
+    return render_context(build_chunks(profile, career_df, max_len=300))
+
+
+def build_system_prompt(profile_name, context):
+    return (
+        f"너는 {profile_name}님의 자기소개 챗봇입니다.\n"
+        f"아래 프로필(자기소개 시트)과 경력 요약(경력기술서 시트)을 참고해서만 답변하세요.\n"
+        f"답변은 핵심만, 3~4문장 이내로 간결하게 작성하세요.\n"
+        f"출처는 '(출처: 자기소개/경력기술서)' 라고 반드시 답변 마지막에 붙이세요.\n\n{context}"
+    )
+
+
+class ContextCache:
+    """SheetStore 스냅샷 기준으로 LLMContext 를 1개만 유지"""
+
+    # 경력 요약에 상세 내용이 들어가므로 경력 행 어디가 바뀌어도 다시 만든다 (문자열 조립이라 저렴)
+    depends = ("profile", "career")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._current = None
+        self.builds = 0
+
+    def get(self, store):
+        key = store.content_key(self.depends)
+        current = self._current
+        if current is not None and current.key == key:
+            return current
+
+        with self._lock:
+            # 다른 세션이 먼저 만들었으면 그대로 사용
+            if self._current is not None and self._current.key == key:
+                return self._current
+            with span("llm.context_build"):
+                profile = store.get("profile")
+                chunks = build_chunks(profile, store.get("career"), max_len=300)
+                context = render_context(chunks)
+                profile_name = profile.get("이름", "사용자")
+                system_prompt = build_system_prompt(profile_name, context)
+                self._current = LLMContext(
+                    key=key,
+                    profile_name=profile_name,
+                    context=context,
+                    system_prompt=system_prompt,
+                    tokens=estimate_tokens(system_prompt),
+                    index=BM25Index(chunks),
+                )
+            self.builds += 1
+            return self._current
@@ -0,0 +1,208 @@
+"""공유 LLM 게이트웨이
+
+프로세스 전체가 OpenAI 클라이언트 하나(HTTP 커넥션 풀 공유)를 쓴다.
+- 동시 호출 수 제한: 워커 스레드 max_concurrency 개, 나머지는 대기열에서 순서대로
+- 요청 합치기(single-flight): 같은 요청이 이미 진행 중이면 새로 호출하지 않고 같은 결과를 받는다
+- 업스트림은 항상 stream=True 로 받아서, 기다리는 모든 호출자에게 조각 단위로 나눠 준다
+- 대기열 길이 / 대기 시간을 stats() 로 노출
+- OpenAI 클라이언트(openai/httpx import 포함)는 첫 호출 때 만든다 — 게이트웨이 생성/지표 조회는 가볍다
+- (연결, 읽기) 시간 제한 + SDK 재시도(지터 백오프, 스트림 시작 전까지), OpenAI 회로 차단기 —
+  연속으로 실패하면 잠시 호출 없이 바로 CircuitOpenError (호출하는 쪽이 저장된 답변/추천으로 대체)
+"""
+import hashlib
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from resilience import CircuitBreaker, CircuitOpenError, is_transient
+from tracing import span, tracer
+
+LLM_TIMEOUT = (5.0, 30.0)   # (연결, 읽기) 초 — 읽기는 스트림 조각 사이 간격에도 적용
+LLM_RETRIES = 2             # SDK 재시도 (연결 실패 / 429 / 5xx, 지터 백오프)
+
+
+class LLMBusyError(RuntimeError):
+    pass
+
+
+class _Flight:
+    """진행 중인 요청 1건 — 받은 조각을 모아 두고 여러 호출자가 각자 읽는다"""
+
+    def __init__(self, key):
+        self.key = key
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.usage = None
+        self.cond = threading.Condition()
+        self.submitted_at = time.time()
+
+    def iter_chunks(self):
+        i = 0
+        while True:
+            with self.cond:
+                while i >= len(self.chunks) and not self.done:
+                    self.cond.wait()
+                new = self.chunks[i:]
+                done, error = self.done, self.error
+            i += len(new)
+            yield from new
+            if done:
+                if error is not None:
+                    raise error
+                return
+
+
+def make_client(api_key=None, max_connections=20, timeout=LLM_TIMEOUT, max_retries=LLM_RETRIES):
+    """OpenAI 클라이언트 (keep-alive 커넥션 풀 공유)"""
+    import httpx
+    from openai import OpenAI
+
+    connect, read = timeout
+    http_client = httpx.Client(
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=60,
+        ),
+        timeout=httpx.Timeout(read, connect=connect),
+    )
+    return OpenAI(api_key=api_key, http_client=http_client, max_retries=max_retries)
+
+
+class LLMGateway:
+    def __init__(self, api_key=None, client=None, max_concurrency=8, max_queue=200,
+                 max_connections=20, timeout=LLM_TIMEOUT, breaker=None):
+        self._client = client
+        self._client_args = {"api_key": api_key, "max_connections": max_connections, "timeout": timeout}
+        self._client_lock = threading.Lock()
+        # 연속 5번(재시도까지 다 쓴 호출 기준) 실패하면 30초 동안 호출하지 않는다
+        self.breaker = breaker or CircuitBreaker("openai", threshold=5, reset_timeout=30)
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="llm")
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+        # 지표
+        self.queued = 0
+        self.running = 0
+        self.requests = 0
+        self.started = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @staticmethod
+    def request_key(request):
+        raw = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    self._client = make_client(**self._client_args)
+        return self._client
+
+    # -----------------------------
+    # 호출
+    # -----------------------------
+    def chunks(self, request):
+        """응답 텍스트 조각을 yield — 같은 요청이 진행 중이면 그 결과를 같이 받는다"""
+        key = self.request_key(request)
+        with self._lock:
+            self.requests += 1
+            flight = self._inflight.get(key)
+            if flight is not None:
+                self.coalesced += 1
+            else:
+                if not self.breaker.allow():
+                    self.errors += 1
+                    raise CircuitOpenError(self.breaker.name, self.breaker.retry_after())
+                if self.queued >= self.max_queue:
+                    self.errors += 1
+                    raise LLMBusyError("요청이 많아 잠시 후 다시 시도해주세요.")
+                flight = _Flight(key)
+                self._inflight[key] = flight
+                self.queued += 1
+                self._pool.submit(self._run, flight, request)
+        return flight.iter_chunks()
+
+    def complete(self, request):
+        return "".join(self.chunks(request)).strip()
+
+    def _run(self, flight, request):
+        waited = time.time() - flight.submitted_at
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.started += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+        tracer.observe("llm.queue_wait", waited)
+        try:
+            with span("llm.call", model=request.get("model", "")) as s:
+                started = time.perf_counter()
+                first_token = None
+                stream = self.client.chat.completions.create(
+                    stream=True, stream_options={"include_usage": True}, **request
+                )
+                for chunk in stream:
+                    if getattr(chunk, "usage", None) is not None:
+                        flight.usage = chunk.usage
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        if first_token is None:
+                            first_token = time.perf_counter() - started
+                            tracer.observe("llm.ttft", first_token)
+                        with flight.cond:
+                            flight.chunks.append(chunk.choices[0].delta.content)
+                            flight.cond.notify_all()
+                if flight.usage is not None:
+                    s.set(
+                        prompt_tokens=getattr(flight.usage, "prompt_tokens", None),
+                        completion_tokens=getattr(flight.usage, "completion_tokens", None),
+                    )
+                    tracer.incr("llm.prompt_tokens", getattr(flight.usage, "prompt_tokens", 0) or 0)
+                    tracer.incr("llm.completion_tokens", getattr(flight.usage, "completion_tokens", 0) or 0)
+                if first_token is not None:
+                    s.set(ttft_ms=round(first_token * 1000, 1))
+            self.breaker.record_success()
+        except Exception as e:
+            flight.error = e
+            # 시간 초과 / 연결 실패 / 429·5xx 만 장애로 센다 (잘못된 요청은 응답이 온 것)
+            if is_transient(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            with self._lock:
+                self.errors += 1
+        finally:
+            with self._lock:
+                self.running -= 1
+                # 끝난 요청은 목록에서 빼서 이후 같은 질문은 새로 호출 (재사용은 답변 캐시 몫)
+                self._inflight.pop(flight.key, None)
+            with flight.cond:
+                flight.done = True
+                flight.cond.notify_all()
+
+    # -----------------------------
+    # 지표
+    # -----------------------------
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self.queued,
+                "running": self.running,
+                "max_concurrency": self.max_concurrency,
+                "requests": self.requests,
+                "coalesced": self.coalesced,
+                "errors": self.errors,
+                "wait_avg_sec": round(self.wait_total / self.started, 3) if self.started else 0.0,
+                "wait_max_sec": round(self.wait_max, 3),
+                "circuit": self.breaker.stats(),
+            }
@@ -0,0 +1,60 @@
+"""MBTI 시트 인덱스
+
+시트를 로드할 때 한 번만 16개 유형을 dict 로 색인하고 요약 마크다운까지
+미리 만들어 둔다. 질문 처리 중에는 pandas 작업 없이 O(1) 조회만 한다.
+"""
+
+
+class MbtiRecord:
+    __slots__ = ("code", "alias", "traits", "strengths", "weaknesses", "relations", "fields", "summary")
+
+    def __init__(self, code, alias, traits, strengths, weaknesses, relations, fields):
+        self.code = code
+        self.alias = alias
+        self.traits = traits
+        self.strengths = strengths
+        self.weaknesses = weaknesses
+        self.relations = relations
+        self.fields = fields
+        self.summary = (
+            f"{code} ({alias})\n"
+            f"- 주요 특징: {traits}\n"
+            f"- 강점: {strengths}\n"
+            f"- 약점: {weaknesses}\n"
+            f"- 잘 맞는 분야: {fields}\n\n"
+            f"(출처: MBTI 시트)"
+        )
+
+
+class MbtiIndex:
+    __slots__ = ("_records",)
+
+    def __init__(self, records=()):
+        self._records = {r.code: r for r in records}
+
+    def __contains__(self, code):
+        return bool(code) and code.strip().upper() in self._records
+
+    def __len__(self):
+        return len(self._records)
+
+    def get(self, code):
+        if not code:
+            return None
+        return self._records.get(code.strip().upper())
+
+    def summary(self, code):
+        record = self.get(code)
+        return record.summary if record else None
+
+
+def build_mbti_index(df):
+    def col(name):
+        # 시트에 없는 컬럼은 빈 값으로
+        if name not in df.columns:
+            return [""] * len(df)
+        return df[name].fillna("").astype(str).str.strip().tolist()
+
+    codes = df["MBTI"].fillna("").astype(str).str.strip().str.upper().tolist()
+    rows = zip(codes, col("별칭"), col("주요 특징"), col("강점"), col("약점"), col("대인관계"), col("잘 맞는 분야"))
+    return MbtiIndex(MbtiRecord(*row) for row in rows if row[0])
@@ -0,0 +1,126 @@
+"""화면 공용 HTML 조각 — Streamlit 앱과 정적 내보내기(static_site)가 같이 쓴다
+
+시트 데이터만으로 정해지는 부분(CSS, 홈 메뉴, 기본 정보 카드)을 한 곳에 두어
+두 쪽 화면이 어긋나지 않게 한다. st.* 호출 없음.
+"""
+from datetime import datetime
+from html import escape
+
+GLOBAL_CSS = """
+<style>
+.appview-container .main .block-container { padding-top: 0rem; padding-bottom: 0rem; }
+.menu-grid { height: 100vh; width: 100%; display: flex; flex-direction: column; justify-content: center; align-items: center; }
+.menu-card { height: 25vh; width: 100%; display: flex; align-items: center; justify-content: center; text-align: center; font-weight: 800; font-size: clamp(20px, 5vw, 28px); letter-spacing: 0.4px; color: #FFFFFF; user-select: none; text-decoration: none !important; }
+.menu-card:active { filter: brightness(0.95); transform: scale(0.996); }
+
+/*  파스텔 톤 적용 */
+.menu-1 { background: #A8D8EA; }  /* 파스텔 블루 */
+.menu-2 { background: #B8E0D2; }  /* 파스텔 민트 */
+.menu-3 { background: #FBC4AB; }  /* 파스텔 코랄 */
+.menu-4 { background: #FFB5E8; }  /* 파스텔 핑크 */
+
+.menu-card a { display: flex; align-items: center; justify-content: center; width: 100%; height: 100%; text-decoration: none !important; color: #333333 !important; } /* 글씨는 진한 회색으로 */
+.menu-icon { margin-right: 12px; font-size: 1.2em; }
+.content { padding: 16px 8px 32px; }
+.info-card { border-radius: 16px; padding: 16px; background: #ffffff; box-shadow: 0 8px 20px rgba(0,0,0,0.06); border: 1px solid rgba(0,0,0,0.05); }
+.info-title { font-weight: 700; margin-bottom: 8px; }
+.info-row { margin: 6px 0; line-height: 1.6; font-size: 16px; }
+.badge { display:inline-block; background:#f2f4f7; padding:2px 8px; border-radius:999px; font-size:12px; margin-left:6px; vertical-align: middle; }
+</style>
+"""
+
+HOME_INTRO_HTML = """
+<div style="text-align:center; padding:20px; margin-bottom:20px;">
+    <h2> 이 사이트는 다음 기술로 제작되었습니다</h2>
+    <p style="font-size:16px; line-height:1.6;">
+         <b>Streamlit</b> → 웹 UI/UX 제작<br>
+         <b>Google Sheets + Pandas</b> → 데이터 관리 및 불러오기<br>
+         <b>OpenAI GPT API</b> → 챗봇 응답 생성 및 장소 추천 로직 구현<br>
+         <b>HTML + CSS</b> → UI 커스터마이징<br>
+         <b>Session State</b> → 대화 기록, 질문 횟수 제한 관리<br>
+         <b>Streamlit Cloud + GitHub</b> → 배포 및 운영, Secrets 통한 보안 관리<br>
+         <b>지도 검색 API + 자동 링크 생성</b> → 맛집·여행지 관련 지도 URL 동적 생성<br>
+         <b>GPT + 지역 선택 UI</b> → 지역 기반 맛집·여행지 추천 엔진 구축
+    </p>
+</div>
+"""
+
+# (route, 라벨) — 홈 메뉴 순서
+MENU_ITEMS = [
+    ("about", "소개"),
+    ("career", "경력 상세"),
+    ("contact", "질문"),
+    ("etc", "기타"),
+]
+
+
+def menu_html(link):
+    """홈 메뉴 4칸 — link(route) → href"""
+    cards = "".join(
+        f"""
+    <div class="menu-card menu-{i}">
+        <a href="{escape(link(route))}"><span class="menu-icon"></span>{label}</a>
+    </div>"""
+        for i, (route, label) in enumerate(MENU_ITEMS, start=1)
+    )
+    return f'<div class="menu-grid">{cards}\n</div>'
+
+
+def parse_birth_info(birth_str: str, gender_str: str = ""):
+    try:
+        yy = int(birth_str[0:2])
+        mm = int(birth_str[2:4])
+        dd = int(birth_str[4:6])
+
+        current_year = datetime.today().year
+        year = 2000 + yy if (2000 + yy) <= current_year else 1900 + yy
+
+        birth_date = datetime(year, mm, dd)
+        today = datetime.today()
+        age = today.year - birth_date.year - (
+                (today.month, today.day) < (birth_date.month, birth_date.day)
+        )
+
+        gender = gender_str if gender_str else "-"
+        return year, mm, dd, gender, age
+    except Exception:
+        return "-", "-", "-", "-", "-"
+
+
+def info_card_html(profile):
+    """소개 페이지 '기본 정보' 카드"""
+    birth_str = profile.get("생년월일", "")
+    gender_str = profile.get("성별", "")
+    year, mm, dd, gender, age = parse_birth_info(birth_str, gender_str)
+
+    if isinstance(year, int) and isinstance(mm, int) and isinstance(dd, int):
+        birth_display = f"{year}-{mm:02d}-{dd:02d} ({gender})"
+    else:
+        birth_display = f"{birth_str} ({gender})"
+
+    def field(key):
+        return escape(profile.get(key, "-"))
+
+    return f"""
+<div class="info-card">
+    <div class="info-title">기본 정보</div>
+    <div class="info-row"> 이름: {field('이름')}</div>
+    <div class="info-row"> 생년월일: {escape(birth_display)}</div>
+    <div class="info-row"> 나이: {age}세</div>
+    <div class="info-row"> 직업: {field('직업')}</div>
+    <div class="info-row"> 한 줄 소개: {field('한줄소개')}</div>
+    <div class="info-row"> 사용 RPA툴: {field('사용rpa툴')}</div>
+    <div class="info-row"> 사는곳: {field('사는곳')}</div>
+</div>
+"""
+
+
+def contact_links(profile):
+    """연락 버튼 (라벨, URL) 목록 — 값이 없는 항목은 뺀다"""
+    links = [
+        (" 전화하기", f"tel:{profile.get('연락처', '')}"),
+        (" 이메일", f"mailto:{profile.get('이메일', '')}"),
+    ]
+    if profile.get("지도url"):
+        links.append((" 위치(네이버지도)", profile["지도url"]))
+    return links
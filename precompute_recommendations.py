@@ -0,0 +1,105 @@
+"""지역별 맛집/여행지 추천 사전 계산 배치
+
+regions.tsv 의 지역(가장 아래 단계 행정구역 코드) × 추천 종류 조합 전체를 GPT 로 미리 만들어
+추천 저장소(앱과 같은 $QR_LANDING_CACHE_DIR/recommendations.sqlite, 기본 .cache/)에 채운다. 앱은 저장소에 있으면 바로 보여준다.
+
+    python precompute_recommendations.py --workers 4
+    python precompute_recommendations.py --sido 서울특별시 --force
+
+API 키는 OPENAI_API_KEY 환경변수 또는 .streamlit/secrets.toml 의 api_key 를 사용한다.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tomllib
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import openai
+from openai import OpenAI
+
+from recommend import CATEGORIES, category_keyword, fetch_places, format_location
+from recommend_store import RECOMMEND_STORE_PATH, RecommendationStore, region_key
+from regions import iter_regions
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_api_key():
+    if os.environ.get("OPENAI_API_KEY"):
+        return os.environ["OPENAI_API_KEY"]
+    secrets_path = os.path.join(BASE_DIR, ".streamlit", "secrets.toml")
+    with open(secrets_path, "rb") as f:
+        return tomllib.load(f)["api_key"]
+
+
+def with_backoff(fn, retries=5, base_delay=2.0, max_delay=60.0):
+    """레이트리밋/일시 오류 시 지수 백오프 + 지터로 재시도 (클라이언트는 SDK 재시도를 끈다 — 재시도는 여기서만)"""
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except (openai.RateLimitError, openai.APITimeoutError, openai.APIConnectionError,
+                openai.InternalServerError):
+            if attempt == retries:
+                raise
+            delay = min(max_delay, base_delay * 2 ** attempt)
+            time.sleep(delay / 2 + random.uniform(0, delay / 2))
+
+
+def build_jobs(store, sido=None, force=False):
+    done = set() if force else store.fresh_keys()
+    jobs = []
+    for code, *names in iter_regions():
+        if sido and names[0] != sido:
+            continue
+        for category in CATEGORIES:
+            key = region_key(code, category)
+            if key not in done:
+                jobs.append((key, format_location(*names), category))
+    return jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="지역별 추천 결과 사전 계산")
+    parser.add_argument("--workers", type=int, default=4, help="동시 GPT 호출 수")
+    parser.add_argument("--store", default=RECOMMEND_STORE_PATH, help="추천 저장소 경로")
+    parser.add_argument("--ttl", type=int, default=7 * 24 * 3600, help="이보다 오래된 결과만 다시 계산 (초)")
+    parser.add_argument("--sido", help="특정 시/도만 계산")
+    parser.add_argument("--force", action="store_true", help="저장된 결과가 있어도 다시 계산")
+    args = parser.parse_args(argv)
+
+    store = RecommendationStore(args.store, ttl=args.ttl)
+    # 배치는 레이트리밋에 길게 기다리는 with_backoff 로만 재시도 — SDK 재시도까지 겹치면 호출이 곱으로 늘어난다
+    client = OpenAI(api_key=load_api_key(), max_retries=0)
+    jobs = build_jobs(store, sido=args.sido, force=args.force)
+    print(f"계산할 조합: {len(jobs)}개 (workers={args.workers})")
+
+    def run(job):
+        key, location, category = job
+        places, raw_text, _ = with_backoff(lambda: fetch_places(client, location, category))
+        if not places:
+            raise ValueError("응답에서 장소를 읽지 못했습니다")
+        store.put(key, places, raw_text)
+        return key
+
+    failed = 0
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(run, job): job for job in jobs}
+        for i, future in enumerate(as_completed(futures), 1):
+            _, location, category = futures[future]
+            label = f"{location} {category_keyword(category)}"
+            try:
+                future.result()
+                print(f"[{i}/{len(jobs)}] ✅ {label}")
+            except Exception as e:
+                failed += 1
+                print(f"[{i}/{len(jobs)}] ⚠️ {label}: {e}", file=sys.stderr)
+
+    print(f"완료: {len(jobs) - failed}개 성공, {failed}개 실패 ({time.time() - started:.1f}s)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+"""프로필(QR 카드) 레지스트리 + 프로필별 저장소 풀
+
+한 프로세스에서 여러 사람의 카드를 서빙한다 (?profile=<id>).
+- 프로필 1개 = ProfileSource 1개 (자기소개/경력 시트 URL, 프로필 사진 URL)
+- 실제로 열린 프로필만 ProfileRuntime (시트 저장소 + 컨텍스트/경력 캐시) 을 메모리에 올린다
+- 전체 메모리 예산을 넘으면 가장 오래 안 쓴 프로필부터 내린다 (LRU)
+- 모든 저장소가 HTTP 커넥션 풀 하나, 다운로드 스레드 풀 하나, 갱신 스레드 하나를 같이 쓴다
+- MBTI 설명 같은 공용 시트는 shared 저장소 하나만 둔다
+- shared_cache 를 주면 워커 프로세스들이 시트 스냅샷을 나눠 쓴다 (sheet_store.refresh_shared)
+"""
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from career_view import CareerViewCache
+from intent_router import IntentCache
+from llm_context import ContextCache
+from sheet_registry import CAREER_SHEET_URL, PROFILE_SHEET_URL, profile_sheet_specs
+from sheet_store import SHEET_TIMEOUT, SheetStore
+from tracing import span, tracer
+
+DEFAULT_PROFILE = "default"
+# 앱 폴더 기준 로컬 파일 또는 http(s) URL (image_pipeline 이 한 번 읽어 크기별로 캐시)
+DEFAULT_IMAGE_URL = "baekmin.jpg"
+
+# URL 파라미터 / 스냅샷 파일명으로 그대로 쓰므로 안전한 문자만 허용
+PROFILE_ID_RE = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+@dataclass(frozen=True)
+class ProfileSource:
+    id: str
+    profile_url: str
+    career_url: str
+    image_url: str = ""
+    ttl: int = 300   # 자기소개/경력 시트 갱신 주기 (초)
+
+    def specs(self):
+        return profile_sheet_specs(self.profile_url, self.career_url, ttl=self.ttl)
+
+
+PROFILES = {}
+
+
+def register_profile(id, profile_url, career_url, *, image_url="", ttl=300):
+    if not PROFILE_ID_RE.match(id):
+        raise ValueError(f"잘못된 프로필 id: {id!r}")
+    source = ProfileSource(id=id, profile_url=profile_url, career_url=career_url,
+                           image_url=image_url, ttl=ttl)
+    PROFILES[id] = source
+    return source
+
+
+def load_profiles_file(path):
+    """JSON 목록 [{"id", "profile_url", "career_url", "image_url"?, "ttl"?}, ...] 을 등록 → 등록 수"""
+    with open(path, encoding="utf-8") as f:
+        entries = json.load(f)
+    for entry in entries:
+        register_profile(
+            entry["id"], entry["profile_url"], entry["career_url"],
+            image_url=entry.get("image_url", ""),
+            ttl=int(entry.get("ttl", 300)),
+        )
+    return len(entries)
+
+
+register_profile(DEFAULT_PROFILE, PROFILE_SHEET_URL, CAREER_SHEET_URL, image_url=DEFAULT_IMAGE_URL)
+
+
+# -----------------------------
+# 메모리 추정
+# -----------------------------
+def estimate_size(obj):
+    """대략적인 점유 바이트 (DataFrame 은 deep memory_usage, 컨테이너는 1단계만)"""
+    if hasattr(obj, "memory_usage"):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in obj.items())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(sys.getsizeof(x) for x in obj)
+    return sys.getsizeof(obj)
+
+
+class ProfileRuntime:
+    """메모리에 올라온 프로필 1개 — 시트 저장소와 파생 캐시"""
+
+    def __init__(self, source, store, career_page_size=10):
+        self.source = source
+        self.store = store
+        self.context_cache = ContextCache()
+        self.intent_cache = IntentCache()
+        self.career_cache = CareerViewCache(page_size=career_page_size)
+        self.last_used = time.time()
+        self._data_size = ("", 0)   # (content_key, bytes) — 시트가 안 바뀌면 다시 재지 않음
+
+    @property
+    def id(self):
+        return self.source.id
+
+    def memory_bytes(self):
+        key = self.store.content_key(tuple(self.store.specs))
+        if self._data_size[0] != key:
+            size = sum(estimate_size(self.store.get(name)) for name in self.store.specs)
+            self._data_size = (key, size)
+        total = self._data_size[1]
+        context = self.context_cache._current
+        if context is not None:
+            total += sys.getsizeof(context.context) + sys.getsizeof(context.system_prompt)
+        career = self.career_cache._current
+        if career is not None:
+            total += estimate_size(career.pages)
+        return total
+
+
+class ProfilePool:
+    def __init__(self, shared_specs, profiles=None, cache_dir=None, memory_budget=64 * 1024 * 1024,
+                 pool_size=20, timeout=SHEET_TIMEOUT, career_page_size=10, refresh_tick=60, on_load=None,
+                 shared_cache=None):
+        # profiles: {id: ProfileSource} (기본은 모듈 레지스트리 PROFILES)
+        # on_load(runtime): 프로필이 처음 올라올 때 1번 (요청한 세션 스레드에서 호출)
+        # shared_cache: 워커 프로세스끼리 같이 쓰는 캐시 (shared_cache.SQLiteCache) — 없으면 워커마다 따로 받는다
+        self.profiles = PROFILES if profiles is None else profiles
+        self.cache_dir = cache_dir
+        self.memory_budget = memory_budget
+        self.timeout = timeout
+        self.career_page_size = career_page_size
+        self.refresh_tick = refresh_tick
+        self.on_load = on_load
+        self.shared_cache = shared_cache
+
+        # 모든 저장소가 같이 쓰는 커넥션 풀 (구글 시트는 같은 호스트라 keep-alive 재사용)
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        # 시트 동시 다운로드 — 커넥션 풀과 같은 크기 (한 프로필의 자기소개/경력, 갱신 주기의 모든 시트)
+        self.fetcher = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sheet-fetch")
+
+        self.shared = SheetStore(shared_specs, timeout=timeout, snapshot_path=self._path("sheets.pkl"),
+                                 session=self.session, executor=self.fetcher, cache=shared_cache)
+
+        self._active = OrderedDict()   # id → ProfileRuntime (뒤쪽일수록 최근 사용)
+        self._loading = {}             # id → Lock (같은 프로필 동시 첫 로드는 1번만)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+        # 지표
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+        self.memory_used = 0
+
+    def _path(self, *parts):
+        return os.path.join(self.cache_dir, *parts) if self.cache_dir else None
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def get(self, profile_id):
+        """프로필 런타임 (처음이면 로드) — 등록되지 않은 id 면 None"""
+        source = self.profiles.get(profile_id)
+        if source is None:
+            return None
+        runtime = self._touch(profile_id)
+        if runtime is not None:
+            return runtime
+
+        with self._lock:
+            load_lock = self._loading.setdefault(profile_id, threading.Lock())
+        with load_lock:
+            # 같은 프로필을 동시에 연 다른 세션이 먼저 올렸으면 그대로 사용
+            runtime = self._touch(profile_id)
+            if runtime is not None:
+                return runtime
+            runtime = self._load(source)
+            if self.on_load is not None:
+                self.on_load(runtime)
+            with self._lock:
+                self._active[profile_id] = runtime
+                self._loading.pop(profile_id, None)
+                self.loads += 1
+        self._evict(keep=profile_id)
+        # 디스크 스냅샷으로 띄웠으면 원본 확인은 갱신 스레드에서 바로
+        self._wake.set()
+        return runtime
+
+    def _touch(self, profile_id):
+        with self._lock:
+            runtime = self._active.get(profile_id)
+            if runtime is not None:
+                self._active.move_to_end(profile_id)
+                runtime.last_used = time.time()
+                self.hits += 1
+            return runtime
+
+    def _load(self, source):
+        store = SheetStore(
+            source.specs(),
+            timeout=self.timeout,
+            snapshot_path=self._path("profiles", f"{source.id}.pkl"),
+            session=self.session,
+            executor=self.fetcher,
+            cache=self.shared_cache,
+        )
+        with span("profile.load", profile=source.id):
+            store.start(background=False)
+        return ProfileRuntime(source, store, career_page_size=self.career_page_size)
+
+    def _evict(self, keep):
+        # 예산을 넘으면 가장 오래 안 쓴 프로필부터 내린다 (방금 연 프로필은 제외)
+        # 내린 프로필을 아직 보고 있는 세션은 들고 있는 참조로 마저 렌더링한다
+        with self._lock:
+            sizes = {pid: runtime.memory_bytes() for pid, runtime in self._active.items()}
+            total = sum(sizes.values())
+            for pid in list(self._active):
+                if total <= self.memory_budget:
+                    break
+                if pid == keep:
+                    continue
+                del self._active[pid]
+                total -= sizes[pid]
+                self.evictions += 1
+                tracer.incr("profile.evicted")
+            self.memory_used = total
+
+    # -----------------------------
+    # 갱신 (스레드 1개가 공용 + 활성 프로필 저장소를 모두 돈다)
+    # -----------------------------
+    def start(self):
+        if self._thread is not None:
+            return
+        self.shared.start(background=False)
+        self._thread = threading.Thread(target=self._run, name="sheet-refresh", daemon=True)
+        self._thread.start()
+        self._wake.set()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        self.fetcher.shutdown(wait=False)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.refresh_tick)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            with self._lock:
+                stores = [self.shared] + [runtime.store for runtime in self._active.values()]
+            # 주기가 지난 시트만 — 모든 저장소의 시트를 한꺼번에 동시에 받는다 (대부분은 304 / 해시 동일)
+            jobs = [(store, name) for store in stores for name in store.due_names()]
+            results = list(self.fetcher.map(lambda job: job[0].refresh_sheet(job[1]), jobs))
+            for store in stores:
+                store.publish([name for (s, name), updated in zip(jobs, results) if s is store and updated])
+
+    # -----------------------------
+    # 지표
+    # -----------------------------
+    def stats(self):
+        with self._lock:
+            return {
+                "registered": len(self.profiles),
+                "active": len(self._active),
+                "hits": self.hits,
+                "loads": self.loads,
+                "evictions": self.evictions,
+                "memory_bytes": self.memory_used,
+                "memory_budget": self.memory_budget,
+            }
+
+    def health(self):
+        now = time.time()
+        with self._lock:
+            active = list(self._active.values())
+        return {
+            "background": self._thread is not None and self._thread.is_alive(),
+            "shared": self.shared.health(),
+            "profiles": {
+                runtime.id: {
+                    "idle_sec": round(now - runtime.last_used, 1),
+                    "memory_bytes": runtime.memory_bytes(),
+                    **runtime.store.health(),
+                }
+                for runtime in active
+            },
+            **self.stats(),
+        }
@@ -1,14 +1,101 @@
 import streamlit as st
 from urllib.parse import urlencode
-from datetime import datetime
-import pandas as pd
-from openai import OpenAI
-import re
+import hashlib
+import hmac
+import math
+import os
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Callable, NamedTuple
+
+from answer_cache import AnswerCache
+from llm_gateway import LLM_TIMEOUT, LLMGateway
+from image_pipeline import DISPLAY_WIDTH, ImagePipeline
+from intent_router import IntentStats, render_intent_answer
+from page_layout import GLOBAL_CSS, HOME_INTRO_HTML, info_card_html, menu_html
+from profiles import DEFAULT_PROFILE, PROFILES, ProfilePool, load_profiles_file
+from rate_limit import MemoryBackend, RateLimiter, RateRule, SQLiteBackend
+from resilience import CircuitOpenError, is_transient
+from shared_cache import MemoryCache, SQLiteCache
+from recommend import (
+    CATEGORIES, EMPTY_RESULT, PLACE_ATTEMPTS, RESULT_TITLE, build_place_request, category_keyword,
+    format_location, iter_places, render_place_card, render_places, request_places,
+)
+from recommend_store import RECOMMEND_STORE_PATH, RecommendationStore, region_key
+from regions import load_gazetteer
+from sheet_registry import SHEETS
+from static_site import STATIC_ROUTES, export_on_change, static_page_path
+from tracing import serve_metrics, span, tracer
 
 # -----------------------------
-# OpenAI 설정
+# OpenAI 설정 (프로세스 공용 게이트웨이 — llm_gateway 참고)
 # -----------------------------
-client = OpenAI(api_key=st.secrets["api_key"])
+LLM_MAX_CONCURRENCY = 8    # 동시에 OpenAI 로 나가는 요청 수 (나머지는 대기열)
+LLM_MAX_QUEUE = 200        # 대기열이 이보다 길면 바로 "잠시 후 다시" 응답
+LLM_MAX_CONNECTIONS = 20   # HTTP 커넥션 풀 크기
+
+@st.cache_resource
+def get_llm_gateway():
+    gateway = LLMGateway(
+        api_key=st.secrets["api_key"],
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        max_queue=LLM_MAX_QUEUE,
+        max_connections=LLM_MAX_CONNECTIONS,
+        timeout=LLM_TIMEOUT,   # 연속 실패로 차단기가 열리면 저장된 답변/추천으로 대체
+    )
+    tracer.register_gauge("llm_gateway", gateway.stats)
+    return gateway
+
+# -----------------------------
+# 요청 제한 (LLM 을 실제로 부를 때만 — 캐시 적중은 제외, rate_limit 참고)
+# -----------------------------
+RATE_LIMITS = {
+    "answer": RateRule(capacity=10, per=3600),      # 클라이언트당 챗봇 답변 시간당 10회
+    "recommend": RateRule(capacity=10, per=3600),   # 클라이언트당 장소 추천 시간당 10회
+}
+RATE_LIMIT_GLOBAL = RateRule(capacity=600, per=3600)   # 프로세스(또는 공유 DB) 전체 시간당 600회
+# 워커 여러 개가 한도를 같이 쓰려면 SQLite 파일 경로 지정 (없으면 프로세스 메모리)
+RATE_LIMIT_DB = os.environ.get("QR_LANDING_RATE_LIMIT_DB", "")
+# 클라이언트를 무엇으로 구분할지 (새 탭 / "초기화" 로 한도가 초기화되지 않도록)
+# - "browser" (기본): 브라우저마다 1개인 Streamlit XSRF 쿠키, 없으면 세션
+# - "ip": 접속 IP — 프록시 없이 직접 노출된 서버에서만 (프록시 뒤면 모든 방문자가 프록시 IP 하나)
+# - "forwarded": X-Forwarded-For 첫 주소 — 그 헤더를 덮어쓰는 믿을 수 있는 프록시 뒤에서만
+CLIENT_KEY_SOURCE = os.environ.get("QR_LANDING_CLIENT_KEY", "browser")
+BROWSER_COOKIE = "_streamlit_xsrf"   # 서버가 처음 접속할 때 심고 탭이 바뀌어도 그대로
+
+@st.cache_resource
+def get_rate_limiter():
+    backend = SQLiteBackend(RATE_LIMIT_DB) if RATE_LIMIT_DB else MemoryBackend()
+    limiter = RateLimiter(backend, RATE_LIMITS, global_rule=RATE_LIMIT_GLOBAL)
+    tracer.register_gauge("rate_limit", limiter.stats)
+    return limiter
+
+def client_key():
+    ip = None
+    if CLIENT_KEY_SOURCE == "forwarded":
+        ip = st.context.headers.get("X-Forwarded-For", "").split(",")[0].strip()
+    elif CLIENT_KEY_SOURCE == "ip":
+        ip = st.context.ip_address   # localhost 접속이면 None
+    if isinstance(ip, str) and ip:
+        return f"ip:{ip}"
+    cookie = st.context.cookies.get(BROWSER_COOKIE)
+    if CLIENT_KEY_SOURCE == "browser" and isinstance(cookie, str) and cookie:
+        # 토큰 원문은 저장소에 남기지 않는다
+        return "browser:" + hashlib.sha256(cookie.encode()).hexdigest()[:32]
+    if "client_id" not in st.session_state:
+        st.session_state.client_id = uuid.uuid4().hex
+    return f"session:{st.session_state.client_id}"
+
+def check_rate_limit(kind):
+    decision = get_rate_limiter().check(kind, client_key())
+    if not decision.allowed:
+        tracer.incr(f"ratelimit.{kind}.{decision.scope}")
+    return decision
+
+def rate_limited_message(decision):
+    minutes = max(1, math.ceil(decision.retry_after / 60))
+    return f"⏳ 요청이 많아 잠시 쉬어갑니다. 약 {minutes}분 후 다시 시도해주세요."
 
 # -----------------------------
 # Config
@@ -19,79 +106,82 @@ st.set_page_config(
     layout="wide",
 )
 
-# -----------------------------
-# Google Sheets URL
-# -----------------------------
-PROFILE_SHEET_URL = "https://docs.google.com/spreadsheets/d/1eOApzLbogOSx68xf7d3Wj0xs-7acj9HKLDM5GXMR4P0/export?format=csv&gid=0"
-CAREER_SHEET_URL = "https://docs.google.com/spreadsheets/d/18ohr0sXHqPYu0Bzk8UCQUsKGNCIUHoAEQm0FA7IrdKA/export?format=csv&gid=0"
-MBTI_SHEET_URL = "https://docs.google.com/spreadsheets/d/1GJ1gQfkArBmiI4Kus8Isl8mkCIGMxNLSb9Bw6KvKSVU/export?format=csv&gid=0"
-
 # Video URLs (YouTube recommended)
 SHORTS_VIDEO_URL = "https://raw.githubusercontent.com/qor0850/streamlit-shorts/main/shots.mp4"
 
 # -----------------------------
-# 데이터 로드 (5분마다 자동 갱신)
-# -----------------------------
-@st.cache_data(ttl=300)  # 5분마다 초기화
-def load_profile_sheet(url):
-    ...
-
-@st.cache_data(ttl=300)  # 5분마다 초기화
-def load_career_sheet(url):
-    ...
-
-@st.cache_data(ttl=300)
-def load_mbti_sheet(url):
-    return pd.read_csv(url, encoding="utf-8-sig")
-
-mbti_data = load_mbti_sheet(MBTI_SHEET_URL)
-# -----------------------------
-# 데이터 로드
+# 데이터 로드 (시트별 주기로 백그라운드 자동 갱신 — sheet_registry / profiles 참고)
 # -----------------------------
-@st.cache_data
-def load_profile_sheet(url):
-    df = pd.read_csv(url)
-    keys = df.iloc[:, 0].astype(str).str.strip()
-    # 공백 제거 + 소문자 변환
-    keys = keys.str.lower().str.replace(" ", "")
-    vals = df.iloc[:, 1].astype(str).str.strip()
-    return dict(zip(keys, vals))
-
-@st.cache_data
-def load_career_sheet(url):
-    return pd.read_csv(url)
-
-def get_mbti_summary(mbti_code):
-    row = mbti_data[mbti_data["MBTI"] == mbti_code.upper()]
-    if row.empty:
-        return None
-
-    # ✅ 엑셀 컬럼 구조 그대로 출력
-    return f"""
-    ###  {row['MBTI'].values[0]} ({row['별칭'].values[0]})
-    **주요 특징**: {row['주요 특징'].values[0]}  
-    **강점**: {row['강점'].values[0]}  
-    **약점**: {row['약점'].values[0]}  
-    **잘 맞는 분야**: {row['잘 맞는 분야'].values[0]}  
-    (출처: MBTI 시트)
-    """
-    #
-    # row = mbti_data[mbti_data["MBTI"] == mbti_code.upper()]
-    # if row.empty:
-    #     return "해당 MBTI 데이터가 없습니다."
-    #
-    # return f"""
-    #  {row['MBTI'].values[0]} ({row['별칭'].values[0]})
-    # - 주요 특징: {row['주요 특징'].values[0]}
-    # - 강점: {row['강점'].values[0]}
-    # - 약점: {row['약점'].values[0]}
-    # - 대인관계: {row['대인관계'].values[0]}
-    # - 잘 맞는 분야: {row['잘 맞는 분야'].values[0]}
-    # """
-
-
-profile_data = load_profile_sheet(PROFILE_SHEET_URL)
-career_data = load_career_sheet(CAREER_SHEET_URL)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+# 디스크 캐시 위치 (벤치마크/테스트에서는 QR_LANDING_CACHE_DIR 로 분리)
+CACHE_DIR = os.environ.get("QR_LANDING_CACHE_DIR", os.path.join(APP_DIR, ".cache"))
+# 추가 프로필(QR 카드) 목록 — 없으면 기본 프로필 1개만
+PROFILES_FILE = os.environ.get("QR_LANDING_PROFILES", os.path.join(APP_DIR, "profiles.json"))
+PROFILE_MEMORY_BUDGET = 64 * 1024 * 1024   # 활성 프로필 전체 메모리 예산 (넘으면 LRU 로 내림)
+# 홈/소개/경력 정적 페이지 (static_site 참고) — 폴더를 주면 시트가 바뀔 때마다 다시 내보내고,
+# 주소를 주면 앱 안의 홈/소개/경력 링크가 정적 페이지로 간다
+STATIC_SITE_DIR = os.environ.get("QR_LANDING_STATIC_DIR", "")
+STATIC_SITE_URL = os.environ.get("QR_LANDING_STATIC_URL", "")
+APP_PUBLIC_URL = os.environ.get("QR_LANDING_APP_URL", "")
+CAREER_PAGE_SIZE = 10   # 한 페이지에 보여줄 경력 수 (0 이면 전체)
+# 워커(streamlit run) 여러 개가 시트 스냅샷 / 챗봇 답변 / 추천 잠금을 같이 쓰려면 SQLite 파일 경로
+# (shared_cache 참고 — 없으면 프로세스 메모리, 잠금은 같은 프로세스의 세션끼리만)
+SHARED_CACHE_DB = os.environ.get("QR_LANDING_SHARED_CACHE", "")
+
+@st.cache_resource
+def get_shared_cache():
+    cache = SQLiteCache(SHARED_CACHE_DB) if SHARED_CACHE_DB else MemoryCache()
+    tracer.register_gauge("shared_cache", cache.stats)
+    return cache
+
+def worker_cache():
+    # 워커끼리 나눌 캐시 — 프로세스 메모리 캐시면 시트/답변은 각자 들고 있는 것과 같으므로 None
+    cache = get_shared_cache()
+    return cache if cache.shared else None
+
+@st.cache_resource
+def get_profile_sources():
+    # 등록된 프로필 목록만 (시트는 읽지 않음) — 시트가 필요 없는 화면도 id 확인은 이걸로
+    if os.path.exists(PROFILES_FILE):
+        load_profiles_file(PROFILES_FILE)
+    return PROFILES
+
+@st.cache_resource
+def get_profile_pool():
+    # 프로세스당 1개 — 모든 세션/프로필이 커넥션 풀과 갱신 스레드를 공유
+    pool = ProfilePool(
+        SHEETS.values(),
+        profiles=get_profile_sources(),
+        cache_dir=CACHE_DIR,
+        memory_budget=PROFILE_MEMORY_BUDGET,
+        career_page_size=CAREER_PAGE_SIZE,
+        on_load=watch_profile,
+        shared_cache=worker_cache(),
+    )
+    pool.start()
+    tracer.register_gauge("profiles", pool.stats)
+    return pool
+
+def watch_profile(runtime):
+    # 프로필이 처음 올라올 때 + 시트가 바뀔 때마다 FAQ 답변을 미리 만들어 둔다
+    cache = get_answer_cache()
+
+    def prewarm(changed=None):
+        # 시트 값으로 바로 답하는 질문은 미리 만들 필요 없음
+        questions = [q for q in FAQ_QUESTIONS if route_question(q, runtime) is None]
+        threading.Thread(
+            target=cache.prewarm,
+            args=(questions, lambda q: answer_question(q, runtime), answer_version(runtime)),
+            name=f"faq-prewarm-{runtime.id}",
+            daemon=True,
+        ).start()
+
+    runtime.store.add_listener(prewarm)
+    prewarm()
+
+    if STATIC_SITE_DIR:
+        export_on_change(runtime, out_dir=STATIC_SITE_DIR, app_url=APP_PUBLIC_URL or "/",
+                         images=get_image_pipeline())
 
 # -----------------------------
 # Helpers
@@ -105,28 +195,21 @@ def get_route() -> str:
         return params["route"]
     return "home"
 
-def back_to_home():
-    st.markdown(f"[⬅️ 홈으로](?{urlencode({'route': 'home'})})")
-
-def parse_birth_info(birth_str: str, gender_str: str = ""):
-    try:
-        yy = int(birth_str[0:2])
-        mm = int(birth_str[2:4])
-        dd = int(birth_str[4:6])
+def get_profile_id() -> str:
+    return st.query_params.get("profile") or DEFAULT_PROFILE
 
-        current_year = datetime.today().year
-        year = 2000 + yy if (2000 + yy) <= current_year else 1900 + yy
+def page_link(route: str, **params) -> str:
+    # 같은 카드 안에서 이동하는 링크 — 기본 프로필이 아니면 ?profile= 을 유지
+    if STATIC_SITE_URL and route in STATIC_ROUTES:
+        return f"{STATIC_SITE_URL.rstrip('/')}/{static_page_path(profile_id, route, params.get('page', 1))}"
+    query = {"route": route}
+    if profile_id != DEFAULT_PROFILE:
+        query["profile"] = profile_id
+    query.update(params)
+    return f"?{urlencode(query)}"
 
-        birth_date = datetime(year, mm, dd)
-        today = datetime.today()
-        age = today.year - birth_date.year - (
-                (today.month, today.day) < (birth_date.month, birth_date.day)
-        )
-
-        gender = gender_str if gender_str else "-"
-        return year, mm, dd, gender, age
-    except Exception:
-        return "-", "-", "-", "-", "-"
+def back_to_home():
+    st.markdown(f"[⬅️ 홈으로]({page_link('home')})")
 
 def contact_buttons():
     cols = st.columns(2)
@@ -140,236 +223,255 @@ def contact_buttons():
     #     st.link_button(" 인스타그램", profile_data["인스타그램"], use_container_width=True)
     # if "예약URL" in profile_data and profile_data["예약URL"]:
     #     st.link_button(" 예약하기", profile_data["예약URL"], use_container_width=True)
-    if "지도URL" in profile_data and profile_data["지도URL"]:
-        st.link_button(" 위치(네이버지도)", profile_data["지도URL"], use_container_width=True)
+    # 시트 키는 소문자/공백 제거로 정규화돼 있음 ("지도URL" → "지도url")
+    if profile_data.get("지도url"):
+        st.link_button(" 위치(네이버지도)", profile_data["지도url"], use_container_width=True)
 
 # -----------------------------
 # CSS
 # -----------------------------
-GLOBAL_CSS = """
-<style>
-.appview-container .main .block-container { padding-top: 0rem; padding-bottom: 0rem; }
-.menu-grid { height: 100vh; width: 100%; display: flex; flex-direction: column; justify-content: center; align-items: center; }
-.menu-card { height: 25vh; width: 100%; display: flex; align-items: center; justify-content: center; text-align: center; font-weight: 800; font-size: clamp(20px, 5vw, 28px); letter-spacing: 0.4px; color: #FFFFFF; user-select: none; text-decoration: none !important; }
-.menu-card:active { filter: brightness(0.95); transform: scale(0.996); }
-
-/*  파스텔 톤 적용 */
-.menu-1 { background: #A8D8EA; }  /* 파스텔 블루 */
-.menu-2 { background: #B8E0D2; }  /* 파스텔 민트 */
-.menu-3 { background: #FBC4AB; }  /* 파스텔 코랄 */
-.menu-4 { background: #FFB5E8; }  /* 파스텔 핑크 */
-
-.menu-card a { display: flex; align-items: center; justify-content: center; width: 100%; height: 100%; text-decoration: none !important; color: #333333 !important; } /* 글씨는 진한 회색으로 */
-.menu-icon { margin-right: 12px; font-size: 1.2em; }
-.content { padding: 16px 8px 32px; }
-.info-card { border-radius: 16px; padding: 16px; background: #ffffff; box-shadow: 0 8px 20px rgba(0,0,0,0.06); border: 1px solid rgba(0,0,0,0.05); }
-.info-title { font-weight: 700; margin-bottom: 8px; }
-.info-row { margin: 6px 0; line-height: 1.6; font-size: 16px; }
-.badge { display:inline-block; background:#f2f4f7; padding:2px 8px; border-radius:999px; font-size:12px; margin-left:6px; vertical-align: middle; }
-</style>
-"""
 st.markdown(GLOBAL_CSS, unsafe_allow_html=True)
 
 # -----------------------------
-# Career 요약 & Context 생성
+# Context (시트 내용이 바뀔 때만 재생성 — llm_context 참고)
 # -----------------------------
-def summarize_career(df, max_len=300):
-    summary_lines = []
-    for _, row in df.iterrows():
-        detail = str(row["상세 내용"]).replace("\\n", "\n")
-        if len(detail) > max_len:
-            detail = detail[:max_len] + "..."
-        summary_lines.append(
-            f"- {row['기간']} | {row['회사/기관']} | {row['직무']} | {detail}"
-        )
-    return "\n".join(summary_lines)
-
-def build_context(profile, career_df):
-    lines = []
-    lines.append("### [프로필]")
-    for k, v in profile.items():
-        lines.append(f"{k}: {v}")
-
-    lines.append("\n### [경력 요약]")
-    lines.append(summarize_career(career_df, max_len=300))
-
-    return "\n".join(lines)
+def get_llm_context(runtime):
+    # 프로필마다 따로 (프로필 런타임이 내려가면 같이 사라짐)
+    return runtime.context_cache.get(runtime.store)
 
 # -----------------------------
 # MBTI 요약 함수
 # -----------------------------
 def get_mbti_summary(mbti_code):
-    row = mbti_data[mbti_data["MBTI"] == mbti_code.upper()]
-    if row.empty:
-        return None
-
-    return f"""
-     {row['MBTI'].values[0]} ({row['별칭'].values[0]})
-    - 주요 특징: {row['주요 특징'].values[0]}
-    - 강점: {row['강점'].values[0]}
-    - 약점: {row['약점'].values[0]}
-    - 잘 맞는 분야: {row['잘 맞는 분야'].values[0]}
-    (출처: MBTI 시트)
-    """
+    # 로드 시 미리 렌더링해 둔 요약 (없는 유형이면 None)
+    return get_profile_pool().shared.get("mbti").summary(mbti_code)
+
 # -----------------------------
 # GPT 답변 함수
 # -----------------------------
-def get_openai_answer(user_input, profile, career_df):
-    profile_name = profile.get('이름', '사용자')
-    context = build_context(profile, career_df)
-
+MBTI_KEYWORDS = ["mbti", "성격", "유형"]
+
+# 빠른 질문 버튼 — 시트가 갱신될 때마다 답변을 미리 만들어 둔다
+FAQ_QUESTIONS = [
+    "간단히 자기소개 해주세요",
+    "경력/프로젝트를 알려주세요",
+    "MBTI가 어떻게 되나요?",
+    "취미는 뭐에요?",
+    "사는곳이 어디에요"
+]
+
+ANSWER_CACHE_SIZE = 512
+ANSWER_CACHE_TTL = 6 * 3600
+ANSWER_SIMILARITY = 0.8   # 글자 bigram 유사도 — 이 이상이면 같은 질문으로 취급 (None 이면 끔)
+
+STREAM_ANSWERS = True     # 답변/추천을 토큰 단위로 바로 표시
+
+# 프로필+경력 컨텍스트가 이 토큰 수를 넘으면 질문과 관련 있는 조각만 골라 넣는다 (retrieval 참고)
+CONTEXT_TOKEN_BUDGET = 1200
+CONTEXT_TOP_K = 8         # 고정 항목(이름/직업/한줄소개) 외에 넣을 최대 조각 수
+
+def is_mbti_question(user_input):
+    return any(k in user_input.lower() for k in MBTI_KEYWORDS)
+
+# 답변이 의존하는 조각 — 경력은 행 구성("career:rows")만 본다.
+# 기존 행의 상세 내용 오탈자 수정은 캐시된 답변을 버리지 않고 (새 답변부터 반영, TTL 로 교체),
+# 행 추가/삭제, 회사·직무·기간 변경, 프로필 항목 변경은 답변 캐시를 새로 시작한다.
+ANSWER_DEPENDS = ("profile", "career:rows")
+
+def answer_version(runtime):
+    # 답변 캐시는 프로필 전체가 같이 쓰고, 프로필별 구분도 이 키로 된다
+    shared = get_profile_pool().shared
+    return runtime.store.content_key(ANSWER_DEPENDS) + shared.content_key(("mbti",))
+
+def route_question(user_input, runtime):
+    """프로필 항목 하나로 답이 되는 질문이면 Intent, 아니면 None (intent_router 참고)"""
+    if is_mbti_question(user_input):
+        return None   # MBTI 는 시트 요약 + 설명 경로
+    return runtime.intent_cache.get(runtime.store).classify(user_input)
+
+@st.cache_resource
+def get_intent_stats():
+    stats = IntentStats()
+    tracer.register_gauge("intent", stats.stats)
+    return stats
+
+def local_answer(user_input, runtime):
+    # 시트 값으로 바로 답한다 — LLM·요청 한도·답변 캐시를 거치지 않음 (해당 없으면 None)
+    intent = route_question(user_input, runtime)
+    get_intent_stats().record(intent is not None)
+    return render_intent_answer(intent) if intent is not None else None
+
+def llm_chunks(request, stream=True):
+    """chat.completions 결과를 텍스트 조각 단위로 yield (stream=False 면 한 번에)
+    같은 요청이 동시에 들어오면 게이트웨이에서 1건으로 합쳐진다."""
+    gateway = get_llm_gateway()
+    if not stream:
+        yield gateway.complete(request)
+        return
+    yield from gateway.chunks(request)
+
+def answer_chunks(user_input, runtime, stream=True):
+    """LLM 으로 답변 생성 (st.* 호출 없음 — 백그라운드 프리워밍에서도 사용)"""
     # MBTI 관련 질문일 경우
-    mbti_keywords = ["mbti", "성격", "유형"]
-    if any(k in user_input.lower() for k in mbti_keywords):
-        my_mbti = profile.get("mbti", "").upper()  #  프로필 시트에서 내 MBTI 가져오기
-
-        if my_mbti and my_mbti in mbti_data["MBTI"].values:
-            summary = get_mbti_summary(my_mbti)
-
-            try:
-                response = client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": (
-                            f"너는 MBTI 성격 전문가 챗봇입니다.\n"
-                            f"아래 MBTI 정보를 참고해서 사용자에게 설명해줘.\n"
-                            f"출처는 '(출처: MBTI 시트)' 라고 반드시 마지막에 붙여."
-                        )},
-                        {"role": "user", "content": f"내 MBTI({my_mbti}) 특징을 쉽게 요약해서 설명해줘:\n\n{summary}"}
-                    ],
-                    temperature=0.6,
-                    max_tokens=300
-                )
-                explanation = response.choices[0].message.content.strip()
-
-                #  내 MBTI만 출력
-                st.markdown(summary)
-                st.markdown(" 추가 설명:")
-                st.markdown(explanation)
-                return None
-            except Exception as e:
-                return summary + f"\n\n(추가 설명 오류: {e})"
-        else:
-            return " 프로필에 MBTI 정보가 없습니다. (출처: MBTI 시트)"
+    if is_mbti_question(user_input):
+        my_mbti = runtime.store.get("profile").get("mbti", "").upper()  #  프로필 시트에서 내 MBTI 가져오기
+        summary = get_profile_pool().shared.get("mbti").summary(my_mbti)
+        if summary is None:
+            yield " 프로필에 MBTI 정보가 없습니다. (출처: MBTI 시트)"
+            return
+
+        # 시트 요약은 바로 보여주고, 추가 설명만 LLM 으로
+        yield f"{summary}\n\n 추가 설명:\n\n"
+        yield from llm_chunks({
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": (
+                    f"너는 MBTI 성격 전문가 챗봇입니다.\n"
+                    f"아래 MBTI 정보를 참고해서 사용자에게 설명해줘.\n"
+                    f"출처는 '(출처: MBTI 시트)' 라고 반드시 마지막에 붙여."
+                )},
+                {"role": "user", "content": f"내 MBTI({my_mbti}) 특징을 쉽게 요약해서 설명해줘:\n\n{summary}"}
+            ],
+            "temperature": 0.6,
+            "max_tokens": 300,
+        }, stream)
+        return
 
     # 일반 질문 → 기본 프로필 기반
+    # 프로필/경력 기반 system 프롬프트와 검색 색인은 스냅샷당 1번만 만들어 모든 세션이 공유
+    llm_context = get_llm_context(runtime)
+    system_prompt = llm_context.system_prompt_for(user_input, CONTEXT_TOKEN_BUDGET, CONTEXT_TOP_K)
+    yield from llm_chunks({
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_input}
+        ],
+        "temperature": 0.5,
+        "max_tokens": 250,
+    }, stream)
+
+def answer_question(user_input, runtime):
+    return "".join(answer_chunks(user_input, runtime, stream=False)).strip()
+
+@st.cache_resource
+def get_answer_cache():
+    # FAQ 프리워밍은 프로필이 올라올 때 watch_profile 에서
+    cache = AnswerCache(maxsize=ANSWER_CACHE_SIZE, ttl=ANSWER_CACHE_TTL, similarity=ANSWER_SIMILARITY,
+                        backend=worker_cache())
+    tracer.register_gauge("answer_cache", cache.stats)
+    return cache
+
+def get_openai_answer(user_input):
+    local = local_answer(user_input, profile_runtime)
+    if local is not None:
+        return local
+
+    cache = get_answer_cache()
+    version = answer_version(profile_runtime)
+    cached = cache.get(user_input, version)
+    if cached is not None:
+        return cached
+
+    decision = check_rate_limit("answer")
+    if not decision.allowed:
+        return limited_answer(user_input, version, decision)
+
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        f"너는 {profile_name}님의 자기소개 챗봇입니다.\n"
-                        f"아래 프로필(자기소개 시트)과 경력 요약(경력기술서 시트)을 참고해서만 답변하세요.\n"
-                        f"답변은 핵심만, 3~4문장 이내로 간결하게 작성하세요.\n"
-                        f"출처는 '(출처: 자기소개/경력기술서)' 라고 반드시 답변 마지막에 붙이세요.\n\n{context}"
-                    )
-                },
-                {"role": "user", "content": user_input}
-            ],
-            temperature=0.5,
-            max_tokens=250
-        )
-        return response.choices[0].message.content.strip()
+        answer = answer_question(user_input, profile_runtime)
+    except Exception as e:
+        return answer_error(user_input, version, e)
+
+    cache.put(user_input, version, answer)
+    return answer
+
+def stream_openai_answer(user_input):
+    """get_openai_answer 의 스트리밍 버전 — 조각을 yield 하고 끝나면 캐시에 저장"""
+    local = local_answer(user_input, profile_runtime)
+    if local is not None:
+        yield local
+        return
+
+    cache = get_answer_cache()
+    version = answer_version(profile_runtime)
+    cached = cache.get(user_input, version)
+    if cached is not None:
+        yield cached
+        return
+
+    decision = check_rate_limit("answer")
+    if not decision.allowed:
+        yield limited_answer(user_input, version, decision)
+        return
+
+    parts = []
+    try:
+        for piece in answer_chunks(user_input, profile_runtime, stream=True):
+            parts.append(piece)
+            yield piece
     except Exception as e:
-        return f"오류 발생: {e}"
+        yield "\n\n" + answer_error(user_input, version, e) if parts else answer_error(user_input, version, e)
+        return
+
+    cache.put(user_input, version, "".join(parts).strip())
+
+def limited_answer(user_input, version, decision):
+    # 한도 초과 — LLM 대신 가장 비슷한 저장된 답변, 그것도 없으면 안내 문구
+    closest = get_answer_cache().closest(user_input, version)
+    if closest is not None:
+        return f"{closest}\n\n(요청이 많아 비슷한 질문에 대한 저장된 답변을 보여드립니다)"
+    return rate_limited_message(decision)
+
+def is_llm_outage(e):
+    # 차단기가 열렸거나 시간 초과 / 연결 실패 / 429·5xx (재시도까지 실패)
+    return isinstance(e, CircuitOpenError) or is_transient(e)
+
+def answer_error(user_input, version, e):
+    if is_llm_outage(e):
+        # OpenAI 장애 — 비슷한 질문의 저장된 답변이 있으면 그걸로
+        closest = get_answer_cache().closest(user_input, version)
+        if closest is not None:
+            return f"{closest}\n\n(AI 응답이 원활하지 않아 비슷한 질문에 대한 저장된 답변을 보여드립니다)"
+    summary = get_mbti_summary(profile_data.get("mbti", "")) if is_mbti_question(user_input) else None
+    if summary:
+        return summary + f"\n\n(추가 설명 오류: {e})"
+    return f"오류 발생: {e}"
 
 
 # -----------------------------
 # Views
 # -----------------------------
 def view_home():
-    st.markdown("""
-        <div style="text-align:center; padding:20px; margin-bottom:20px;">
-            <h2> 이 사이트는 다음 기술로 제작되었습니다</h2>
-            <p style="font-size:16px; line-height:1.6;">
-                 <b>Streamlit</b> → 웹 UI/UX 제작<br>
-                 <b>Google Sheets + Pandas</b> → 데이터 관리 및 불러오기<br>
-                 <b>OpenAI GPT API</b> → 챗봇 응답 생성 및 장소 추천 로직 구현<br>
-                 <b>HTML + CSS</b> → UI 커스터마이징<br>
-                 <b>Session State</b> → 대화 기록, 질문 횟수 제한 관리<br>
-                 <b>Streamlit Cloud + GitHub</b> → 배포 및 운영, Secrets 통한 보안 관리<br>
-                 <b>지도 검색 API + 자동 링크 생성</b> → 맛집·여행지 관련 지도 URL 동적 생성<br>
-                 <b>GPT + 지역 선택 UI</b> → 지역 기반 맛집·여행지 추천 엔진 구축
-            </p>
-        </div>
-        """, unsafe_allow_html=True)
-
-    st.markdown(f"""
-        <div class="menu-grid">
-            <div class="menu-card menu-1">
-                <a href="?{urlencode({'route': 'about'})}"><span class="menu-icon"></span>소개</a>
-            </div>
-            <div class="menu-card menu-2">
-                <a href="?{urlencode({'route': 'career'})}"><span class="menu-icon"></span>경력 상세</a>
-            </div>
-            <div class="menu-card menu-3">
-                <a href="?{urlencode({'route': 'contact'})}"><span class="menu-icon"></span>질문</a>
-            </div>
-            <div class="menu-card menu-4">
-                <a href="?{urlencode({'route': 'etc'})}"><span class="menu-icon"></span>기타</a>
-            </div>
-        </div>
-    """, unsafe_allow_html=True)
+    st.markdown(HOME_INTRO_HTML, unsafe_allow_html=True)
+    st.markdown(menu_html(page_link), unsafe_allow_html=True)
+
+@st.cache_resource
+def get_image_pipeline():
+    # 프로필 사진 변형(1x/2x WebP/JPEG) bytes 캐시 — 프로세스당 1개, 시트와 같은 커넥션 풀 사용
+    pipeline = ImagePipeline(session=get_profile_pool().session)
+    tracer.register_gauge("images", pipeline.stats)
+    return pipeline
 
 def view_about():
     back_to_home()
     st.markdown('<div class="content">', unsafe_allow_html=True)
     st.markdown("## 소개 (About Me)")
     
-    #  프로필 사진 URL
-    profile_img_url = "https://raw.githubusercontent.com/qor0850/qr-landing/main/baekmin.jpg"
-    
-    #  기본 정보 표시 준비
-    birth_str = profile_data.get("생년월일", "")
-    gender_str = profile_data.get("성별", "")
-    year, mm, dd, gender, age = parse_birth_info(birth_str, gender_str)
-    
-    if isinstance(year, int) and isinstance(mm, int) and isinstance(dd, int):
-        birth_display = f"{year}-{mm:02d}-{dd:02d} ({gender})"
-    else:
-        birth_display = f"{birth_str} ({gender})"
+    #  프로필 사진 URL (프로필 레지스트리에 등록된 값)
+    profile_img_url = profile_runtime.source.image_url
     
     #  컬럼으로 안정적인 가로 배치
     left, right = st.columns([2, 1], gap="large")
     
     with left:
-        st.markdown(
-            f"""
-            <div class="info-card">
-                <div class="info-title">기본 정보</div>
-                <div class="info-row"> 이름: {profile_data.get('이름', '-')}</div>
-                <div class="info-row"> 생년월일: {birth_display}</div>
-                <div class="info-row"> 나이: {age}세</div>
-                <div class="info-row"> 직업: {profile_data.get('직업', '-')}</div>
-                <div class="info-row"> 한 줄 소개: {profile_data.get('한줄소개', '-')}</div>
-                <div class="info-row"> 사용 RPA툴: {profile_data.get('사용rpa툴', '-')}</div>
-                <div class="info-row"> 사는곳: {profile_data.get('사는곳', '-')}</div>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+        st.markdown(info_card_html(profile_data), unsafe_allow_html=True)
     
     with right:
-        # st.image로 단순표시 (가장 안정적)
-        try:
-            st.image(profile_img_url, width=220, caption="프로필 사진")
-        except Exception:
-            # HTML fallback (로드 실패 시 '준비중' 표시)
-            st.markdown(
-                """
-                <div style="text-align:center; margin-bottom:20px;">
-                    <img src="https://via.placeholder.com/200x250?text=준비중" alt="준비중"
-                         style="width:200px; height:250px; border-radius:12px;
-                                object-fit:cover; box-shadow:0 4px 10px rgba(0,0,0,0.2);">
-                    <div style="font-size:14px; color:gray; margin-top:8px;">
-                        (사진이 표시되지 않으면 준비중입니다)
-                    </div>
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
+        # 미리 줄여 둔 2x WebP (레티나에서도 선명, 원본 JPEG 대비 수십 분의 1)
+        image = get_image_pipeline().get(profile_img_url)
+        variant = image.variant("webp", scale=2)
+        caption = "프로필 사진 (준비중)" if image.placeholder else "프로필 사진"
+        st.image(variant.data, width=DISPLAY_WIDTH, caption=caption)
     
     st.divider()
     st.markdown("### 연락")
@@ -430,15 +532,26 @@ def view_career():
     back_to_home()
     st.markdown("## 경력 상세")
 
-    for _, row in career_data.iterrows():
-        detail = str(row["상세 내용"]).replace("\\n", "\n")
-        st.markdown(f"""
-        -  **{row['기간']}**  
-           {row['회사/기관']}  
-           {row['직무']}  
-           {detail}
-        """)
+    # 경력 시트가 바뀔 때만 다시 만든 마크다운을 한 번에 출력
+    career = profile_runtime.career_cache.get(profile_runtime.store)
+    pages = len(career.pages)
+    try:
+        page = int(st.query_params.get("page", 1))
+    except ValueError:
+        page = 1
+    page = min(max(page, 1), max(pages, 1))
+
+    st.markdown(career.page(page))
+
+    if pages > 1:
+        nav = []
+        if page > 1:
+            nav.append(f"[◀ 이전]({page_link('career', page=page - 1)})")
+        nav.append(f"{page} / {pages}")
+        if page < pages:
+            nav.append(f"[다음 ▶]({page_link('career', page=page + 1)})")
         st.divider()
+        st.markdown(" | ".join(nav))
 
 def view_contact():
     back_to_home()
@@ -455,20 +568,30 @@ def view_contact():
     # ✅ 여기 안내 문구 추가
     st.caption(" 구글 시트 데이터는 5분마다 자동 갱신됩니다.")
 
+    chat_panel()
+
+    st.divider()
+    st.markdown("### 연락")
+    contact_buttons()
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def set_contact_draft(question):
+    st.session_state.contact_draft = question
+
+def reset_contact_chat():
+    st.session_state.contact_chat_history = []
+    st.session_state.contact_question_count = 0
+    st.session_state.contact_draft = ""
+
+# 챗봇 패널 — FAQ 버튼/전송/초기화는 이 함수만 다시 실행한다 (CSS·라우팅·프로필 로드 생략)
+# 버튼 상태 변경은 콜백에서 처리해 st.rerun() 이 필요 없다
+@st.fragment
+def chat_panel():
     # FAQ 퀵버튼
-    faq = [
-        "간단히 자기소개 해주세요",
-        "경력/프로젝트를 알려주세요",
-        "MBTI가 어떻게 되나요?",
-        "취미는 뭐에요?",
-        "사는곳이 어디에요"
-    ]
     st.caption("빠른 질문:")
-    faq_cols = st.columns(len(faq))
-    for i, q in enumerate(faq):
-        if faq_cols[i].button(q, key=f"faq_btn_{i}"):
-            st.session_state["contact_draft"] = q
-            st.rerun()
+    faq_cols = st.columns(len(FAQ_QUESTIONS))
+    for i, q in enumerate(FAQ_QUESTIONS):
+        faq_cols[i].button(q, key=f"faq_btn_{i}", on_click=set_contact_draft, args=(q,))
 
     if "contact_chat_history" not in st.session_state:
         st.session_state.contact_chat_history = []
@@ -478,6 +601,7 @@ def view_contact():
         st.session_state.contact_draft = ""
 
     MAX_Q = 3
+    pending = None
 
     if st.session_state.contact_question_count >= MAX_Q:
         st.warning(f"질문은 최대 {MAX_Q}회까지 가능합니다.")
@@ -491,101 +615,122 @@ def view_contact():
             with col1:
                 submit_button = st.form_submit_button("전송")
             with col2:
-                reset_button = st.form_submit_button("초기화")
+                st.form_submit_button("초기화", on_click=reset_contact_chat)
 
         if submit_button and user_input.strip():
-            answer = get_openai_answer(user_input.strip(), profile_data, career_data)
-            st.session_state.contact_chat_history.append(
-                {"user": user_input.strip(), "bot": answer}
-            )
+            pending = user_input.strip()
             st.session_state.contact_question_count += 1
             st.session_state.contact_draft = ""
 
-        if reset_button:
-            st.session_state.contact_chat_history = []
-            st.session_state.contact_question_count = 0
-            st.session_state.contact_draft = ""
-            st.rerun()
-
-    if st.session_state.contact_chat_history:
+    history = list(st.session_state.contact_chat_history)
+    if history or pending:
         st.divider()
-        for chat in reversed(st.session_state.contact_chat_history):
+        if pending:
+            # 새 질문은 맨 위에 — 스트리밍이면 토큰이 오는 대로 표시
+            st.markdown(f"**나:** {pending}")
+            if STREAM_ANSWERS:
+                st.markdown("**챗봇:**")
+                answer = st.write_stream(stream_openai_answer(pending))
+            else:
+                answer = get_openai_answer(pending)
+                st.markdown(f"**챗봇:** {answer}")
+            st.markdown("---")
+            st.session_state.contact_chat_history.append({"user": pending, "bot": answer})
+        for chat in reversed(history):
             st.markdown(f"**나:** {chat['user']}")
             st.markdown(f"**챗봇:** {chat['bot']}")
             st.markdown("---")
 
-    st.divider()
-    st.markdown("### 연락")
-    contact_buttons()
-    st.markdown('</div>', unsafe_allow_html=True)
+# 단계별 선택 박스 (값 = 지역 트리 노드 번호 — 이름이 같은 "중구" 들도 서로 다름)
+REGION_KEYS = ("region_sido", "region_city", "region_dong")
+
+def pick_region_from_search():
+    # 검색 결과를 고르면 세 단계 선택 박스를 그 지역으로 맞춘다 (다음 실행에서 위젯보다 먼저 호출됨)
+    node = st.session_state.get("region_match")
+    if node is None:
+        return
+    path = load_gazetteer().path(node)
+    for key, n in zip(REGION_KEYS, path):
+        st.session_state[key] = n
+    for key in REGION_KEYS[len(path):]:
+        st.session_state.pop(key, None)
+
+def region_select(label, options, key):
+    # 상위 단계가 바뀌어 예전 값이 새 목록에 없으면 첫 항목부터
+    if st.session_state.get(key) not in options:
+        st.session_state.pop(key, None)
+    return st.selectbox(label, options, format_func=load_gazetteer().name, key=key)
 
 def view_etc():
     back_to_home()
     st.markdown("##  주요 도시 맛집 / 여행지 추천")
+    region_picker()
+    recommendation_result()
+
+# 지역 선택 — 검색/선택 박스/추천 종류를 바꾸면 이 함수만 다시 실행한다.
+# 고른 지역은 region_choice 에 남겨 추천 결과 fragment 가 읽는다
+@st.fragment
+def region_picker():
+    # 전국 시도/시군구/읍면동 트리 (프로세스당 한 번 로드 — regions 참고)
+    regions = load_gazetteer()
+
+    # ✅ 지역 검색: 이름 앞부분 또는 초성, 띄어 쓴 앞 단어는 상위 지역 ("부산 중구", "ㄱㄴ ㅇㅅ")
+    query = st.text_input("🔎 지역 검색 (예: 역삼, ㅇㅅ, 부산 중구)", key="region_query")
+    if query.strip():
+        matches = regions.search(query)
+        if matches:
+            st.selectbox("검색 결과", matches, index=None, format_func=regions.label,
+                         key="region_match", on_change=pick_region_from_search,
+                         placeholder="지역을 고르세요")
+        else:
+            st.caption("일치하는 지역이 없습니다.")
 
     # ✅ 1단계: 시/도 선택
-    sido_list = [
-        "서울특별시", "부산광역시", "대구광역시", "인천광역시", "광주광역시",
-        "대전광역시", "울산광역시", "세종특별자치시", "경기도", "강원특별자치도",
-        "충청북도", "충청남도", "전라북도", "전라남도", "경상북도", "경상남도", "제주특별자치도"
-    ]
-    sido = st.selectbox(" 1단계: 시/도 선택", sido_list)
-
-    # ✅ 2단계: 주요 도시 선택
-    city_options = {
-        "서울특별시": ["강남구", "송파구", "마포구", "종로구"],
-        "부산광역시": ["해운대구", "남구", "중구", "수영구"],
-        "대구광역시": ["중구", "수성구", "달서구"],
-        "인천광역시": ["남동구", "연수구", "중구"],
-        "광주광역시": ["동구", "서구", "북구"],
-        "대전광역시": ["유성구", "서구", "중구"],
-        "울산광역시": ["남구", "동구", "중구"],
-        "세종특별자치시": ["세종시"],
-        "경기도": ["수원시", "성남시", "용인시", "고양시", "부천시"],
-        "강원특별자치도": ["춘천시", "강릉시", "원주시"],
-        "충청북도": ["청주시", "충주시"],
-        "충청남도": ["천안시", "아산시", "공주시"],
-        "전라북도": ["전주시", "익산시"],
-        "전라남도": ["목포시", "여수시", "순천시"],
-        "경상북도": ["포항시", "경주시", "구미시"],
-        "경상남도": ["창원시", "김해시", "진주시"],
-        "제주특별자치도": ["제주시", "서귀포시"]
-    }
-    city_list = city_options.get(sido, [])
-    city = st.selectbox(" 2단계: 주요 도시 선택", city_list)
-
-    # ✅ 3단계: 동 선택 (5개만 예시)
-    dong_options = {
-        "강남구": ["역삼동", "논현동", "신사동", "대치동", "청담동"],
-        "송파구": ["잠실동", "문정동", "방이동", "가락동", "석촌동"],
-        "마포구": ["홍대입구동", "상수동", "망원동", "연남동", "공덕동"],
-        "종로구": ["삼청동", "인사동", "익선동", "부암동", "평창동"],
-        "해운대구": ["중동", "좌동", "우동", "송정동", "재송동"],
-        "남구": ["대연동", "문현동", "용호동", "용당동", "우암동"],
-        "중구": ["남포동", "광복동", "보수동", "동광동", "대청동"],
-        "수영구": ["광안동", "남천동", "수영동", "망미동", "민락동"],
-        "수원시": ["영통동", "매탄동", "인계동", "팔달동", "권선동"],
-        "성남시": ["분당동", "야탑동", "정자동", "수내동", "이매동"],
-        "전주시": ["효자동", "중화산동", "금암동", "서신동", "인후동"],
-        "포항시": ["장성동", "죽도동", "두호동", "양덕동", "상도동"],
-        "창원시": ["상남동", "용호동", "성산동", "반송동", "중앙동"],
-        "제주시": ["연동", "이도동", "노형동", "화북동", "삼양동"],
-    }
-    dong_list = dong_options.get(city, [])
-    dong = st.selectbox("📍 3단계: 동 선택 (대표 5곳)", dong_list)
+    sido = region_select(" 1단계: 시/도 선택", list(regions.roots()), REGION_KEYS[0])
+
+    # ✅ 2단계: 시/군/구 선택
+    city = region_select(" 2단계: 시/군/구 선택", list(regions.children(sido)), REGION_KEYS[1])
+
+    # ✅ 3단계: 읍/면/동 선택 (없는 시군구는 건너뜀)
+    dong_list = list(regions.children(city)) if city is not None else []
+    dong = region_select("📍 3단계: 읍/면/동 선택", dong_list, REGION_KEYS[2]) if dong_list else None
+    if regions.is_partial():
+        st.caption(f"ℹ️ 일부 지역만 제공됩니다 (시/도 {regions.level_size(1)}곳 · 시/군/구 {regions.level_size(2)}곳"
+                   f" · 읍/면/동 {regions.level_size(3)}곳)")
+    # 추천 저장소 키는 가장 아래 단계의 행정구역 코드 (이름이 바뀌어도 유지)
+    code = regions.codes[next(n for n in (dong, city, sido) if n is not None)]
+    sido, city, dong = (regions.name(n) if n is not None else None for n in (sido, city, dong))
 
     # ✅ 추천 종류 선택
-    category = st.radio("🍽️ 추천 종류를 선택하세요", ["맛집 추천 ", "여행지 추천 "])
+    category = st.radio("🍽️ 추천 종류를 선택하세요", CATEGORIES, key="region_category")
+    st.session_state.region_choice = (code, sido, city, dong, category)
+
+# 추천 결과 — 버튼을 누르면 이 함수만 다시 실행한다 (지역을 바꿔도 이전 결과는 그대로 남음)
+@st.fragment
+def recommendation_result():
+    code, sido, city, dong, category = st.session_state.region_choice
 
     # ✅ 추천 버튼
     if st.button("🔍 추천 보기"):
-        full_location = f"{sido} {city} {dong}"
-        with st.spinner("AI가 추천 중입니다..."):
-            result = get_place_recommendation(full_location, category)
-            st.markdown(result)
+        full_location = format_location(sido, city, dong)
+        # 지역을 바꿔도 결과는 남으므로 어느 지역 결과인지 표시
+        st.caption(f"📍 {full_location} · {category_keyword(category)}")
+        key = region_key(code, category)
+        cached = get_recommendation_store().get(key)
+        tracer.incr("recommend.store_hit" if cached is not None else "recommend.store_miss")
+        if cached is not None:
+            # 배치로 미리 계산됐거나 이전에 누군가 조회한 지역 → GPT 호출 없음
+            st.markdown(render_places(cached, category))
+        elif STREAM_ANSWERS:
+            # 장소 한 줄이 완성될 때마다 카드 표시
+            st.write_stream(stream_place_recommendation(key, full_location, category))
+        else:
+            with st.spinner("AI가 추천 중입니다..."):
+                result = get_place_recommendation(key, full_location, category)
+                st.markdown(result)
 
         # ✅ 관련 링크 자동 생성
-        keyword = "맛집" if "맛집" in category else "여행지"
+        keyword = category_keyword(category)
         naver_map_url = f"https://map.naver.com/p/search/{full_location}%20{keyword}"
         kakao_map_url = f"https://map.kakao.com/?q={full_location}%20{keyword}"
         google_map_url = f"https://www.google.com/maps/search/{full_location}+{keyword}"
@@ -593,95 +738,206 @@ def view_etc():
 
 
 
-def get_place_recommendation(location, category):
+RECOMMEND_TTL = 7 * 24 * 3600   # 추천 결과 유효기간
+RECOMMEND_LEASE = 60            # 같은 지역 추천을 한 곳(워커/세션)만 만드는 잠금 기한 (초)
+
+@st.cache_resource
+def get_recommendation_store():
+    return RecommendationStore(RECOMMEND_STORE_PATH, ttl=RECOMMEND_TTL)
+
+@contextmanager
+def recommendation_flight(key):
+    """같은 지역 추천을 동시에 두 번 만들지 않는다 — 다른 쪽이 만드는 중이면 저장소에 들어올 때까지 기다린다
+    with recommendation_flight(key) as ready: ready 가 있으면 그 결과, None 이면 직접 만든다"""
+    cache = get_shared_cache()
+    lease_key = "recommend:{}|{}".format(*key)
+    with cache.lease(lease_key, RECOMMEND_LEASE) as owned:
+        if owned:
+            yield None
+            return
+        tracer.incr("recommend.shared_wait")
+        # 상대가 실패해서(제한·오류·빈 결과) 잠금을 놓으면 기한까지 기다리지 않고 바로 직접 만든다
+        yield cache.wait_while_held(lease_key, lambda: get_recommendation_store().get(key), RECOMMEND_LEASE)
+
+def limited_recommendation(key, category, decision):
+    # 한도 초과 — 유효기간이 지난 추천이라도 있으면 보여준다
+    stale = get_recommendation_store().get(key, allow_stale=True)
+    if stale is not None:
+        return render_places(stale, category) + "\n\n(요청이 많아 이전에 저장된 추천을 보여드립니다)"
+    return rate_limited_message(decision)
+
+def recommendation_error(key, category, e):
+    if is_llm_outage(e):
+        # OpenAI 장애 — 유효기간이 지난 추천이라도 있으면 보여준다
+        stale = get_recommendation_store().get(key, allow_stale=True)
+        if stale is not None:
+            return render_places(stale, category) + "\n\n(AI 응답이 원활하지 않아 이전에 저장된 추천을 보여드립니다)"
+    return f"⚠️ 추천을 불러오는 중 오류 발생: {e}"
+
+def get_place_recommendation(key, location, category):
     """GPT가 맛집/여행지를 추천하고, 종류·소개·메인음식(또는 대표볼거리)·주소·관련링크를 함께 출력"""
+    with recommendation_flight(key) as ready:
+        if ready is not None:
+            return render_places(ready, category)
+        return create_place_recommendation(key, location, category)
+
+def create_place_recommendation(key, location, category):
+    decision = check_rate_limit("recommend")
+    if not decision.allowed:
+        return limited_recommendation(key, category, decision)
     try:
-        # ✅ GPT에게 명확한 출력 형식 요청
-        if "맛집" in category:
-            prompt = f"""
-            {location} 지역의 현지인 추천 맛집 3곳을 아래 형식으로 소개해줘.
-            반드시 아래 형식 그대로 출력해:
-            1. 식당이름 | 음식 종류 | 한 줄 소개 | 대표 메뉴 | 주소
-            (예: 백민식당 | 한식 | 김치찌개가 맛있는 현지식당 | 김치찌개 | 서울 송파구 문정동 123-4)
-            """
-        else:
-            prompt = f"""
-            {location} 지역에서 하루 여행 코스로 좋은 여행지 3곳을 아래 형식으로 소개해줘.
-            반드시 아래 형식 그대로 출력해:
-            1. 장소이름 | 특징 | 한 줄 설명 | 대표 볼거리 | 주소
-            (예: 오죽헌 | 역사유적지 | 퇴계 이황의 생가로 유명한 유적지 | 유물전시관 | 강원 강릉시 율곡로 3139)
-            """
-
-        # ✅ GPT 호출
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "너는 한국 맛집 및 여행지 추천 전문가야. 반드시 지정된 형식을 지켜."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=800
+        # 형식이 깨져 장소를 하나도 못 읽으면 한 번 더 요청 (사용자가 다시 누르지 않도록)
+        places, raw_text, attempts = request_places(
+            lambda request: "".join(llm_chunks(request, stream=False)), location, category,
         )
+    except Exception as e:
+        return recommendation_error(key, category, e)
+    if attempts > 1:
+        tracer.incr("recommend.retry", attempts - 1)
+    if places:
+        get_recommendation_store().put(key, places, raw_text)
+    return render_places(places, category)
+
+def stream_place_recommendation(key, location, category):
+    """get_place_recommendation 의 스트리밍 버전 — 장소가 완성될 때마다 카드 yield, 끝나면 저장소에 기록"""
+    with recommendation_flight(key) as ready:
+        if ready is not None:
+            yield render_places(ready, category)
+            return
+        yield from create_place_stream(key, location, category)
+
+def create_place_stream(key, location, category):
+    decision = check_rate_limit("recommend")
+    if not decision.allowed:
+        yield limited_recommendation(key, category, decision)
+        return
+    request = build_place_request(location, category)
+    places, raw = [], []
+
+    def tee(chunks):
+        for chunk in chunks:
+            raw.append(chunk)
+            yield chunk
 
-        raw_text = response.choices[0].message.content.strip()
-        lines = [l.strip() for l in raw_text.split("\n") if l.strip()]
-
-        # ✅ 추천 결과 제목
-        result_md = "### 🍽️ 추천 결과\n\n"
-
-        for line in lines:
-            # 1️⃣ 숫자 및 기호 제거
-            clean_line = re.sub(r"^\d+\.\s*", "", line)
-            # 2️⃣ 구분자 보정 (– 또는 - → |)
-            clean_line = clean_line.replace("–", "|").replace("-", "|")
-            # 3️⃣ 파이프 기준 분리
-            parts = [p.strip() for p in clean_line.split("|") if p.strip()]
-
-            # 4️⃣ 필드 보완 (5개 미만일 경우 '정보 없음' 채움)
-            while len(parts) < 5:
-                parts.append("정보 없음")
-
-            name, kind, desc, main, addr = parts[:5]
-
-            # 5️⃣ 지도 링크 자동 생성
-            from urllib.parse import quote_plus
-            qname = quote_plus(name)
-            naver_url  = f"https://map.naver.com/p/search/{qname}"
-            kakao_url  = f"https://map.kakao.com/?q={qname}"
-            google_url = f"https://www.google.com/maps/search/{qname}"
-
-            # 6️⃣ 출력 구성
-            result_md += f"🍴 **{name}**  \n"
-            result_md += f"📍 종류: {kind}  \n"
-            result_md += f"💬 소개: {desc}  \n"
-            result_md += f"🍛 메인 음식: {main}  \n" if "맛집" in category else f"🎯 대표 볼거리: {main}  \n"
-            result_md += f"🏠 주소: {addr}  \n"
-            result_md += f"🔗 [네이버 지도]({naver_url}) | 🗺️ [카카오맵]({kakao_url}) | 🌍 [Google Maps]({google_url})\n\n"
+    try:
+        for attempt in range(PLACE_ATTEMPTS):
+            if attempt:
+                # 장소를 하나도 못 읽었다 — 같은 요청을 한 번 더 (이미 보여준 카드는 없음)
+                tracer.incr("recommend.retry")
+                raw.clear()
+            for place in iter_places(tee(llm_chunks(request, stream=True))):
+                if not places:
+                    yield RESULT_TITLE
+                places.append(place)
+                yield render_place_card(place, category)
+            if places:
+                break
+    except Exception as e:
+        # 이미 보여준 카드가 있으면 그 뒤에 오류만, 없으면 저장된 추천으로 대체
+        yield f"\n\n⚠️ 추천을 불러오는 중 오류 발생: {e}" if places else recommendation_error(key, category, e)
+        return
 
-        # 7️⃣ 결과 반환
-        return result_md if lines else "⚠️ 추천 정보를 불러오지 못했습니다. 다시 시도해주세요."
+    if not places:
+        yield EMPTY_RESULT
+        return
+    get_recommendation_store().put(key, places, "".join(raw).strip())
 
-    except Exception as e:
-        return f"⚠️ 추천을 불러오는 중 오류 발생: {e}"
+# -----------------------------
+# 운영용 화면 / 지표
+# -----------------------------
+# _health / _metrics 는 토큰을 아는 사람만 (?route=_health&token=...) — 토큰이 없으면 두 화면 모두 닫힘
+ADMIN_TOKEN = os.environ.get("QR_LANDING_ADMIN_TOKEN", "")
+# Prometheus 수집용 /metrics HTTP 포트 (0 이면 끔) — 워커마다 다른 포트, ADMIN_TOKEN 이 있으면 Bearer 토큰 필요
+METRICS_PORT = int(os.environ.get("QR_LANDING_METRICS_PORT", "0") or 0)
+METRICS_HOST = os.environ.get("QR_LANDING_METRICS_HOST", "127.0.0.1")
+
+def is_admin():
+    token = st.query_params.get("token") or ""
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(token, ADMIN_TOKEN)
+
+@st.cache_resource
+def start_metrics_server():
+    # 프로세스당 1번 — 포트를 이미 다른 워커가 쓰고 있으면 이 워커는 내보내지 않는다
+    try:
+        return serve_metrics(tracer, METRICS_PORT, host=METRICS_HOST, token=ADMIN_TOKEN or None)
+    except OSError as e:
+        tracer.incr("metrics.serve_failed")
+        return str(e)
 
 # -----------------------------
 # App Router
 # -----------------------------
-route = get_route()
+def view_health():
+    st.json(get_profile_pool().health())
+    st.json({
+        "answer_cache": get_answer_cache().stats(),
+        "llm_gateway": get_llm_gateway().stats(),
+        "rate_limit": get_rate_limiter().stats(),
+        "intent": get_intent_stats().stats(),
+        "shared_cache": get_shared_cache().stats(),
+    })
+
+def view_metrics():
+    st.markdown("## 계측 (Metrics)")
+    if not tracer.enabled:
+        st.info("계측이 꺼져 있습니다. QR_LANDING_TRACING=1 로 실행하면 구간별 시간이 수집됩니다.")
+    summary = tracer.summary()
+    st.markdown("### 구간별 소요 시간")
+    st.dataframe([{"span": name, **values} for name, values in summary["spans"].items()])
+    st.markdown("### 히스토그램")
+    st.dataframe(tracer.histogram_rows())
+    st.markdown("### 캐시 적중률 / 카운터")
+    st.json({"gauges": summary["gauges"], "counters": summary["counters"]})
+    st.markdown("### Prometheus")
+    if METRICS_PORT:
+        st.caption(f"수집 주소: http://{METRICS_HOST}:{METRICS_PORT}/metrics (워커마다 따로)")
+    else:
+        st.caption("QR_LANDING_METRICS_PORT 를 지정하면 /metrics 로 수집할 수 있습니다.")
+    st.code(tracer.render_prometheus(), language="text")
+
+class View(NamedTuple):
+    render: Callable[[], None]
+    needs_profile: bool = False   # 렌더 전에 프로필 시트(profile_runtime / profile_data)가 있어야 하는지
+    admin: bool = False           # 운영용 — 토큰이 맞을 때만 (아니면 없는 화면처럼 홈으로)
+
+# 프로필이 필요 없는 화면(홈, 기타, 지표)은 프로필 풀을 만들지 않으므로 pandas/시트 스냅샷을 건드리지 않는다.
+# LLM 게이트웨이·사진·추천 저장소·MBTI 시트는 get_* 가 처음 불릴 때 만들어진다.
+VIEWS = {
+    "home": View(view_home),
+    "about": View(view_about, needs_profile=True),
+    "career": View(view_career, needs_profile=True),
+    "contact": View(view_contact, needs_profile=True),
+    "etc": View(view_etc),
+    "_health": View(view_health, admin=True),
+    "_metrics": View(view_metrics, admin=True),
+}
+
+if METRICS_PORT:
+    start_metrics_server()
 
-if route == "home":
-    view_home()
-elif route == "about":
-    view_about()
-elif route == "career":
-    view_career()
-elif route == "contact":
-    view_contact()
-elif route == "etc":
-    view_etc()
-else:
+route = get_route()
+if route not in VIEWS or (VIEWS[route].admin and not is_admin()):
+    st.query_params.pop("token", None)
     set_route("home")
-    view_home()
-
-# Footer
-st.caption(f"© {profile_data.get('이름','')} — 자기소개")
+    route = "home"
+view = VIEWS[route]
+
+# ?profile=<id> — 등록된 프로필만, 처음 열리는 프로필은 프로필이 필요한 화면에서 로드
+profile_id = get_profile_id()
+if profile_id not in get_profile_sources():
+    st.error("등록되지 않은 프로필입니다. QR 코드를 다시 확인해주세요.")
+    st.stop()
+profile_runtime = None
+profile_data = None
+if view.needs_profile:
+    profile_runtime = get_profile_pool().get(profile_id)
+    profile_data = profile_runtime.store.get("profile")
+    # 프로필을 안 읽는 화면의 footer 용 — 이 세션에서 본 이름을 기억
+    st.session_state.setdefault("footer_names", {})[profile_id] = profile_data.get("이름", "")
+
+with span(f"view.{route}"):
+    view.render()
+
+# Footer (모든 화면 — 이 세션에서 아직 프로필을 안 읽었으면 이름 없이)
+footer_name = st.session_state.get("footer_names", {}).get(profile_id)
+st.caption(f"© {footer_name} — 자기소개" if footer_name else "© 자기소개")
@@ -0,0 +1,175 @@
+"""요청 제한 (토큰 버킷) — 세션/탭을 새로 열어도 초기화되지 않는 서버 쪽 한도
+
+    limiter = RateLimiter(MemoryBackend(), {"answer": RateRule(10, 3600)}, global_rule=RateRule(600, 3600))
+    decision = limiter.check("answer", "ip:1.2.3.4")
+    if not decision.allowed: ...  # 캐시된 답변으로 대체
+
+- 클라이언트(IP, 없으면 세션) 별 버킷 + 프로세스 전체(모든 종류 합산) 버킷
+- 저장소는 교체 가능: MemoryBackend (기본, 프로세스 1개) / SQLiteBackend (워커 여러 개가 공유)
+- LLM 을 실제로 부를 때만 검사한다 (캐시 적중은 무료)
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateRule:
+    capacity: int    # 버킷 크기 (연속으로 쓸 수 있는 최대 횟수)
+    per: float       # capacity 만큼 다시 차는 데 걸리는 시간 (초)
+
+    @property
+    def rate(self):
+        return self.capacity / self.per
+
+
+@dataclass(frozen=True)
+class Decision:
+    allowed: bool
+    scope: str = ""          # 막힌 버킷 ("client" / "global")
+    retry_after: float = 0.0 # 토큰 1개가 다시 찰 때까지 (초)
+
+
+def _refill(tokens, updated, rule, now):
+    return min(rule.capacity, tokens + (now - updated) * rule.rate)
+
+
+# -----------------------------
+# 저장소
+# -----------------------------
+class MemoryBackend:
+    """프로세스 메모리 버킷 (키가 많아지면 오래 안 쓴 것부터 버림 — 버린 키는 가득 찬 상태로 다시 시작)"""
+
+    def __init__(self, max_keys=100_000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()   # key → (tokens, updated)
+        self._lock = threading.Lock()
+
+    def take(self, key, rule, cost=1, now=None):
+        """토큰 cost 개를 쓸 수 있으면 쓰고 (True, 0), 아니면 (False, 다시 찰 때까지 초)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (rule.capacity, now))
+            tokens = _refill(tokens, updated, rule, now)
+            allowed = tokens >= cost
+            if allowed:
+                tokens -= cost
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, 0.0 if allowed else (cost - tokens) / rule.rate
+
+    def give(self, key, rule, cost=1, now=None):
+        # take 를 취소 (다른 버킷에서 막혔을 때 되돌림)
+        now = time.time() if now is None else now
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (rule.capacity, now))
+            self._buckets[key] = (min(rule.capacity, _refill(tokens, updated, rule, now) + cost), now)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_buckets (
+    key     TEXT PRIMARY KEY,
+    tokens  REAL NOT NULL,
+    updated REAL NOT NULL
+)
+"""
+
+
+class SQLiteBackend:
+    """여러 워커 프로세스가 같은 파일을 쓰는 버킷 (BEGIN IMMEDIATE 로 읽기-수정-쓰기를 원자적으로)"""
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+
+    def _connect(self):
+        # 호출마다 새 연결 — 세션 스레드 어디서든 안전 (recommend_store 와 같은 방식)
+        return sqlite3.connect(self.path, timeout=30, isolation_level=None)
+
+    def _update(self, key, rule, fn, now):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT tokens, updated FROM rate_buckets WHERE key=?", (key,)).fetchone()
+            tokens = _refill(*row, rule, now) if row else float(rule.capacity)
+            tokens, result = fn(tokens)
+            conn.execute("INSERT OR REPLACE INTO rate_buckets VALUES (?, ?, ?)", (key, tokens, now))
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def take(self, key, rule, cost=1, now=None):
+        now = time.time() if now is None else now
+
+        def fn(tokens):
+            if tokens >= cost:
+                return tokens - cost, (True, 0.0)
+            return tokens, (False, (cost - tokens) / rule.rate)
+
+        return self._update(key, rule, fn, now)
+
+    def give(self, key, rule, cost=1, now=None):
+        now = time.time() if now is None else now
+        self._update(key, rule, lambda tokens: (min(rule.capacity, tokens + cost), None), now)
+
+    def prune(self, older_than=86400):
+        # 하루 넘게 안 쓴 버킷은 어차피 가득 찬 상태 — 지워도 결과가 같다
+        with closing(self._connect()) as conn:
+            conn.execute("DELETE FROM rate_buckets WHERE updated < ?", (time.time() - older_than,))
+
+
+# -----------------------------
+# 제한기
+# -----------------------------
+class RateLimiter:
+    def __init__(self, backend, rules, global_rule=None):
+        # rules: {종류: RateRule} — 클라이언트별 한도. global_rule: 모든 종류·클라이언트 합산 한도
+        self.backend = backend
+        self.rules = rules
+        self.global_rule = global_rule
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.denied = {}
+
+    def check(self, kind, client):
+        rule = self.rules.get(kind)
+        if rule is not None:
+            ok, retry = self.backend.take(f"{kind}:{client}", rule)
+            if not ok:
+                return self._deny("client", retry)
+        if self.global_rule is not None:
+            ok, retry = self.backend.take("global", self.global_rule)
+            if not ok:
+                if rule is not None:
+                    self.backend.give(f"{kind}:{client}", rule)
+                return self._deny("global", retry)
+        with self._lock:
+            self.allowed += 1
+        return Decision(True)
+
+    def _deny(self, scope, retry_after):
+        with self._lock:
+            self.denied[scope] = self.denied.get(scope, 0) + 1
+        return Decision(False, scope, retry_after)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "allowed": self.allowed,
+                "denied_client": self.denied.get("client", 0),
+                "denied_global": self.denied.get("global", 0),
+            }
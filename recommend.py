@@ -0,0 +1,288 @@
+"""맛집 / 여행지 추천 — 프롬프트, 결과 파싱, 카드 렌더링
+
+GPT 에는 JSON 스키마(구조화 출력)로 {"places": [{name, kind, description, highlight, address}, ...]}
+를 요청하고, 결과는 검증된 Place 목록으로 다룬다 (저장소에도 Place 목록을 저장 → 렌더링할 때 재파싱 없음).
+파서는 응답을 한 번만 훑으면서 JSON 객체가 닫히는 즉시 Place 를 내보낸다 (스트리밍 카드).
+스키마를 안 지킨 응답(예전 "이름 | 종류 | 소개 | 대표 | 주소" 줄 형식, 머리말 섞인 응답)도 받아들이고,
+그래도 장소가 하나도 안 나오면 호출하는 쪽에서 한 번 더 요청한다 (request_places).
+"""
+import json
+import re
+from dataclasses import asdict, dataclass
+from urllib.parse import quote_plus
+
+CATEGORIES = ["맛집 추천 ", "여행지 추천 "]
+
+RESULT_TITLE = "### 🍽️ 추천 결과\n\n"
+EMPTY_RESULT = "⚠️ 추천 정보를 불러오지 못했습니다. 다시 시도해주세요."
+MISSING = "정보 없음"
+
+SYSTEM_PROMPT = "너는 한국 맛집 및 여행지 추천 전문가야. 반드시 지정된 JSON 형식을 지켜."
+
+PLACE_COUNT = 3
+PLACE_ATTEMPTS = 2   # 장소를 하나도 못 읽으면 한 번 더 요청
+
+
+def is_food(category):
+    return "맛집" in category
+
+
+def category_keyword(category):
+    return "맛집" if is_food(category) else "여행지"
+
+
+def format_location(sido, city, dong):
+    # 동 목록이 없는 도시는 동이 None
+    return " ".join(p for p in (sido, city, dong) if p)
+
+
+# -----------------------------
+# 결과 레코드
+# -----------------------------
+PLACE_FIELDS = ("name", "kind", "description", "highlight", "address")
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    kind: str = ""
+    description: str = ""
+    highlight: str = ""    # 맛집: 대표 메뉴 / 여행지: 대표 볼거리
+    address: str = ""
+
+    @classmethod
+    def from_dict(cls, data):
+        """dict → Place (이름이 없으면 None). 모르는 키는 무시, 값은 문자열로"""
+        if not isinstance(data, dict):
+            return None
+        values = {f: str(data.get(f) or "").strip() for f in PLACE_FIELDS}
+        if not values["name"]:
+            return None
+        return cls(**values)
+
+    def to_dict(self):
+        return asdict(self)
+
+
+PLACES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "places": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {f: {"type": "string"} for f in PLACE_FIELDS},
+                "required": list(PLACE_FIELDS),
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["places"],
+    "additionalProperties": False,
+}
+
+
+def dump_places(places):
+    return json.dumps([p.to_dict() for p in places], ensure_ascii=False)
+
+
+def load_places(text):
+    return tuple(p for p in map(Place.from_dict, json.loads(text)) if p is not None)
+
+
+# -----------------------------
+# 요청
+# -----------------------------
+def build_place_prompt(location, category):
+    # ✅ GPT에게 명확한 출력 형식 요청 (필드 의미는 종류별로 다름)
+    if is_food(category):
+        return f"""
+            {location} 지역의 현지인 추천 맛집 {PLACE_COUNT}곳을 places 배열로 소개해줘.
+            name=식당이름, kind=음식 종류, description=한 줄 소개, highlight=대표 메뉴, address=주소
+            (예: {{"name": "백민식당", "kind": "한식", "description": "김치찌개가 맛있는 현지식당", "highlight": "김치찌개", "address": "서울 송파구 문정동 123-4"}})
+            """
+    return f"""
+            {location} 지역에서 하루 여행 코스로 좋은 여행지 {PLACE_COUNT}곳을 places 배열로 소개해줘.
+            name=장소이름, kind=특징, description=한 줄 설명, highlight=대표 볼거리, address=주소
+            (예: {{"name": "오죽헌", "kind": "역사유적지", "description": "율곡 이이가 태어난 유적지", "highlight": "유물전시관", "address": "강원 강릉시 율곡로 3139"}})
+            """
+
+
+def build_place_request(location, category):
+    return {
+        "model": "gpt-4o-mini",
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": build_place_prompt(location, category)},
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "places", "strict": True, "schema": PLACES_SCHEMA},
+        },
+        "temperature": 0.7,
+        "max_tokens": 800,
+    }
+
+
+def request_places(complete, location, category, attempts=PLACE_ATTEMPTS):
+    """complete(request) → 응답 텍스트. 장소를 하나도 못 읽으면 다시 요청 → (places, 원문, 시도 횟수)"""
+    request = build_place_request(location, category)
+    text = ""
+    for attempt in range(1, attempts + 1):
+        text = complete(request)
+        places = parse_places(text)
+        if places:
+            return places, text, attempt
+    return (), text, attempts
+
+
+def fetch_places(client, location, category):
+    """추천 전체를 한 번에 받아온다 — 배치 사전 계산용 → (places, 원문, 시도 횟수)"""
+    def complete(request):
+        response = client.chat.completions.create(**request)
+        return response.choices[0].message.content or ""
+    return request_places(complete, location, category)
+
+
+# -----------------------------
+# 파싱 (스트리밍/전체 공용, 응답을 한 번만 훑는다)
+# -----------------------------
+class _LeafObjects:
+    """JSON 텍스트 조각을 받아, 안에 다른 객체가 없는 {...} 가 닫힐 때마다 그 텍스트를 돌려준다
+    (문자열 안의 괄호/이스케이프는 건너뜀). {"places": [...]} 바깥 객체는 leaf 가 아니라서 제외."""
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.in_string = False
+        self.escape = False
+        self.opened = []   # [시작 위치, 중첩 객체 포함 여부]
+
+    def feed(self, chunk):
+        self.text += chunk
+        found = []
+        for i in range(self.pos, len(self.text)):
+            ch = self.text[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == "{":
+                if self.opened:
+                    self.opened[-1][1] = True
+                self.opened.append([i, False])
+            elif ch == "}" and self.opened:
+                start, nested = self.opened.pop()
+                if not nested:
+                    found.append(self.text[start:i + 1])
+        self.pos = len(self.text)
+        return found
+
+
+def _json_places(objects):
+    for text in objects:
+        try:
+            place = Place.from_dict(json.loads(text))
+        except ValueError:
+            continue
+        if place is not None:
+            yield place
+
+
+_LIST_MARK_RE = re.compile(r"^\s*(?:\d+\s*[.)]|[-*•])\s*")
+_DASH_SEP_RE = re.compile(r"\s[-–—]\s")   # 공백으로 둘러싸인 대시만 구분자 ("123-4" 는 그대로)
+_WORD_RE = re.compile(r"[0-9A-Za-z가-힣]")
+
+
+def parse_place_line(line):
+    """'1. 이름 | 종류 | 소개 | 대표 | 주소' → Place (머리말/맺음말 등 장소 줄이 아니면 None)"""
+    text = _LIST_MARK_RE.sub("", line.strip()).replace("**", "").strip().strip("|")
+    parts = text.split("|") if "|" in text else _DASH_SEP_RE.split(text)
+    parts = [p.strip() for p in parts]
+    if len(parts) < 3 or not _WORD_RE.search(parts[0]):
+        return None
+    # 필드가 5개보다 많으면 나머지는 주소로 (주소 안의 구분자)
+    fields = parts[:4] + [" ".join(p for p in parts[4:] if p)]
+    fields += [""] * (5 - len(fields))
+    return Place(*fields)
+
+
+def iter_places(chunks):
+    """LLM 응답 텍스트 조각 → 완성되는 대로 Place (JSON 또는 줄 형식)
+
+    첫 글자로 형식을 정하고 해당 방식으로 한 번 훑는다. 끝까지 하나도 못 읽으면
+    (예: 머리말 뒤에 JSON, 코드 블록 안의 줄 형식) 다른 방식으로 전체를 한 번 더 본다.
+    """
+    mode = None
+    text = ""
+    line_buffer = ""
+    objects = _LeafObjects()
+    found = 0
+    for chunk in chunks:
+        text += chunk
+        if mode is None:
+            head = text.lstrip()
+            if not head:
+                continue
+            mode = "json" if head[0] in "{[`" else "lines"
+            chunk = text
+        if mode == "json":
+            for place in _json_places(objects.feed(chunk)):
+                found += 1
+                yield place
+        else:
+            line_buffer += chunk
+            *lines, line_buffer = line_buffer.split("\n")
+            for line in lines:
+                place = parse_place_line(line)
+                if place is not None:
+                    found += 1
+                    yield place
+    if mode == "lines" and line_buffer:
+        place = parse_place_line(line_buffer)
+        if place is not None:
+            found += 1
+            yield place
+    if found or mode is None:
+        return
+    if mode == "json":
+        yield from filter(None, map(parse_place_line, text.split("\n")))
+    else:
+        yield from _json_places(_LeafObjects().feed(text))
+
+
+def parse_places(text):
+    return tuple(iter_places([text]))
+
+
+# -----------------------------
+# 렌더링
+# -----------------------------
+def render_place_card(place, category):
+    # 지도 링크 자동 생성
+    qname = quote_plus(place.name)
+    naver_url = f"https://map.naver.com/p/search/{qname}"
+    kakao_url = f"https://map.kakao.com/?q={qname}"
+    google_url = f"https://www.google.com/maps/search/{qname}"
+
+    card = f"🍴 **{place.name}**  \n"
+    card += f"📍 종류: {place.kind or MISSING}  \n"
+    card += f"💬 소개: {place.description or MISSING}  \n"
+    if is_food(category):
+        card += f"🍛 메인 음식: {place.highlight or MISSING}  \n"
+    else:
+        card += f"🎯 대표 볼거리: {place.highlight or MISSING}  \n"
+    card += f"🏠 주소: {place.address or MISSING}  \n"
+    card += f"🔗 [네이버 지도]({naver_url}) | 🗺️ [카카오맵]({kakao_url}) | 🌍 [Google Maps]({google_url})\n\n"
+    return card
+
+
+def render_places(places, category):
+    if not places:
+        return EMPTY_RESULT
+    return RESULT_TITLE + "".join(render_place_card(p, category) for p in places)
@@ -0,0 +1,84 @@
+"""지역별 추천 결과 저장소 (SQLite)
+
+키 = (행정구역 코드, 추천 종류) — 지역 이름이 바뀌어도 저장된 추천이 그대로 맞는다.
+선택지가 닫힌 집합이라 배치로 미리 채워 두면 "추천 보기" 클릭은 GPT 호출 없이 밀리초 단위로 응답한다.
+저장 값은 검증된 Place 목록(JSON)이라 꺼낼 때 재파싱 없이 바로 recommend.render_places 로 그린다.
+GPT 원문은 raw_text 에 참고용으로 같이 둔다 (places 가 비어 있는 행은 원문을 한 번 파싱).
+워커 여러 개 + 배치가 같은 파일을 쓰므로 WAL 모드 (읽기는 쓰기를 기다리지 않음).
+"""
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+from recommend import category_keyword, dump_places, load_places, parse_places
+
+# 앱(qr_landing_app)과 사전 계산 배치가 같은 파일을 쓰도록 — 디스크 캐시 위치는 QR_LANDING_CACHE_DIR
+RECOMMEND_STORE_PATH = os.path.join(
+    os.environ.get("QR_LANDING_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")),
+    "recommendations.sqlite",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS region_recommendations (
+    code       INTEGER NOT NULL,
+    category   TEXT NOT NULL,
+    raw_text   TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    places     TEXT,
+    PRIMARY KEY (code, category)
+)
+"""
+
+
+def region_key(code, category):
+    # code: 고른 지역 중 가장 아래 단계의 행정구역 코드 (regions.Gazetteer.codes)
+    # 라디오 라벨 공백 차이 등은 "맛집"/"여행지" 로 통일
+    return (int(code), category_keyword(category))
+
+
+class RecommendationStore:
+    def __init__(self, path, ttl=7 * 24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # sqlite3 연결의 with 는 커밋/롤백만 한다 — closing 으로 닫기까지
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            # 이름(시도, 도시, 동)을 키로 쓰던 예전 표 — 유효기간이 있는 캐시라 옮기지 않고 버린다 (배치가 다시 채움)
+            conn.execute("DROP TABLE IF EXISTS recommendations")
+
+    def _connect(self):
+        # 스레드마다 새 연결 — Streamlit 세션 스레드와 배치 워커 어디서든 안전
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key, allow_stale=False):
+        """저장된 Place 목록 (없거나 유효기간이 지났으면 None)
+        allow_stale: 유효기간이 지난 결과라도 있으면 돌려준다 (요청 한도 초과 시 대체용)"""
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT places, raw_text, created_at FROM region_recommendations WHERE code=? AND category=?",
+                key,
+            ).fetchone()
+        if row is None or (not allow_stale and time.time() - row[2] > self.ttl):
+            return None
+        places = load_places(row[0]) if row[0] else parse_places(row[1])
+        return places or None
+
+    def put(self, key, places, raw_text=""):
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO region_recommendations"
+                " (code, category, raw_text, created_at, places) VALUES (?, ?, ?, ?, ?)",
+                (*key, raw_text, time.time(), dump_places(places)),
+            )
+
+    def fresh_keys(self):
+        cutoff = time.time() - self.ttl
+        with closing(self._connect()) as conn, conn:
+            rows = conn.execute(
+                "SELECT code, category FROM region_recommendations WHERE created_at >= ?",
+                (cutoff,),
+            ).fetchall()
+        return set(rows)
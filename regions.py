@@ -0,0 +1,239 @@
+"""맛집/여행지 추천용 지역 선택지 (시/도 → 시/군/구 → 읍/면/동)
+
+view_etc 의 선택 박스/검색과 추천 사전 계산 배치(precompute_recommendations.py)가 함께 쓴다.
+자료는 regions.tsv (10자리 행정구역 코드 + 이름, build_regions.py 로 행정안전부 자료에서 생성)를
+프로세스당 한 번 읽어 배열 기반 트리(Gazetteer)로 들고 있는다.
+지역의 키는 행정구역 코드 — 코드는 그대로 이름만 바뀌어도 추천 저장소 키는 그대로다
+(recommend_store.region_key). 함께 넣어 둔 파일은 예시분이라 화면에 일부 지역만 있다고 표시한다 (is_partial).
+
+- 노드는 단계(시도 → 시군구 → 읍면동)별로, 단계 안에서는 코드 순으로 놓는다.
+  코드 앞자리가 부모 코드라 한 노드의 자식은 다음 단계의 연속 구간 → (첫 자식, 개수)로 O(1) 조회
+- 이름은 문자열 하나에 이어 붙이고 끝 위치 배열로 잘라 쓴다 (노드마다 str 객체를 두지 않음)
+- 이름 앞부분 / 초성("ㅇㅅ" → 역삼동) 검색: 이름순·초성순으로 정렬한 노드 번호 배열 + 이분 탐색
+"""
+import os
+from array import array
+from bisect import bisect_left
+from functools import lru_cache
+
+REGIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "regions.tsv")
+
+LEVELS = 3   # 시도, 시군구, 읍면동
+SEARCH_SCAN = 500   # 검색 한 번에 훑는 앞부분 일치 후보 수 상한
+FULL_COVERAGE_DONGS = 3000   # 전국 자료면 읍면동이 3,500개 안팎 — 이보다 적으면 일부 지역만 있는 자료
+
+
+def code_level(code):
+    """10자리 행정구역 코드 → 단계 (1 시도, 2 시군구, 3 읍면동)"""
+    if code % 10**8 == 0:
+        return 1
+    if code % 10**5 == 0:
+        return 2
+    return 3
+
+
+def parent_code(code):
+    level = code_level(code)
+    if level == 1:
+        return None
+    return code - code % (10**8 if level == 2 else 10**5)
+
+
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+
+
+def choseong(text):
+    """한글 음절을 초성으로 ("역삼1동" → "ㅇㅅ1ㄷ"), 나머지 글자는 그대로 (길이 유지)"""
+    return "".join(_CHOSEONG[(ord(ch) - 0xAC00) // 588] if "가" <= ch <= "힣" else ch for ch in text)
+
+
+def is_choseong_query(text):
+    return any(ch in _CHOSEONG for ch in text)
+
+
+class Gazetteer:
+    def __init__(self, rows):
+        # rows: (코드, 이름) — 순서 무관. 부모가 없는 행(자료 오류)은 건너뛴다
+        by_level = [[] for _ in range(LEVELS)]
+        for code, name in rows:
+            by_level[code_level(code) - 1].append((code, name))
+
+        codes = array("q")
+        parents = array("i")
+        names = []
+        self.level_start = []
+        index = {}   # 코드 → 노드 번호 (만들 때만)
+        for level, items in enumerate(by_level):
+            self.level_start.append(len(codes))
+            for code, name in sorted(items):
+                parent = -1
+                if level:
+                    parent = index.get(parent_code(code))
+                    if parent is None:
+                        continue
+                index[code] = len(codes)
+                codes.append(code)
+                parents.append(parent)
+                names.append(name)
+        self.level_start.append(len(codes))
+
+        n = len(codes)
+        self.codes = codes
+        self.parents = parents
+        self.first_child = array("i", [0]) * n
+        self.child_count = array("i", [0]) * n
+        for node in range(n):
+            parent = parents[node]
+            if parent >= 0:
+                if not self.child_count[parent]:
+                    self.first_child[parent] = node
+                self.child_count[parent] += 1
+
+        # 이름 / 초성 — 문자열 하나 + 끝 위치 (초성은 글자 수가 같아 위치 배열을 같이 쓴다)
+        self._names = "".join(names)
+        self._choseong = choseong(self._names)
+        self._ends = array("I")
+        end = 0
+        for name in names:
+            end += len(name)
+            self._ends.append(end)
+        self._by_name = array("i", sorted(range(n), key=lambda i: (names[i], i)))
+        self._by_choseong = array("i", sorted(range(n), key=lambda i: (self.choseong_of(i), i)))
+
+    def __len__(self):
+        return len(self.codes)
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def name(self, node):
+        return self._names[self._ends[node - 1] if node else 0:self._ends[node]]
+
+    def choseong_of(self, node):
+        return self._choseong[self._ends[node - 1] if node else 0:self._ends[node]]
+
+    def level(self, node):
+        return code_level(self.codes[node])
+
+    def level_size(self, level):
+        """그 단계의 노드 수 (1 시도, 2 시군구, 3 읍면동)"""
+        return self.level_start[level] - self.level_start[level - 1]
+
+    def is_partial(self):
+        # 예시 파일 / 일부 시도만 변환한 파일
+        return self.level_size(3) < FULL_COVERAGE_DONGS
+
+    def roots(self):
+        return range(self.level_start[0], self.level_start[1])
+
+    def children(self, node):
+        first = self.first_child[node]
+        return range(first, first + self.child_count[node])
+
+    def parent(self, node):
+        parent = self.parents[node]
+        return None if parent < 0 else parent
+
+    def path(self, node):
+        """시도부터 node 까지의 노드 번호"""
+        nodes = []
+        while node is not None:
+            nodes.append(node)
+            node = self.parent(node)
+        return nodes[::-1]
+
+    def label(self, node):
+        return " ".join(self.name(n) for n in self.path(node))
+
+    def find(self, code):
+        """행정구역 코드 → 노드 번호 (없으면 None). 단계 안에서는 코드순이라 이분 탐색"""
+        level = code_level(code)
+        lo, hi = self.level_start[level - 1], self.level_start[level]
+        i = bisect_left(self.codes, code, lo, hi)
+        return i if i < hi and self.codes[i] == code else None
+
+    def find_names(self, *names):
+        """("서울특별시", "강남구", "역삼동") → 노드 번호 (없으면 None)"""
+        nodes = self.roots()
+        node = None
+        for name in names:
+            node = next((n for n in nodes if self.name(n) == name), None)
+            if node is None:
+                return None
+            nodes = self.children(node)
+        return node
+
+    # -----------------------------
+    # 검색 (type-ahead)
+    # -----------------------------
+    def search(self, query, limit=20):
+        """이름 앞부분 또는 초성으로 찾기 → 노드 번호 (상위 단계 먼저, 같은 단계는 코드순)
+
+        띄어 쓴 앞 단어는 상위 지역 조건: "강남 역삼" → 강남구 아래의 역삼*, "부산 중구" → 부산 중구만
+        """
+        words = query.split()
+        if not words:
+            return []
+        *scopes, prefix = words
+        hits = [n for n in self._prefix_matches(prefix) if self._in_scope(n, scopes)]
+        hits.sort(key=lambda n: (self.level(n), self.codes[n]))
+        return hits[:limit]
+
+    def _prefix_matches(self, prefix):
+        if is_choseong_query(prefix):
+            key, order, prefix = self.choseong_of, self._by_choseong, choseong(prefix)
+        else:
+            key, order = self.name, self._by_name
+        i = bisect_left(order, prefix, key=key)
+        end = min(len(order), i + SEARCH_SCAN)
+        while i < end and key(order[i]).startswith(prefix):
+            yield order[i]
+            i += 1
+
+    def _in_scope(self, node, scopes):
+        if not scopes:
+            return True
+        ancestors = self.path(node)[:-1]
+        for scope in scopes:
+            chosung = is_choseong_query(scope)
+            target = choseong(scope) if chosung else scope
+            if not any((self.choseong_of(a) if chosung else self.name(a)).startswith(target)
+                       for a in ancestors):
+                return False
+        return True
+
+    def nbytes(self):
+        """배열/문자열이 차지하는 대략적인 바이트"""
+        arrays = (self.codes, self.parents, self.first_child, self.child_count,
+                  self._ends, self._by_name, self._by_choseong)
+        strings = (self._names, self._choseong)
+        return sum(a.itemsize * len(a) for a in arrays) + sum(len(s.encode("utf-16-le")) for s in strings)
+
+
+def read_regions(path=REGIONS_PATH):
+    """regions.tsv → (코드, 이름) — '#' 줄은 주석"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+            code, name = line.split("\t", 1)
+            yield int(code), name
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path=REGIONS_PATH):
+    # 프로세스당 한 번 (앱 재실행마다 다시 만들지 않음)
+    return Gazetteer(read_regions(path))
+
+
+def iter_regions():
+    """선택 가능한 지역 전체 → (코드, 시/도, 시군구, 읍면동) — 코드는 가장 아래 단계의 것,
+    읍면동이 없는 시군구는 읍면동=None"""
+    regions = load_gazetteer()
+    for sido in regions.roots():
+        for city in regions.children(sido):
+            for dong in regions.children(city) or [None]:
+                node = city if dong is None else dong
+                yield (regions.codes[node], regions.name(sido), regions.name(city),
+                       regions.name(dong) if dong is not None else None)
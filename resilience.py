@@ -0,0 +1,127 @@
+"""외부 호출 보호 — 재시도(지터 백오프)와 회로 차단기
+
+구글 시트와 OpenAI 호출이 같이 쓴다.
+- retry_call: 일시적 오류(연결 실패, 시간 초과, 429, 5xx)만 다시 시도, 대기 시간은 full jitter
+  (0 ~ base·2^n 사이 무작위 — 여러 워커가 같은 순간에 다시 몰리지 않도록)
+- CircuitBreaker: 연속 실패가 threshold 번이면 열려서 reset_timeout 동안은 호출 없이 바로 실패
+  → 호출하는 쪽은 마지막 정상 데이터(시트 스냅샷, 저장된 답변/추천)로 대체.
+  시간이 지나면 시험 호출 1건만 통과시키고(half-open), 성공하면 닫힌다
+"""
+import random
+import threading
+import time
+
+
+class CircuitOpenError(RuntimeError):
+    def __init__(self, name, retry_after):
+        super().__init__(f"{name}: 연속 실패로 잠시 호출을 멈췄습니다 ({retry_after:.0f}초 후 재시도)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def is_transient(exc):
+    """다시 시도하거나 차단기 실패로 셀 오류인지 (요청 자체가 잘못된 4xx 는 제외)"""
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    if isinstance(exc, (OSError, TimeoutError)):   # requests 예외는 IOError 계열
+        return True
+    # httpx / openai 연결·시간 초과 예외 — 라이브러리를 import 하지 않고 이름으로 구분
+    return any("Timeout" in cls.__name__ or "Connection" in cls.__name__ for cls in type(exc).__mro__)
+
+
+def backoff_delay(attempt, base=0.5, cap=8.0):
+    # full jitter: attempt 번째 재시도 전 대기 (0 부터)
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def retry_call(fn, attempts=3, base=0.5, cap=8.0, retry_if=is_transient, sleep=time.sleep):
+    """fn() 을 최대 attempts 번 — 일시적 오류만 지터 백오프 후 다시, 마지막 오류는 그대로 올린다"""
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == attempts - 1 or not retry_if(e):
+                raise
+            sleep(backoff_delay(attempt, base, cap))
+
+
+class CircuitBreaker:
+    def __init__(self, name, threshold=3, reset_timeout=60.0):
+        self.name = name
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.state = "closed"      # closed / open / half_open
+        self.failures = 0          # 연속 실패 수
+        self.opened_at = 0.0
+        self.trial_at = 0.0        # half-open 시험 호출을 보낸 시각
+        # 지표
+        self.opens = 0
+        self.rejected = 0
+
+    def allow(self):
+        """지금 호출해도 되는지 — 열려 있으면 False (half-open 이면 시험 호출 1건만 True)"""
+        now = time.time()
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and now - self.opened_at >= self.reset_timeout:
+                self.state = "half_open"
+                self.trial_at = now
+                return True
+            # 시험 호출이 결과 없이 사라졌으면(버려진 스트림 등) 다음 호출을 새 시험으로
+            if self.state == "half_open" and now - self.trial_at >= self.reset_timeout:
+                self.trial_at = now
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self):
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_after())
+
+    def retry_after(self):
+        with self._lock:
+            if self.state == "closed":
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_timeout - time.time())
+
+    def record_success(self):
+        with self._lock:
+            self.state = "closed"
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == "half_open" or self.failures >= self.threshold:
+                if self.state != "open":
+                    self.opens += 1
+                self.state = "open"
+                self.opened_at = time.time()
+
+    def call(self, fn):
+        """차단기를 거쳐 fn() 호출 — 일시적 오류만 실패로 센다"""
+        self.check()
+        try:
+            result = fn()
+        except Exception as e:
+            if is_transient(e):
+                self.record_failure()
+            else:
+                self.record_success()   # 응답은 왔다 (요청이 잘못됐을 뿐)
+            raise
+        self.record_success()
+        return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opens": self.opens,
+                "rejected": self.rejected,
+            }
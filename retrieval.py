@@ -0,0 +1,84 @@
+"""챗봇 컨텍스트용 로컬 검색 (BM25 + 글자 bigram)
+
+프로필 항목 하나, 경력 행 하나를 각각 조각(Chunk)으로 색인해 두고,
+질문마다 관련 있는 조각만 골라 토큰 예산 안에서 system 프롬프트를 만든다.
+한국어는 조사/어미가 붙어 단어 단위로는 잘 안 맞으므로 글자 bigram 을 쓴다
+("사는곳이" → 사는, 는곳, 곳이). 색인은 스냅샷당 1번 (ContextCache 참고).
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+_WORD_RE = re.compile(r"[0-9a-z가-힣]+")
+
+
+def tokenize(text):
+    """단어별 글자 bigram (한 글자 단어는 그대로)"""
+    tokens = []
+    for word in _WORD_RE.findall(str(text).lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+@dataclass(frozen=True)
+class Chunk:
+    text: str
+    section: str       # "profile" | "career"
+    order: int         # 원래 순서 (골라낸 뒤 이 순서로 다시 정렬)
+    tokens: int        # 추정 토큰 수
+    pinned: bool = False   # 질문과 상관없이 항상 포함 (이름, 직업 등)
+
+
+class BM25Index:
+    def __init__(self, chunks, k1=1.2, b=0.75):
+        self.chunks = tuple(chunks)
+        self.k1 = k1
+        self.b = b
+        self._tf = [Counter(tokenize(c.text)) for c in self.chunks]
+        self._len = [sum(tf.values()) for tf in self._tf]
+        self._avg_len = (sum(self._len) / len(self._len)) if self._len else 0.0
+        self.total_tokens = sum(c.tokens for c in self.chunks)
+        df = Counter(term for tf in self._tf for term in tf)
+        n = len(self.chunks)
+        self._idf = {term: math.log(1 + (n - f + 0.5) / (f + 0.5)) for term, f in df.items()}
+
+    def scores(self, query):
+        terms = [t for t in set(tokenize(query)) if t in self._idf]
+        result = []
+        for tf, length in zip(self._tf, self._len):
+            score = 0.0
+            norm = self.k1 * (1 - self.b + self.b * length / self._avg_len) if self._avg_len else self.k1
+            for term in terms:
+                f = tf.get(term)
+                if f:
+                    score += self._idf[term] * f * (self.k1 + 1) / (f + norm)
+            result.append(score)
+        return result
+
+    def select(self, query, budget, top_k):
+        """고정 조각 + 점수 높은 조각을 top_k 개 / budget 토큰 안에서 → 원래 순서로"""
+        chosen = [c for c in self.chunks if c.pinned]
+        used = sum(c.tokens for c in chosen)
+        ranked = sorted(
+            ((s, c) for s, c in zip(self.scores(query), self.chunks) if not c.pinned),
+            key=lambda sc: (-sc[0], sc[1].order),
+        )
+        # 맞는 조각이 하나도 없으면 (예: "자기소개 해주세요") 앞쪽 조각부터 채운다
+        if not ranked or ranked[0][0] <= 0:
+            ranked = [(0.0, c) for c in self.chunks if not c.pinned]
+        picked = 0
+        for score, chunk in ranked:
+            if picked >= top_k:
+                break
+            if ranked[0][0] > 0 and score <= 0:
+                break
+            if used + chunk.tokens > budget:
+                continue
+            chosen.append(chunk)
+            used += chunk.tokens
+            picked += 1
+        return sorted(chosen, key=lambda c: c.order), used
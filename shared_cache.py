@@ -0,0 +1,267 @@
+"""워커 여러 개가 같이 쓰는 캐시 + 갱신 잠금
+
+`streamlit run` 을 여러 개 띄워 로드밸런서 뒤에 두면 st.cache_* 는 프로세스마다 따로라서
+워커마다 시트를 받고, 같은 FAQ 답변 / 지역 추천을 따로 만든다. 이 저장소를 거치면
+- 시트 스냅샷, 챗봇 답변이 한 워커에서 만들어지면 다른 워커는 읽기만 한다
+- lease(key): 같은 키를 동시에 한 워커(스레드)만 갱신 — 못 잡은 쪽은 결과를 기다리거나 넘어간다
+  (잠금은 기한이 있어서 잡은 프로세스가 죽어도 기한이 지나면 풀린다)
+
+저장소는 교체 가능 (rate_limit 과 같은 방식):
+- MemoryCache: 프로세스 1개 (기본) — 잠금은 같은 프로세스의 세션 스레드끼리만
+- SQLiteCache: 같은 호스트의 워커들이 파일 하나를 공유 (WAL — 읽기는 쓰기를 기다리지 않음)
+값은 pickle 로 저장한다 (DataFrame 등 시트 파싱 결과 포함).
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+
+
+def _owner():
+    # 잠금 소유자 — 같은 프로세스의 다른 스레드와도 구분
+    return f"{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex[:8]}"
+
+
+class _BaseCache:
+    """지표 + lease — 저장소는 get / put / scan / acquire / release / held 만 구현"""
+
+    def __init__(self):
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.puts = 0
+        self.leases = 0
+        self.contended = 0   # 다른 쪽이 갱신 중이라 잠금을 못 잡은 횟수
+
+    def _count(self, name, n=1):
+        with self._stats_lock:
+            setattr(self, name, getattr(self, name) + n)
+
+    def stats(self):
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+                "puts": self.puts,
+                "leases": self.leases,
+                "contended": self.contended,
+            }
+
+    def wait_while_held(self, key, fn, timeout, interval=0.25):
+        """key 잠금을 잡은 쪽이 만드는 결과 fn() 을 기다린다 — 잠금이 풀리면(상대가 실패해도) 한 번 더 보고 바로 끝
+        끝내 없으면 None (그때는 직접 만든다)"""
+        deadline = time.time() + timeout
+        while True:
+            value = fn()
+            if value is not None or time.time() >= deadline:
+                return value
+            if not self.held(key):
+                # 풀리기 직전에 결과를 써 두었을 수 있다
+                return fn()
+            time.sleep(interval)
+
+    @contextmanager
+    def lease(self, key, seconds):
+        """with cache.lease("sheet:<url>", 60) as owned: — owned 일 때만 갱신한다"""
+        owner = _owner()
+        owned = self.acquire(key, owner, seconds)
+        self._count("leases" if owned else "contended")
+        try:
+            yield owned
+        finally:
+            if owned:
+                self.release(key, owner)
+
+
+# -----------------------------
+# 저장소
+# -----------------------------
+class MemoryCache(_BaseCache):
+    """프로세스 메모리 (워커 1개일 때 — 잠금은 세션 스레드끼리 중복 호출을 막는 용도)"""
+
+    shared = False
+
+    def __init__(self):
+        super().__init__()
+        self._entries = {}   # key → (value, expires 또는 None, stored_at)
+        self._locks = {}     # key → (owner, expires)
+        self._lock = threading.Lock()
+
+    def get(self, key, allow_stale=False):
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or (not allow_stale and entry[1] is not None and entry[1] <= time.time()):
+            self._count("misses")
+            return None
+        self._count("hits")
+        return entry[0]
+
+    def put(self, key, value, ttl=None):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (value, now + ttl if ttl else None, now)
+        self._count("puts")
+
+    def scan(self, prefix, allow_stale=False, since=None):
+        """prefix 로 시작하는 (key, value, expires) 목록 — since 를 주면 그 뒤에 저장된 것만"""
+        now = time.time()
+        with self._lock:
+            return [
+                (key, value, expires) for key, (value, expires, stored_at) in self._entries.items()
+                if key.startswith(prefix) and (allow_stale or expires is None or expires > now)
+                and (since is None or stored_at > since)
+            ]
+
+    def acquire(self, key, owner, seconds):
+        now = time.time()
+        with self._lock:
+            held = self._locks.get(key)
+            if held is not None and held[1] > now:
+                return False
+            self._locks[key] = (owner, now + seconds)
+            return True
+
+    def held(self, key):
+        with self._lock:
+            lock = self._locks.get(key)
+        return lock is not None and lock[1] > time.time()
+
+    def release(self, key, owner):
+        with self._lock:
+            if self._locks.get(key, (None,))[0] == owner:
+                del self._locks[key]
+
+    def prune(self, older_than=86400):
+        cutoff = time.time() - older_than
+        with self._lock:
+            for key in [k for k, (_, expires, _) in self._entries.items() if expires is not None and expires < cutoff]:
+                del self._entries[key]
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key       TEXT PRIMARY KEY,
+    value     BLOB NOT NULL,
+    stored_at REAL NOT NULL,
+    expires   REAL
+);
+CREATE TABLE IF NOT EXISTS cache_locks (
+    key     TEXT PRIMARY KEY,
+    owner   TEXT NOT NULL,
+    expires REAL NOT NULL
+);
+"""
+
+
+class SQLiteCache(_BaseCache):
+    """같은 호스트의 워커 프로세스들이 파일 하나를 공유 (잠금은 BEGIN IMMEDIATE 로 원자적으로)"""
+
+    shared = True
+
+    def __init__(self, path, prune_every=500):
+        super().__init__()
+        self.path = path
+        self.prune_every = prune_every   # put 이 이만큼 쌓일 때마다 오래 만료된 항목 정리
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    def _connect(self):
+        # 호출마다 새 연결 — 세션 스레드 어디서든 안전 (rate_limit.SQLiteBackend 와 같은 방식)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")   # WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않음
+        return conn
+
+    def get(self, key, allow_stale=False):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value, expires FROM cache_entries WHERE key=?", (key,)).fetchone()
+        finally:
+            conn.close()
+        if row is None or (not allow_stale and row[1] is not None and row[1] <= time.time()):
+            self._count("misses")
+            return None
+        self._count("hits")
+        return pickle.loads(row[0])
+
+    def put(self, key, value, ttl=None):
+        now = time.time()
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (key, value, stored_at, expires) VALUES (?, ?, ?, ?)",
+                (key, blob, now, now + ttl if ttl else None),
+            )
+        finally:
+            conn.close()
+        self._count("puts")
+        if self.prune_every and self.puts % self.prune_every == 0:
+            self.prune()
+
+    def scan(self, prefix, allow_stale=False, since=None):
+        # LIKE 대신 범위 조건 — 기본키 색인을 그대로 탄다 (prefix 에 % _ 가 있어도 안전)
+        # since: 그 뒤에 저장된 행만 (값을 읽고 푸는 건 새 행뿐)
+        now = time.time()
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT key, value, expires FROM cache_entries WHERE key >= ? AND key < ? AND stored_at > ?",
+                (prefix, prefix + "\U0010ffff", since if since is not None else float("-inf")),
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            (key, pickle.loads(value), expires) for key, value, expires in rows
+            if allow_stale or expires is None or expires > now
+        ]
+
+    def acquire(self, key, owner, seconds):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT expires FROM cache_locks WHERE key=?", (key,)).fetchone()
+            if row is not None and row[0] > now:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute("INSERT OR REPLACE INTO cache_locks VALUES (?, ?, ?)", (key, owner, now + seconds))
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def held(self, key):
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT expires FROM cache_locks WHERE key=?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return row is not None and row[0] > time.time()
+
+    def release(self, key, owner):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache_locks WHERE key=? AND owner=?", (key, owner))
+        finally:
+            conn.close()
+
+    def prune(self, older_than=86400):
+        # 만료된 지 하루가 넘은 항목만 — 그 안쪽은 장애 시 대체 답변(allow_stale)으로 쓴다
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM cache_entries WHERE expires < ?", (time.time() - older_than,))
+            conn.execute("DELETE FROM cache_locks WHERE expires < ?", (time.time(),))
+        finally:
+            conn.close()
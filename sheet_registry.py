@@ -0,0 +1,163 @@
+"""시트 레지스트리 — 모든 구글 시트 데이터 소스를 한 곳에서 관리
+
+시트 하나 = SheetSpec 하나 (URL, 갱신 주기, 파서, 후처리, 캐시 정책).
+새 시트는 register_sheet() 한 줄로 추가하고, 뷰에서는 SheetStore 를 통해
+후처리까지 끝난 객체를 받아 쓴다. 데코레이터/캐시 설정을 복사할 필요 없음.
+
+- SHEETS: 모든 프로필이 같이 쓰는 시트 (MBTI 설명 등)
+- profile_sheet_specs(): 프로필(QR 카드)마다 따로 있는 자기소개/경력 시트 (profiles 참고)
+
+pandas 는 시트를 실제로 파싱할 때 import 한다 (홈 화면처럼 시트가 필요 없는 요청은 import 비용 없음).
+"""
+import hashlib
+import io
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from mbti_index import MbtiIndex, build_mbti_index
+
+
+@dataclass(frozen=True)
+class SheetSpec:
+    name: str
+    url: str
+    parser: Callable[[bytes], Any]                 # CSV bytes → 원본 데이터 (보통 DataFrame)
+    postprocess: Optional[Callable[[Any], Any]] = None   # 원본 → 뷰에서 쓰는 객체
+    ttl: int = 300                                 # 백그라운드 갱신 주기 (초)
+    max_staleness: int = 3600                      # 이 시간 넘게 갱신 실패 시 stale
+    persist: bool = True                           # 디스크 스냅샷 저장 여부
+    default: Optional[Callable[[], Any]] = None    # 아직 데이터가 없을 때 쓸 기본값
+    pieces: Optional[Callable[[Any], dict]] = None # 데이터 → {조각 이름: 해시} (조각 단위 변경 감지)
+
+    def load(self, raw):
+        data = self.parser(raw)
+        return self.postprocess(data) if self.postprocess else data
+
+    def empty(self):
+        return self.default() if self.default else None
+
+
+SHEETS = {}
+
+
+def register_sheet(name, url, *, parser=None, postprocess=None, ttl=300,
+                   max_staleness=3600, persist=True, default=None, pieces=None):
+    spec = SheetSpec(
+        name=name,
+        url=url,
+        parser=parser or read_csv(),
+        postprocess=postprocess,
+        ttl=ttl,
+        max_staleness=max_staleness,
+        persist=persist,
+        default=default,
+        pieces=pieces,
+    )
+    SHEETS[name] = spec
+    return spec
+
+
+def read_csv(**kwargs):
+    def _parse(raw):
+        import pandas as pd
+        return pd.read_csv(io.BytesIO(raw), **kwargs)
+    return _parse
+
+
+# -----------------------------
+# 후처리
+# -----------------------------
+def normalize_key(key):
+    # 공백 제거 + 소문자 변환 ("사용 RPA툴" → "사용rpa툴")
+    return str(key).strip().lower().replace(" ", "")
+
+
+def profile_to_dict(df):
+    keys = df.iloc[:, 0].astype(str).map(normalize_key)
+    vals = df.iloc[:, 1].astype(str).str.strip()
+    return dict(zip(keys, vals))
+
+
+def normalize_career(df):
+    df = df.copy()
+    # 시트에 "\n" 문자 그대로 입력된 줄바꿈을 실제 줄바꿈으로 (로드 시 1회만)
+    df["상세 내용"] = df["상세 내용"].astype(str).str.replace("\\n", "\n", regex=False)
+    return df.reset_index(drop=True)
+
+
+# -----------------------------
+# 조각 (SheetStore 가 조각별 해시를 비교해 바뀐 조각의 버전만 올린다)
+# -----------------------------
+def hash_rows(df, columns=None):
+    """행별 내용 해시 (16자리 hex) — pandas 벡터 해시라 행 반복 없음"""
+    import pandas as pd
+    frame = df if columns is None else df[columns]
+    return pd.util.hash_pandas_object(frame.astype(str), index=False).map("{:016x}".format)
+
+
+def short_hash(text):
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+
+def profile_pieces(profile):
+    # 항목 하나 = 조각 하나 ("key:이름", "key:mbti" ...)
+    return {f"key:{k}": short_hash(str(v)) for k, v in profile.items()}
+
+
+CAREER_ROW_ID = ["기간", "회사/기관", "직무"]
+
+
+def career_pieces(df):
+    """경력 행 하나 = 조각 하나 ("row:<행 id>") + 행 구성 조각 ("rows")
+
+    행 id 는 기간/회사/직무로 정하므로 상세 내용 오탈자 수정은 해당 행 조각만 바뀌고,
+    행 추가/삭제/순서 변경/회사·직무 변경은 "rows" 조각까지 바뀐다.
+    """
+    if df.empty:
+        return {"rows": ""}
+    ids = hash_rows(df, CAREER_ROW_ID)
+    # 같은 (기간, 회사, 직무) 행이 여러 개면 순번으로 구분
+    ids = ids + ids.groupby(ids).cumcount().map(lambda n: f"#{n}" if n else "")
+    contents = hash_rows(df, CAREER_COLUMNS)
+    pieces = {"rows": short_hash("|".join(ids))}
+    pieces.update(zip("row:" + ids, contents))
+    return pieces
+
+
+# -----------------------------
+# 등록된 시트
+# -----------------------------
+PROFILE_SHEET_URL = "https://docs.google.com/spreadsheets/d/1eOApzLbogOSx68xf7d3Wj0xs-7acj9HKLDM5GXMR4P0/export?format=csv&gid=0"
+CAREER_SHEET_URL = "https://docs.google.com/spreadsheets/d/18ohr0sXHqPYu0Bzk8UCQUsKGNCIUHoAEQm0FA7IrdKA/export?format=csv&gid=0"
+MBTI_SHEET_URL = "https://docs.google.com/spreadsheets/d/1GJ1gQfkArBmiI4Kus8Isl8mkCIGMxNLSb9Bw6KvKSVU/export?format=csv&gid=0"
+
+CAREER_COLUMNS = ["기간", "회사/기관", "직무", "상세 내용"]
+
+
+def empty_career():
+    import pandas as pd
+    return pd.DataFrame(columns=CAREER_COLUMNS)
+
+
+def profile_sheet_specs(profile_url, career_url, ttl=300):
+    """프로필 1개분 시트 (자기소개 + 경력) — 레지스트리에 등록하지 않고 프로필별 저장소에서 사용"""
+    return [
+        SheetSpec(
+            name="profile", url=profile_url, parser=read_csv(),
+            postprocess=profile_to_dict, ttl=ttl, default=dict, pieces=profile_pieces,
+        ),
+        SheetSpec(
+            name="career", url=career_url, parser=read_csv(),
+            postprocess=normalize_career, ttl=ttl, default=empty_career, pieces=career_pieces,
+        ),
+    ]
+
+
+# 공용 시트
+register_sheet(
+    "mbti", MBTI_SHEET_URL,
+    parser=read_csv(encoding="utf-8-sig"),
+    postprocess=build_mbti_index,   # 16개 유형 dict 색인 + 요약 미리 렌더링
+    ttl=3600,   # MBTI 설명은 거의 바뀌지 않음
+    default=MbtiIndex,
+)
@@ -0,0 +1,415 @@
+"""구글 시트 공유 저장소 (stale-while-revalidate)
+
+모든 세션이 하나의 SheetStore 를 공유한다.
+- 사용자 요청은 항상 마지막으로 성공한 스냅샷을 바로 받는다 (구글을 기다리지 않음)
+- 갱신은 백그라운드 스레드가 주기적으로 수행한다
+- ETag / Last-Modified 가 있으면 조건부 요청으로 변경 여부만 확인한다
+- 파싱된 스냅샷을 디스크에 저장해 두고, 재시작 시 네트워크 없이 바로 띄운다
+- 시트가 조각(SheetSpec.pieces — 경력 행, 프로필 항목 등)을 선언하면 조각별 해시를 두고 직전과 비교한다.
+  파생 캐시는 content_key("career:rows") 처럼 필요한 조각의 해시에만 의존한다
+  (해시라서 워커끼리 / 재시작 뒤에도 같은 내용이면 같은 키 — 공유 답변 캐시 키로도 쓴다)
+- 요청마다 (연결, 읽기) 시간 제한, 일시적 오류는 지터 백오프로 재시도, 시트별 회로 차단기가
+  열려 있으면 요청 없이 바로 마지막 스냅샷 (resilience 참고). executor 를 주면 시트를 동시에 받는다
+- cache(shared_cache.SQLiteCache)를 주면 워커들이 시트 URL 별 스냅샷을 나눠 쓴다 — 갱신 주기마다
+  잠금을 잡은 워커 1개만 구글에 요청하고, 나머지는 그 결과를 그대로 가져온다
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+
+from resilience import CircuitBreaker, CircuitOpenError, retry_call
+from tracing import span, tracer
+
+# 디스크 스냅샷 포맷 버전 — 저장 구조나 파서 결과 타입이 바뀌면 올린다
+SNAPSHOT_SCHEMA = 4
+
+_NO_DEFAULT = object()
+
+SHEET_TIMEOUT = (3.05, 10)   # (연결, 읽기) 초 — 응답 없는 구글이 스레드를 붙잡지 않도록
+FETCH_ATTEMPTS = 3           # 일시적 오류(연결 실패, 시간 초과, 429, 5xx) 포함 최대 시도 횟수
+BREAKER_THRESHOLD = 3        # 연속 실패가 이만큼이면 차단기가 열린다 (재시도를 다 쓴 갱신 1번 = 실패 1번)
+BREAKER_RESET = 120          # 열린 뒤 이만큼 지나야 시험 요청 1건
+SHARED_LEASE = 60            # 공유 캐시 갱신 잠금 기한 (초) — 재시도를 다 쓴 요청보다 길게
+
+
+@dataclass
+class SheetSnapshot:
+    name: str
+    data: object
+    etag: str = ""
+    last_modified: str = ""
+    fetched_at: float = 0.0   # 마지막으로 원본과 일치를 확인한 시각 (304 포함)
+    content_hash: str = ""    # 원본 CSV bytes 해시 — 같으면 다시 파싱하지 않음
+    pieces: dict = field(default_factory=dict)   # 조각 이름 → 해시
+    diff: "SheetDiff" = None  # 직전 스냅샷 대비 변경 (첫 로드면 None)
+
+
+@dataclass(frozen=True)
+class SheetDiff:
+    added: tuple = ()
+    removed: tuple = ()
+    changed: tuple = ()
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self):
+        return {"added": len(self.added), "removed": len(self.removed), "changed": len(self.changed)}
+
+
+def diff_pieces(old, new):
+    return SheetDiff(
+        added=tuple(p for p in new if p not in old),
+        removed=tuple(p for p in old if p not in new),
+        changed=tuple(p for p, h in new.items() if p in old and old[p] != h),
+    )
+
+
+class SheetStore:
+    def __init__(self, specs, timeout=SHEET_TIMEOUT, snapshot_path=None, session=None, executor=None,
+                 attempts=FETCH_ATTEMPTS, cache=None):
+        # specs: SheetSpec 목록 (sheet_registry 참고) — 시트별 URL / 갱신 주기 / 파서
+        # session: 여러 저장소가 커넥션 풀을 같이 쓰려면 requests.Session 을 넘긴다
+        # executor: 시트 여러 개를 동시에 받을 스레드 풀 (없으면 순서대로)
+        # cache: 워커 프로세스끼리 스냅샷을 나눠 쓸 공유 캐시 (없으면 워커마다 따로 받는다)
+        self.specs = {spec.name: spec for spec in specs}
+        self.timeout = timeout
+        self.snapshot_path = snapshot_path
+        self.executor = executor
+        self.attempts = attempts
+        self.cache = cache
+        self._breakers = {
+            name: CircuitBreaker(f"sheet:{name}", BREAKER_THRESHOLD, BREAKER_RESET) for name in self.specs
+        }
+
+        self._snapshots = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        if session is None:
+            import requests
+            session = requests.Session()
+        self._session = session
+        self._listeners = []
+
+    # -----------------------------
+    # 조회
+    # -----------------------------
+    def get(self, name, default=_NO_DEFAULT):
+        snap = self._snapshots.get(name)
+        if snap is not None:
+            return snap.data
+        return self.specs[name].empty() if default is _NO_DEFAULT else default
+
+    def content_key(self, names):
+        # 여러 시트(또는 "시트:조각") 내용을 합친 버전 키 — 파생 캐시(컨텍스트, 답변 등)의 키로 사용
+        parts = []
+        for name in names:
+            sheet, _, piece = name.partition(":")
+            snap = self._snapshots.get(sheet)
+            if snap is None:
+                parts.append("")
+            elif piece:
+                parts.append(snap.pieces.get(piece, ""))
+            else:
+                parts.append(snap.content_hash)
+        return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+    def add_listener(self, fn):
+        # fn(changed_names) — 시트 내용이 바뀐 뒤 갱신 스레드에서 호출
+        self._listeners.append(fn)
+
+    def snapshot(self, name):
+        return self._snapshots.get(name)
+
+    def health(self):
+        now = time.time()
+        sheets = {}
+        for name, spec in self.specs.items():
+            snap = self._snapshots.get(name)
+            age = now - snap.fetched_at if snap else None
+            sheets[name] = {
+                "loaded": snap is not None,
+                "content_hash": snap.content_hash[:12] if snap else "",
+                "ttl": spec.ttl,
+                "age_sec": round(age, 1) if age is not None else None,
+                "stale": age is None or age > spec.max_staleness,
+                "etag": snap.etag if snap else "",
+                "pieces": len(snap.pieces) if snap else 0,
+                "last_diff": snap.diff.summary() if snap and snap.diff is not None else None,
+                "last_error": self._errors.get(name, ""),
+                "circuit": self._breakers[name].stats(),
+            }
+        return {
+            "ok": all(not s["stale"] for s in sheets.values()),
+            "background": self._thread is not None and self._thread.is_alive(),
+            "snapshot_path": self.snapshot_path or "",
+            "shared_cache": self.cache is not None,
+            "sheets": sheets,
+        }
+
+    # -----------------------------
+    # 갱신
+    # -----------------------------
+    def refresh(self, name):
+        spec = self.specs[name]
+        prev = self._snapshots.get(name)
+
+        headers = {}
+        if prev is not None and prev.etag:
+            headers["If-None-Match"] = prev.etag
+        if prev is not None and prev.last_modified:
+            headers["If-Modified-Since"] = prev.last_modified
+
+        # 차단기가 열려 있으면 CircuitOpenError (요청 없음), 아니면 일시적 오류만 재시도
+        resp = self._breakers[name].call(
+            lambda: retry_call(lambda: self._fetch(spec.url, headers), attempts=self.attempts)
+        )
+        now = time.time()
+
+        if resp.status_code == 304 and prev is not None:
+            prev.fetched_at = now
+            return False
+
+        # 조건부 요청을 지원하지 않는 응답이라도 내용이 같으면 파싱/색인을 건너뛴다
+        content_hash = hashlib.sha256(resp.content).hexdigest()
+        if prev is not None and prev.content_hash == content_hash:
+            prev.fetched_at = now
+            prev.etag = resp.headers.get("ETag", prev.etag)
+            prev.last_modified = resp.headers.get("Last-Modified", prev.last_modified)
+            return False
+
+        with span("sheet.parse", sheet=name):
+            data = spec.load(resp.content)
+            pieces = spec.pieces(data) if spec.pieces else {}
+        self._install(name, prev, data, pieces, content_hash, now,
+                      resp.headers.get("ETag", ""), resp.headers.get("Last-Modified", ""))
+        return True
+
+    def _install(self, name, prev, data, pieces, content_hash, fetched_at, etag="", last_modified=""):
+        # 조각 단위 구조 비교 (health 의 last_diff) — 파생 캐시는 바뀐 조각의 해시로 알아챈다
+        diff = None
+        if prev is not None:
+            diff = diff_pieces(prev.pieces, pieces)
+            tracer.incr("sheet.pieces_changed", len(diff.added) + len(diff.removed) + len(diff.changed))
+        snap = SheetSnapshot(
+            name=name,
+            data=data,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=fetched_at,
+            content_hash=content_hash,
+            pieces=pieces,
+            diff=diff,
+        )
+        with self._lock:
+            self._snapshots[name] = snap
+
+    def _fetch(self, url, headers):
+        resp = self._session.get(url, headers=headers, timeout=self.timeout)
+        if resp.status_code != 304:
+            resp.raise_for_status()   # 5xx / 429 는 retry_call 이 다시 시도
+        return resp
+
+    def due_names(self, now=None):
+        """갱신 주기가 지났거나 아직 한 번도 못 받은 시트"""
+        now = time.time() if now is None else now
+        names = []
+        for name, spec in self.specs.items():
+            snap = self._snapshots.get(name)
+            if snap is None or now - snap.fetched_at >= spec.ttl:
+                names.append(name)
+        return names
+
+    def refresh_sheet(self, name):
+        """시트 1개 갱신 — 실패해도 마지막 정상 스냅샷은 그대로 서빙 (오류만 기록). 바뀌었으면 True"""
+        try:
+            with span("sheet.load", sheet=name) as s:
+                updated = self.refresh(name) if self.cache is None else self.refresh_shared(name)
+                s.set(changed=updated)
+            self._errors.pop(name, None)
+            return updated
+        except CircuitOpenError:
+            # 원본이 죽어 있는 동안은 요청 없이 넘어간다 (last_error 는 마지막 실제 오류 유지)
+            tracer.incr("sheet.circuit_open")
+        except Exception as e:
+            self._errors[name] = f"{type(e).__name__}: {e}"
+        return False
+
+    def refresh_all(self, due_only=False):
+        names = self.due_names() if due_only else list(self.specs)
+        if self.executor is not None and len(names) > 1:
+            results = list(self.executor.map(self.refresh_sheet, names))
+        else:
+            results = [self.refresh_sheet(name) for name in names]
+        changed = [name for name, updated in zip(names, results) if updated]
+        self.publish(changed)
+        return changed
+
+    def publish(self, changed):
+        # 바뀐 시트가 있으면 디스크 스냅샷 저장 + 리스너 호출 (갱신 스레드에서)
+        if not changed:
+            return
+        self.save_snapshot()
+        for fn in list(self._listeners):
+            try:
+                fn(changed)
+            except Exception as e:
+                self._errors["_listener"] = f"{type(e).__name__}: {e}"
+
+    def start(self, background=True):
+        if self._thread is not None:
+            return
+        # 디스크 스냅샷이 있으면 바로 서빙하고 원본 확인은 백그라운드에서,
+        # 없으면 최초 1회만 동기 로드 (프로세스 기동 시점에만 발생)
+        warm = self.load_snapshot()
+        if not warm:
+            self.refresh_all()
+        if not background:
+            # 갱신 스레드는 호출자가 관리 (ProfilePool 이 여러 저장소를 스레드 1개로 갱신)
+            return
+        self._thread = threading.Thread(
+            target=self._run, args=(warm,), name="sheet-refresh", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self, refresh_now=False):
+        if refresh_now:
+            self.refresh_all()
+        # 가장 짧은 갱신 주기마다 깨어나서, 주기가 지난 시트만 다시 받는다
+        tick = min((spec.ttl for spec in self.specs.values()), default=300)
+        while not self._stop.wait(tick):
+            self.refresh_all(due_only=True)
+
+    # -----------------------------
+    # 워커 공유 (cache)
+    # -----------------------------
+    def refresh_shared(self, name):
+        """공유 캐시를 거쳐 갱신 — 다른 워커가 이번 주기에 이미 받았으면 요청 없이 그 스냅샷을 쓴다"""
+        spec = self.specs[name]
+        key = f"sheet:{spec.url}"
+        entry = self.cache.get(key)
+        if self._is_fresh(spec, entry):
+            return self._adopt(name, entry)
+
+        with self.cache.lease(key, SHARED_LEASE) as owned:
+            if not owned:
+                # 다른 워커가 받는 중 — 처음 띄우는 중이면 결과를 기다리고, 아니면 다음 주기에
+                if self._snapshots.get(name) is None:
+                    entry = self.cache.wait_while_held(key, lambda: self._fresh_entry(spec, key), SHARED_LEASE) or entry
+                    if entry is None:
+                        # 받던 쪽이 실패하고 잠금을 놓았다 — 남은 기한을 기다리지 않고 직접 받는다
+                        tracer.incr("sheet.shared_fallback")
+                        return self.refresh(name)
+                tracer.incr("sheet.shared_busy")
+                return self._adopt(name, entry) if entry is not None else False
+            # 처음 확인한 뒤 잠금을 잡기 전에 다른 워커가 끝냈을 수 있다
+            entry = self.cache.get(key)
+            if self._is_fresh(spec, entry):
+                return self._adopt(name, entry)
+            # 다른 워커가 마지막으로 받은 것이 더 최신이면 먼저 가져와서 그 ETag 로 조건부 요청
+            adopted = self._adopt(name, entry) if entry is not None else False
+            updated = self.refresh(name)
+            snap = self._snapshots.get(name)
+            if snap is not None:
+                self.cache.put(key, self._entry(name, snap))
+            return updated or adopted
+
+    def _is_fresh(self, spec, entry):
+        return (entry is not None and entry.get("schema") == SNAPSHOT_SCHEMA
+                and time.time() - entry["fetched_at"] < spec.ttl)
+
+    def _fresh_entry(self, spec, key):
+        entry = self.cache.get(key)
+        return entry if self._is_fresh(spec, entry) else None
+
+    def _adopt(self, name, entry):
+        """다른 워커가 올린 스냅샷을 반영 — 내용이 바뀌었으면 True"""
+        prev = self._snapshots.get(name)
+        if entry.get("schema") != SNAPSHOT_SCHEMA or entry.get("url") != self.specs[name].url:
+            return False
+        if prev is not None and entry["fetched_at"] <= prev.fetched_at:
+            return False
+        if prev is not None and prev.content_hash == entry["content_hash"]:
+            prev.fetched_at = entry["fetched_at"]
+            prev.etag = entry["etag"]
+            prev.last_modified = entry["last_modified"]
+            return False
+        self._install(name, prev, entry["data"], entry["pieces"], entry["content_hash"],
+                      entry["fetched_at"], entry["etag"], entry["last_modified"])
+        tracer.incr("sheet.shared_adopt")
+        return True
+
+    def _entry(self, name, snap):
+        # 디스크 스냅샷 / 공유 캐시에 저장하는 시트 1개
+        return {
+            "schema": SNAPSHOT_SCHEMA,
+            "url": self.specs[name].url,
+            "data": snap.data,
+            "etag": snap.etag,
+            "last_modified": snap.last_modified,
+            "fetched_at": snap.fetched_at,
+            "content_hash": snap.content_hash,
+            "pieces": snap.pieces,
+        }
+
+    # -----------------------------
+    # 디스크 스냅샷
+    # -----------------------------
+    def save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        payload = {
+            "schema": SNAPSHOT_SCHEMA,
+            "sheets": {
+                name: self._entry(name, snap)
+                for name, snap in self._snapshots.items()
+                if self.specs[name].persist
+            },
+        }
+        try:
+            os.makedirs(os.path.dirname(self.snapshot_path) or ".", exist_ok=True)
+            tmp = f"{self.snapshot_path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self.snapshot_path)  # 원자적 교체 — 읽는 쪽이 반쯤 쓴 파일을 보지 않음
+        except OSError as e:
+            self._errors["_snapshot"] = f"{type(e).__name__}: {e}"
+
+    def load_snapshot(self):
+        """디스크 스냅샷을 읽어 메모리에 올린다. 하나라도 올렸으면 True"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return False
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as e:
+            self._errors["_snapshot"] = f"{type(e).__name__}: {e}"
+            return False
+        if not isinstance(payload, dict) or payload.get("schema") != SNAPSHOT_SCHEMA:
+            return False
+
+        loaded = False
+        with self._lock:
+            for name, entry in payload.get("sheets", {}).items():
+                # 시트 URL 이 바뀌었으면 예전 스냅샷은 버린다
+                if name not in self.specs or entry.get("url") != self.specs[name].url:
+                    continue
+                self._snapshots[name] = SheetSnapshot(
+                    name=name,
+                    data=entry["data"],
+                    etag=entry.get("etag", ""),
+                    last_modified=entry.get("last_modified", ""),
+                    fetched_at=entry.get("fetched_at", 0.0),
+                    content_hash=entry.get("content_hash", ""),
+                    pieces=entry.get("pieces", {}),
+                )
+                loaded = True
+        return loaded
@@ -0,0 +1,362 @@
+"""정적 페이지 내보내기 + 작은 서버
+
+홈 / 소개 / 경력은 시트 데이터만으로 정해지는 화면이라, 시트가 바뀔 때마다
+HTML 파일로 미리 만들어 두고 그대로 내려준다 (웹소켓 세션, 스크립트 재실행, JS 번들 없음).
+질문(contact) / 기타(etc) 는 지금처럼 Streamlit 앱이 처리한다.
+
+    python static_site.py build --app-url https://my-card.streamlit.app/
+    python static_site.py serve --port 8080 --app-url https://my-card.streamlit.app/
+
+디렉터리 구조 (프로필 id 별):
+    <out>/<id>/index.html       홈
+    <out>/<id>/about.html       소개
+    <out>/<id>/career.html      경력 1페이지 (career-2.html, career-3.html ...)
+    <out>/<id>/img/             프로필 사진 1x/2x WebP/JPEG (파일명에 내용 해시 → 1년 캐시)
+    <out>/<id>/.version         마지막으로 내보낸 시트 내용 키
+
+서버는 기존 QR 주소(/?route=about&profile=<id>)도 받아 정적 파일로 응답하고,
+그 외 route 는 앱 주소로 302 리다이렉트한다. serve 는 시트가 바뀌면 다시 내보낸다.
+"""
+import argparse
+import functools
+import http.server
+import os
+import sys
+import threading
+import time
+from html import escape
+from urllib.parse import parse_qs, unquote, urlencode, urlsplit
+
+from career_view import render_career_html_items
+from image_pipeline import ImagePipeline
+from page_layout import GLOBAL_CSS, HOME_INTRO_HTML, contact_links, info_card_html, menu_html
+from profiles import DEFAULT_PROFILE, PROFILE_ID_RE, PROFILES, ProfilePool, load_profiles_file
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.environ.get("QR_LANDING_CACHE_DIR", os.path.join(APP_DIR, ".cache"))
+DEFAULT_OUT_DIR = os.environ.get("QR_LANDING_STATIC_DIR", os.path.join(CACHE_DIR, "site"))
+DEFAULT_APP_URL = os.environ.get("QR_LANDING_APP_URL", "http://localhost:8501/")
+
+STATIC_ROUTES = ("home", "about", "career")
+CAREER_PAGE_SIZE = 10
+RENDER_VERSION = 2   # 템플릿이 바뀌면 올린다 — 시트가 그대로여도 다시 내보냄
+
+# Streamlit 기본 스타일 대신 쓰는 최소한의 바탕 스타일
+BASE_CSS = """
+<style>
+body { margin: 0; font-family: -apple-system, BlinkMacSystemFont, "Apple SD Gothic Neo", "Noto Sans KR", sans-serif; color: #31333F; }
+main { max-width: 960px; margin: 0 auto; padding: 0 16px; }
+.columns { display: flex; flex-wrap: wrap; gap: 32px; align-items: flex-start; }
+.columns > .left { flex: 2 1 320px; }
+.columns > .right { flex: 1 1 220px; text-align: center; }
+.btn { display: inline-block; padding: 8px 16px; margin: 4px 4px 4px 0; border: 1px solid rgba(49,51,63,0.2); border-radius: 8px; color: inherit; text-decoration: none; }
+.caption, footer { font-size: 14px; color: gray; }
+footer { padding: 16px; text-align: center; }
+ul.career { padding-left: 20px; line-height: 1.6; }
+ul.career li { margin-bottom: 16px; padding-bottom: 16px; border-bottom: 1px solid #eee; }
+</style>
+"""
+
+
+# -----------------------------
+# 경로 / 링크
+# -----------------------------
+def static_page_path(profile_id, route, page=1):
+    """정적 파일 상대 경로 (<id>/<파일>) — 앱에서 정적 사이트로 링크할 때도 사용"""
+    if route == "about":
+        name = "about.html"
+    elif route == "career":
+        name = "career.html" if page <= 1 else f"career-{page}.html"
+    else:
+        name = "index.html"
+    return f"{profile_id}/{name}"
+
+
+def app_link(app_url, profile_id, route):
+    query = {"route": route}
+    if profile_id != DEFAULT_PROFILE:
+        query["profile"] = profile_id
+    return f"{app_url}?{urlencode(query)}"
+
+
+def page_links(profile_id, app_url):
+    """정적 페이지 안의 링크 — 정적 화면끼리는 상대 경로, 나머지는 앱으로"""
+    def link(route, page=1):
+        if route in STATIC_ROUTES:
+            return static_page_path(profile_id, route, page).split("/", 1)[1]
+        return app_link(app_url, profile_id, route)
+    return link
+
+
+# -----------------------------
+# 렌더링
+# -----------------------------
+def render_document(title, body, name):
+    return f"""<!doctype html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{escape(title)}</title>
+{BASE_CSS}{GLOBAL_CSS}
+</head>
+<body>
+<main>
+{body}
+</main>
+<footer>© {escape(name)} — 자기소개</footer>
+</body>
+</html>
+"""
+
+
+def render_home(profile, link):
+    body = HOME_INTRO_HTML + menu_html(link)
+    return render_document(profile.get("이름", "QR Landing"), body, profile.get("이름", ""))
+
+
+def picture_html(image):
+    """<picture> — WebP 를 지원하면 WebP, 아니면 JPEG. 화면 배율에 맞춰 1x/2x 선택"""
+    def srcset(format):
+        return ", ".join(f"img/{v.filename()} {v.scale}x" for v in image.variants if v.format == format)
+
+    base = image.variant("jpeg", scale=1)
+    return f"""<picture>
+            <source type="image/webp" srcset="{srcset('webp')}">
+            <img src="img/{base.filename()}" srcset="{srcset('jpeg')}" alt="프로필 사진"
+                 width="{base.width}" height="{base.height}" decoding="async">
+        </picture>"""
+
+
+def render_about(profile, image, link):
+    buttons = "".join(
+        f'<a class="btn" href="{escape(url)}">{escape(label)}</a>' for label, url in contact_links(profile)
+    )
+    body = f"""
+<p><a href="{link('home')}">⬅️ 홈으로</a></p>
+<div class="content">
+<h2>소개 (About Me)</h2>
+<div class="columns">
+    <div class="left">{info_card_html(profile)}</div>
+    <div class="right">
+        {picture_html(image)}
+        <div class="caption">{"프로필 사진 (준비중)" if image.placeholder else "프로필 사진"}</div>
+    </div>
+</div>
+<hr>
+<h3>연락</h3>
+<p>{buttons}</p>
+</div>
+"""
+    return render_document(f"소개 | {profile.get('이름', '')}", body, profile.get("이름", ""))
+
+
+def render_career(profile, career_df, link, page_size=CAREER_PAGE_SIZE):
+    """경력 페이지 목록 [(페이지 번호, html)] — 비어 있어도 1페이지는 만든다"""
+    items = render_career_html_items(career_df)
+    pages = [items[i:i + page_size] for i in range(0, len(items), page_size)] if page_size else [items]
+    pages = pages or [[]]
+
+    rendered = []
+    for number, page_items in enumerate(pages, start=1):
+        nav = []
+        if number > 1:
+            nav.append(f'<a href="{link("career", number - 1)}">◀ 이전</a>')
+        nav.append(f"{number} / {len(pages)}")
+        if number < len(pages):
+            nav.append(f'<a href="{link("career", number + 1)}">다음 ▶</a>')
+        body = f"""
+<p><a href="{link('home')}">⬅️ 홈으로</a></p>
+<h2>경력 상세</h2>
+<ul class="career">{"".join(page_items)}</ul>
+{"<hr><p>" + " | ".join(nav) + "</p>" if len(pages) > 1 else ""}
+"""
+        rendered.append((number, render_document(f"경력 | {profile.get('이름', '')}", body, profile.get("이름", ""))))
+    return rendered
+
+
+# -----------------------------
+# 내보내기
+# -----------------------------
+def write_atomic(path, text):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)   # 서빙 중인 파일을 반쯤 쓴 상태로 보이지 않게
+
+
+_images = None
+
+
+def default_images():
+    global _images
+    if _images is None:
+        _images = ImagePipeline()
+    return _images
+
+
+def export_images(image, target):
+    """변형 파일을 img/ 에 쓰고, 이번 변형에 없는 옛 파일은 지운다"""
+    img_dir = os.path.join(target, "img")
+    os.makedirs(img_dir, exist_ok=True)
+    names = set()
+    for variant in image.variants:
+        name = variant.filename()
+        names.add(name)
+        path = os.path.join(img_dir, name)
+        if not os.path.exists(path):
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(variant.data)
+            os.replace(f"{path}.tmp", path)
+    for name in os.listdir(img_dir):
+        if name not in names:
+            os.remove(os.path.join(img_dir, name))
+
+
+def export_profile(runtime, out_dir=DEFAULT_OUT_DIR, app_url=DEFAULT_APP_URL,
+                   page_size=CAREER_PAGE_SIZE, force=False, images=None):
+    """프로필 1개의 홈/소개/경력을 HTML 로 저장. 내용이 그대로면 건너뛰고 False"""
+    store = runtime.store
+    image = (images or default_images()).get(runtime.source.image_url)
+    stamp = f"{store.content_key(('profile', 'career'))}|{image.key}|{app_url}|{page_size}|{RENDER_VERSION}"
+    target = os.path.join(out_dir, runtime.id)
+    stamp_path = os.path.join(target, ".version")
+    if not force and os.path.exists(stamp_path):
+        with open(stamp_path, encoding="utf-8") as f:
+            if f.read() == stamp:
+                return False
+
+    os.makedirs(target, exist_ok=True)
+    export_images(image, target)
+    profile = store.get("profile")
+    link = page_links(runtime.id, app_url)
+    pages = {
+        "home": render_home(profile, link),
+        "about": render_about(profile, image, link),
+    }
+    for route, html in pages.items():
+        write_atomic(os.path.join(out_dir, static_page_path(runtime.id, route)), html)
+
+    career_pages = render_career(profile, store.get("career"), link, page_size)
+    for number, html in career_pages:
+        write_atomic(os.path.join(out_dir, static_page_path(runtime.id, "career", number)), html)
+    # 경력이 줄어 남은 옛 페이지 정리
+    number = len(career_pages) + 1
+    while os.path.exists(os.path.join(out_dir, static_page_path(runtime.id, "career", number))):
+        os.remove(os.path.join(out_dir, static_page_path(runtime.id, "career", number)))
+        number += 1
+
+    write_atomic(stamp_path, stamp)
+    return True
+
+
+def export_on_change(runtime, **kwargs):
+    """지금 한 번 내보내고, 이후 시트가 바뀔 때마다 다시 내보낸다 (ProfilePool on_load 용)"""
+    export_profile(runtime, **kwargs)
+    runtime.store.add_listener(lambda changed: export_profile(runtime, **kwargs))
+
+
+# -----------------------------
+# 서버
+# -----------------------------
+class SiteHandler(http.server.SimpleHTTPRequestHandler):
+    app_url = DEFAULT_APP_URL
+
+    def do_GET(self):
+        if self._route():
+            super().do_GET()
+
+    def do_HEAD(self):
+        if self._route():
+            super().do_HEAD()
+
+    def _route(self):
+        """기존 ?route= 주소를 정적 파일 경로로 바꾼다. 앱으로 보냈거나 거절했으면 False"""
+        parts = urlsplit(self.path)
+        if parts.path != "/":
+            # 내보내는 중인 임시 파일, .git 등 점으로 시작하는 경로는 없는 파일처럼
+            if any(segment.startswith(".") for segment in unquote(parts.path).split("/")):
+                self.send_error(404)
+                return False
+            return True
+        query = parse_qs(parts.query)
+        route = query.get("route", ["home"])[0]
+        profile_id = query.get("profile", [DEFAULT_PROFILE])[0]
+        if route in STATIC_ROUTES and PROFILE_ID_RE.match(profile_id):
+            page = query.get("page", ["1"])[0]
+            self.path = "/" + static_page_path(profile_id, route, int(page) if page.isdigit() else 1)
+            return True
+        self.send_response(302)
+        self.send_header("Location", f"{self.app_url}?{parts.query}" if parts.query else self.app_url)
+        self.end_headers()
+        return False
+
+    def list_directory(self, path):
+        # index.html 이 없는 폴더는 목록 대신 404 (내보낸 파일 구성을 드러내지 않음)
+        self.send_error(404)
+        return None
+
+    def end_headers(self):
+        if "/img/" in self.path:
+            # 파일명에 내용 해시가 들어 있어 바뀌면 주소도 바뀐다
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        elif self.path.endswith(".html"):
+            # 짧게 캐시 + 만료 후에는 재검증 동안 옛 페이지 사용 (Last-Modified 로 304)
+            self.send_header("Cache-Control", "public, max-age=60, stale-while-revalidate=600")
+        super().end_headers()
+
+
+def serve(out_dir, port, app_url):
+    handler = functools.partial(type("Handler", (SiteHandler,), {"app_url": app_url}), directory=out_dir)
+    httpd = http.server.ThreadingHTTPServer(("", port), handler)
+    print(f"정적 페이지 서빙: http://localhost:{port}/  ({out_dir})")
+    httpd.serve_forever()
+
+
+def keep_fresh(pool, profile_ids, interval):
+    # 모든 프로필을 주기적으로 열어 둔다 — 메모리 예산으로 내려간 프로필도 다시 올라와 갱신됨
+    while True:
+        time.sleep(interval)
+        for profile_id in profile_ids:
+            pool.get(profile_id)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="홈/소개/경력 정적 페이지 내보내기")
+    parser.add_argument("command", choices=["build", "serve"])
+    parser.add_argument("--out", default=DEFAULT_OUT_DIR, help="출력 폴더")
+    parser.add_argument("--app-url", default=DEFAULT_APP_URL, help="질문/기타 페이지를 처리할 Streamlit 앱 주소")
+    parser.add_argument("--profiles", default=os.environ.get("QR_LANDING_PROFILES", os.path.join(APP_DIR, "profiles.json")))
+    parser.add_argument("--profile", action="append", help="특정 프로필만 (여러 번 지정 가능)")
+    parser.add_argument("--force", action="store_true", help="내용이 같아도 다시 내보내기")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--interval", type=int, default=300, help="serve: 시트 변경 확인 주기 (초)")
+    args = parser.parse_args(argv)
+
+    if os.path.exists(args.profiles):
+        load_profiles_file(args.profiles)
+    profile_ids = args.profile or list(PROFILES)
+    options = {"out_dir": args.out, "app_url": args.app_url}
+
+    if args.command == "build":
+        pool = ProfilePool([], cache_dir=CACHE_DIR)
+        for profile_id in profile_ids:
+            runtime = pool.get(profile_id)
+            if runtime is None:
+                print(f"등록되지 않은 프로필: {profile_id}", file=sys.stderr)
+                continue
+            written = export_profile(runtime, force=args.force, **options)
+            print(f"{profile_id}: {'내보냄' if written else '변경 없음'}")
+        return 0
+
+    pool = ProfilePool([], cache_dir=CACHE_DIR, on_load=lambda runtime: export_on_change(runtime, **options))
+    pool.start()
+    for profile_id in profile_ids:
+        pool.get(profile_id)
+    threading.Thread(target=keep_fresh, args=(pool, profile_ids, args.interval), daemon=True).start()
+    serve(args.out, args.port, args.app_url)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+import time
+
+import answer_cache
+from answer_cache import AnswerCache, normalize_question
+from shared_cache import MemoryCache
+
+
+def test_normalized_question_hits():
+    cache = AnswerCache()
+    cache.put("MBTI가 어떻게 되나요?", "v1", "INTJ 입니다.")
+
+    assert normalize_question("MBTI가 어떻게 되나요?") == "mbti가어떻게되나요"
+    assert cache.get("mbti가  어떻게 되나요", "v1") == "INTJ 입니다."
+    assert cache.stats()["hits"] == 1
+
+
+def test_near_duplicate_question_hits_and_threshold_off_does_not():
+    cache = AnswerCache(similarity=0.8)
+    cache.put("MBTI가 어떻게 되나요?", "v1", "INTJ 입니다.")
+    assert cache.get("MBTI는 어떻게 되나요", "v1") == "INTJ 입니다."
+    assert cache.stats()["near_hits"] == 1
+    assert cache.get("취미는 뭐에요?", "v1") is None
+
+    exact = AnswerCache(similarity=None)
+    exact.put("MBTI가 어떻게 되나요?", "v1", "INTJ 입니다.")
+    assert exact.get("MBTI는 어떻게 되나요", "v1") is None
+
+
+def test_new_sheet_version_misses():
+    cache = AnswerCache()
+    cache.put("취미는 뭐에요?", "v1", "등산")
+
+    assert cache.get("취미는 뭐에요?", "v2") is None
+
+
+def test_closest_answer_for_fallback_ignores_threshold_and_expiry(monkeypatch):
+    cache = AnswerCache(ttl=60)
+    cache.put("취미는 뭐에요?", "v1", "등산")
+    later = time.time() + 120
+    monkeypatch.setattr(answer_cache.time, "time", lambda: later)
+
+    assert cache.get("취미가 뭐에요", "v1") is None
+    assert cache.closest("취미가 뭐에요", "v1") == "등산"
+    assert cache.closest("취미가 뭐에요", "v2") is None
+
+
+def test_lru_and_ttl_eviction():
+    cache = AnswerCache(maxsize=2, similarity=None)
+    cache.put("질문 하나", "v1", "1")
+    cache.put("질문 둘", "v1", "2")
+    cache.get("질문 하나", "v1")   # 최근 사용
+    cache.put("질문 셋", "v1", "3")
+
+    assert cache.get("질문 둘", "v1") is None
+    assert cache.get("질문 하나", "v1") == "1"
+
+    expired = AnswerCache(ttl=-1)
+    expired.put("질문", "v1", "답")
+    assert expired.get("질문", "v1") is None
+
+
+def test_prewarm_builds_only_missing_answers():
+    cache = AnswerCache()
+    cache.put("이름", "v1", "백민")
+    calls = []
+
+    def answer(question):
+        calls.append(question)
+        return f"답: {question}"
+
+    assert cache.prewarm(["이름", "직업"], answer, "v1") == 1
+    assert calls == ["직업"]
+    assert cache.get("직업", "v1") == "답: 직업"
+
+
+def test_answer_from_another_worker_is_found_by_point_lookup():
+    shared = MemoryCache()
+    worker_a = AnswerCache(backend=shared)
+    worker_b = AnswerCache(backend=shared)
+    worker_a.put("이름이 뭐에요?", "v1", "백민")
+
+    assert worker_b.get("이름이 뭐에요?", "v1") == "백민"
+    assert worker_b.stats()["shared_hits"] == 1
+
+
+def test_prewarm_only_builds_missing_answers_once_across_workers():
+    shared = MemoryCache()
+    calls = []
+
+    def answer(question):
+        calls.append(question)
+        return f"답: {question}"
+
+    faq = ["이름", "직업", "취미"]
+    assert AnswerCache(backend=shared).prewarm(faq, answer, "v1") == 3
+    assert AnswerCache(backend=shared).prewarm(faq, answer, "v1") == 0
+    assert calls == faq
@@ -0,0 +1,47 @@
+import pytest
+
+from intent_router import IntentRouter
+
+PROFILE = {
+    "이름": "백민",
+    "직업": "자동화개발자",
+    "사는곳": "서울 송파구",
+    "취미": "러닝",
+    "이메일": "me@example.com",
+    "mbti": "INTJ",
+}
+
+
+@pytest.fixture
+def router():
+    return IntentRouter(PROFILE)
+
+
+@pytest.mark.parametrize("question, key", [
+    ("이름이 뭐에요", "이름"),
+    ("직업이 뭐에요", "직업"),
+    ("무슨 일 하세요?", "직업"),
+    ("백민님 직업이 뭐에요?", "직업"),
+    ("어디 사세요?", "사는곳"),
+    ("취미는 뭐에요?", "취미"),
+    ("이메일 주소 알려줘", "이메일"),
+])
+def test_profile_fact_questions_are_answered_locally(router, question, key):
+    intent = router.classify(question)
+    assert intent is not None and intent.key == key
+    assert intent.value == PROFILE[key]
+
+
+@pytest.mark.parametrize("question", [
+    # 항목 앞에 다른 사람/때를 가리키는 말이 붙으면 본인 프로필 질문이 아니다
+    "팀 이름이 뭐에요?",
+    "회사 이름 알려주세요",
+    "부모님 직업이 뭐에요?",
+    "전 직업이 뭐에요?",
+    "예전 취미는 뭐에요?",
+    "취미를 시작한 계기가 뭐에요?",
+    "취미랑 사는곳 알려주세요",
+    "MBTI가 어떻게 되나요?",
+])
+def test_questions_about_something_else_go_to_llm(router, question):
+    assert router.classify(question) is None
@@ -0,0 +1,156 @@
+import threading
+import time
+import types
+
+import pytest
+
+from fake_services import FAKE_ANSWER, FakeOpenAI
+from llm_gateway import LLMGateway
+from resilience import CircuitBreaker, CircuitOpenError
+
+
+def _request(question="취미는 뭐에요?"):
+    return {"model": "gpt-4o-mini", "messages": [{"role": "user", "content": question}]}
+
+
+def _fake_client(first_token_latency=0.0):
+    client = FakeOpenAI()
+    client.completions.first_token_latency = first_token_latency
+    client.completions.token_latency = 0.0
+    return client
+
+
+class FlakyClient:
+    """create 가 errors 에 든 예외를 차례로 던지고, 다 쓰면 FakeOpenAI 처럼 답한다"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.calls = 0
+        self._fake = _fake_client()
+        self.chat = types.SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return self._fake.completions.create(**kwargs)
+
+
+# -----------------------------
+# 요청 합치기 (single-flight)
+# -----------------------------
+def test_same_request_in_flight_is_coalesced():
+    client = _fake_client(first_token_latency=0.2)
+    gateway = LLMGateway(client=client)
+
+    first = gateway.chunks(_request())
+    second = gateway.chunks(_request())
+
+    assert "".join(first) == FAKE_ANSWER
+    assert "".join(second) == FAKE_ANSWER
+    assert client.completions.calls == 1
+    assert gateway.stats()["coalesced"] == 1
+
+
+def test_concurrent_callers_share_one_upstream_call():
+    client = _fake_client(first_token_latency=0.2)
+    gateway = LLMGateway(client=client)
+    answers = []
+    threads = [threading.Thread(target=lambda: answers.append(gateway.complete(_request()))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert answers == [FAKE_ANSWER.strip()] * 5
+    assert client.completions.calls == 1
+
+
+def test_finished_request_is_called_again():
+    client = _fake_client()
+    gateway = LLMGateway(client=client)
+    gateway.complete(_request())
+    gateway.complete(_request())
+
+    assert client.completions.calls == 2
+    assert gateway.stats()["coalesced"] == 0
+
+
+def test_different_requests_are_not_coalesced():
+    client = _fake_client(first_token_latency=0.1)
+    gateway = LLMGateway(client=client)
+    a = gateway.chunks(_request("질문 A"))
+    b = gateway.chunks(_request("질문 B"))
+    "".join(a), "".join(b)
+
+    assert client.completions.calls == 2
+
+
+def test_waiters_all_receive_the_upstream_error():
+    client = FlakyClient([ValueError("bad request")])
+    gateway = LLMGateway(client=client)
+    first = gateway.chunks(_request())
+    second = gateway.chunks(_request())
+
+    for stream in (first, second):
+        with pytest.raises(ValueError):
+            "".join(stream)
+    assert client.calls == 1
+
+
+# -----------------------------
+# 회로 차단기
+# -----------------------------
+def test_transient_failures_open_the_breaker():
+    client = FlakyClient([TimeoutError("slow")] * 2)
+    gateway = LLMGateway(client=client, breaker=CircuitBreaker("openai", threshold=2, reset_timeout=60))
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            gateway.complete(_request())
+    assert gateway.breaker.state == "open"
+
+    with pytest.raises(CircuitOpenError):
+        gateway.complete(_request())
+    assert client.calls == 2   # 열린 동안은 업스트림을 부르지 않는다
+    assert gateway.stats()["circuit"]["rejected"] == 1
+
+
+def test_non_transient_errors_do_not_open_the_breaker():
+    client = FlakyClient([ValueError("bad request")] * 3)
+    gateway = LLMGateway(client=client, breaker=CircuitBreaker("openai", threshold=2, reset_timeout=60))
+
+    for _ in range(3):
+        with pytest.raises(ValueError):
+            gateway.complete(_request())
+    assert gateway.breaker.state == "closed"
+
+
+def test_half_open_trial_success_closes_the_breaker():
+    client = FlakyClient([TimeoutError("slow")])
+    gateway = LLMGateway(client=client, breaker=CircuitBreaker("openai", threshold=1, reset_timeout=0.05))
+
+    with pytest.raises(TimeoutError):
+        gateway.complete(_request())
+    assert gateway.breaker.state == "open"
+
+    time.sleep(0.06)
+    assert gateway.complete(_request()) == FAKE_ANSWER.strip()
+    assert gateway.breaker.state == "closed"
+    assert gateway.breaker.failures == 0
+
+
+def test_half_open_trial_failure_reopens():
+    breaker = CircuitBreaker("sheet", threshold=3, reset_timeout=0.05)
+    for _ in range(3):
+        breaker.record_failure()
+    assert breaker.state == "open" and breaker.opens == 1
+
+    time.sleep(0.06)
+    assert breaker.allow() is True
+    assert breaker.state == "half_open"
+    assert breaker.allow() is False   # 시험 호출은 1건만
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.opens == 2
@@ -0,0 +1,118 @@
+import json
+
+from fake_services import FAKE_PLACES, FAKE_PLACES_JSON
+from recommend import Place, dump_places, iter_places, load_places, parse_place_line, parse_places, request_places
+
+EXPECTED = (
+    Place("백민식당", "한식", "김치찌개가 맛있는 현지식당", "김치찌개", "서울 송파구 문정동 123-4"),
+    Place("문정분식", "분식", "떡볶이 맛집", "떡볶이", "서울 송파구 문정동 56"),
+    Place("가락국수", "면요리", "멸치육수 국수", "잔치국수", "서울 송파구 가락동 78"),
+)
+
+
+def _pieces(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+# -----------------------------
+# JSON (구조화 출력)
+# -----------------------------
+def test_json_response():
+    assert parse_places(FAKE_PLACES_JSON) == EXPECTED
+
+
+def test_json_stream_emits_each_place_when_its_object_closes():
+    seen = []   # Place 가 나올 때까지 넘긴 조각 수
+    fed = []
+
+    def chunks():
+        for piece in _pieces(FAKE_PLACES_JSON, 5):
+            fed.append(piece)
+            yield piece
+
+    for place in iter_places(chunks()):
+        seen.append(len(fed))
+    assert len(seen) == 3
+    # 첫 카드는 응답이 끝나기 훨씬 전에 나온다
+    assert seen[0] < len(fed) / 2
+
+
+def test_json_with_braces_and_escapes_inside_strings():
+    text = json.dumps({"places": [{"name": "카페 {괄호}", "kind": "카페", "description": '따옴표 \\" 와 } 포함',
+                                   "highlight": "라떼", "address": "서울"}]}, ensure_ascii=False)
+    places = tuple(iter_places(_pieces(text, 3)))
+    assert [p.name for p in places] == ["카페 {괄호}"]
+    assert places[0].description == '따옴표 \\" 와 } 포함'
+
+
+def test_json_skips_objects_without_name():
+    text = json.dumps({"places": [{"name": "", "kind": "x"}, {"name": "오죽헌", "unknown": 1}]}, ensure_ascii=False)
+    assert parse_places(text) == (Place("오죽헌"),)
+
+
+# -----------------------------
+# 줄 형식 ("이름 | 종류 | 소개 | 대표 | 주소")
+# -----------------------------
+def test_line_format_response():
+    assert parse_places(FAKE_PLACES) == EXPECTED
+
+
+def test_line_format_stream_matches_whole_parse():
+    assert tuple(iter_places(_pieces(FAKE_PLACES, 7))) == EXPECTED
+
+
+def test_line_format_ignores_preamble_and_markdown():
+    text = "추천 맛집입니다!\n\n- **백민식당** | 한식 | 소개 | 김치찌개 | 서울 | 송파구\n감사합니다."
+    assert parse_places(text) == (Place("백민식당", "한식", "소개", "김치찌개", "서울 송파구"),)
+
+
+def test_dash_separated_line_keeps_hyphenated_address():
+    assert parse_place_line("1) 백민식당 - 한식 - 소개 - 김치찌개 - 문정동 123-4") == Place(
+        "백민식당", "한식", "소개", "김치찌개", "문정동 123-4"
+    )
+
+
+def test_last_line_without_newline():
+    assert parse_places("1. 오죽헌 | 유적지 | 율곡 생가") == (Place("오죽헌", "유적지", "율곡 생가"),)
+
+
+# -----------------------------
+# 코드 블록 / 형식 섞임
+# -----------------------------
+def test_json_inside_code_fence():
+    assert parse_places(f"```json\n{FAKE_PLACES_JSON}\n```") == EXPECTED
+
+
+def test_line_format_inside_code_fence():
+    assert parse_places(f"```\n{FAKE_PLACES}```") == EXPECTED
+
+
+def test_json_after_preamble():
+    assert parse_places(f"다음은 추천 결과입니다:\n{FAKE_PLACES_JSON}") == EXPECTED
+
+
+def test_unparseable_response_is_empty():
+    assert parse_places("죄송합니다. 지금은 추천할 수 없습니다.") == ()
+    assert parse_places("") == ()
+
+
+# -----------------------------
+# 저장 / 재요청
+# -----------------------------
+def test_dump_and_load_round_trip():
+    assert load_places(dump_places(EXPECTED)) == EXPECTED
+
+
+def test_request_places_retries_once_when_nothing_parsed():
+    replies = ["죄송합니다.", FAKE_PLACES_JSON]
+    requests = []
+
+    def complete(request):
+        requests.append(request)
+        return replies.pop(0)
+
+    places, raw_text, attempts = request_places(complete, "서울 송파구", "맛집 추천 ")
+    assert places == EXPECTED
+    assert raw_text == FAKE_PLACES_JSON
+    assert attempts == 2
+    assert requests[0]["response_format"]["type"] == "json_schema"
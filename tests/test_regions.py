@@ -0,0 +1,44 @@
+from recommend import Place
+from recommend_store import RecommendationStore, region_key
+from regions import Gazetteer
+
+ROWS = [
+    (4500000000, "전라북도"),
+    (4511000000, "전주시"),
+    (2600000000, "부산광역시"),
+    (2611000000, "중구"),
+    (2700000000, "대구광역시"),
+    (2711000000, "중구"),
+    (2711051000, "동인동"),
+]
+
+
+def test_children_are_per_parent_and_level_comes_from_code():
+    regions = Gazetteer(ROWS)
+    daegu_jung = regions.find(2711000000)
+
+    assert [regions.name(n) for n in regions.roots()] == ["부산광역시", "대구광역시", "전라북도"]
+    assert [regions.name(n) for n in regions.children(daegu_jung)] == ["동인동"]
+    assert not regions.children(regions.find(2611000000))
+    assert regions.level(regions.find(2711051000)) == 3
+    assert regions.is_partial()
+
+
+def test_search_scopes_by_ancestor():
+    regions = Gazetteer(ROWS)
+
+    assert [regions.label(n) for n in regions.search("대구 중구")] == ["대구광역시 중구"]
+    assert [regions.label(n) for n in regions.search("ㄷㅇ")] == ["대구광역시 중구 동인동"]
+
+
+def test_stored_recommendation_survives_a_rename(tmp_path):
+    store = RecommendationStore(str(tmp_path / "recommendations.sqlite"))
+    before = Gazetteer(ROWS)
+    node = before.find(4511000000)
+    store.put(region_key(before.codes[node], "맛집"), (Place("한옥식당", "한식"),))
+
+    # 코드는 그대로 이름만 바뀐 자료로 다시 만들어도 같은 추천을 찾는다
+    after = Gazetteer([(code, "전북특별자치도" if name == "전라북도" else name) for code, name in ROWS])
+    node = after.find(4511000000)
+    assert after.label(node) == "전북특별자치도 전주시"
+    assert store.get(region_key(after.codes[node], "맛집 추천 ")) == (Place("한옥식당", "한식"),)
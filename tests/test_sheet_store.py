@@ -0,0 +1,214 @@
+import hashlib
+import threading
+import time
+
+import pytest
+import requests
+
+from fake_services import SheetServer
+from sheet_registry import SheetSpec
+from shared_cache import MemoryCache
+from sheet_store import SheetStore
+
+URL = "http://sheets.test/people.csv"
+
+
+def _response(status_code, content=b"", headers=None):
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp._content = content
+    resp.headers.update(headers or {})
+    resp.url = URL
+    return resp
+
+
+class FakeSession:
+    """구글 시트 CSV export 흉내 — ETag 가 맞으면 304 (honor_etag=False 면 조건부 요청을 무시)"""
+
+    def __init__(self, body, etag='"v1"', honor_etag=True):
+        self.body = body
+        self.etag = etag
+        self.honor_etag = honor_etag
+        self.error = None
+        self.requests = []   # 요청마다 보낸 헤더
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(dict(headers or {}))
+        if self.error is not None:
+            raise self.error
+        if self.honor_etag and (headers or {}).get("If-None-Match") == self.etag:
+            return _response(304)
+        return _response(200, self.body, {"ETag": self.etag})
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, raw):
+        self.calls += 1
+        return tuple(raw.decode().splitlines())
+
+
+def row_pieces(rows):
+    return {f"row:{row.split(',')[0]}": hashlib.sha256(row.encode()).hexdigest() for row in rows}
+
+
+def make_store(session, parser=None, **kwargs):
+    spec = SheetSpec(name="people", url=URL, parser=parser or CountingParser(), pieces=row_pieces)
+    return SheetStore([spec], session=session, attempts=1, **kwargs)
+
+
+def test_first_refresh_installs_snapshot_and_validators():
+    session = FakeSession(b"a,1\nb,2")
+    store = make_store(session)
+
+    assert store.refresh("people") is True
+    assert store.get("people") == ("a,1", "b,2")
+    assert store.snapshot("people").etag == '"v1"'
+    assert store.snapshot("people").diff is None
+    assert "If-None-Match" not in session.requests[0]
+
+
+def test_not_modified_keeps_snapshot_without_reparsing():
+    parser = CountingParser()
+    session = FakeSession(b"a,1\nb,2")
+    store = make_store(session, parser=parser)
+    store.refresh("people")
+    first = store.snapshot("people")
+    checked_at = first.fetched_at
+
+    assert store.refresh("people") is False
+    assert session.requests[-1]["If-None-Match"] == '"v1"'
+    assert parser.calls == 1
+    assert store.snapshot("people") is first
+    assert first.fetched_at >= checked_at
+
+
+def test_same_body_without_conditional_support_skips_parse():
+    parser = CountingParser()
+    session = FakeSession(b"a,1\nb,2", honor_etag=False)
+    store = make_store(session, parser=parser)
+    store.refresh("people")
+
+    session.etag = '"v2"'
+    assert store.refresh("people") is False
+    assert parser.calls == 1
+    # 다음 조건부 요청은 새 ETag 로
+    assert store.snapshot("people").etag == '"v2"'
+
+
+def test_changed_body_reports_piece_diff_and_keys():
+    session = FakeSession(b"a,1\nb,2\nc,3")
+    store = make_store(session)
+    store.refresh("people")
+    key_a = store.content_key(["people:row:a"])
+    key_b = store.content_key(["people:row:b"])
+    key_all = store.content_key(["people"])
+
+    session.body, session.etag = b"a,1\nb,20\nd,4", '"v2"'
+    assert store.refresh("people") is True
+
+    diff = store.snapshot("people").diff
+    assert diff.changed == ("row:b",)
+    assert diff.added == ("row:d",)
+    assert diff.removed == ("row:c",)
+    assert store.health()["sheets"]["people"]["last_diff"] == {"added": 1, "removed": 1, "changed": 1}
+    # 파생 캐시는 읽는 조각이 그대로면 같은 키
+    assert store.content_key(["people:row:a"]) == key_a
+    assert store.content_key(["people:row:b"]) != key_b
+    assert store.content_key(["people"]) != key_all
+
+
+def test_failed_refresh_keeps_serving_last_snapshot():
+    session = FakeSession(b"a,1")
+    store = make_store(session)
+    store.refresh("people")
+
+    session.error = requests.ConnectionError("boom")
+    assert store.refresh_sheet("people") is False
+    assert store.get("people") == ("a,1",)
+    assert "ConnectionError" in store.health()["sheets"]["people"]["last_error"]
+
+
+def test_disk_snapshot_starts_without_network(tmp_path):
+    path = str(tmp_path / "sheets.pkl")
+    store = make_store(FakeSession(b"a,1\nb,2"), snapshot_path=path)
+    store.refresh_all()   # 바뀐 시트가 있으면 스냅샷 저장
+
+    offline = FakeSession(b"")
+    offline.error = requests.ConnectionError("offline")
+    restarted = make_store(offline, snapshot_path=path)
+    restarted.start(background=False)
+
+    assert offline.requests == []
+    assert restarted.get("people") == ("a,1", "b,2")
+    assert restarted.snapshot("people").etag == '"v1"'
+
+
+def test_shared_cold_start_reuses_other_workers_fetch():
+    cache = MemoryCache()
+    first, second = FakeSession(b"a,1"), FakeSession(b"a,1")
+    assert make_store(first, cache=cache).refresh_shared("people") is True
+
+    other = make_store(second, cache=cache)
+    assert other.refresh_shared("people") is True
+    assert other.get("people") == ("a,1",)
+    assert second.requests == []
+
+
+def test_shared_cold_start_waits_for_owner_then_adopts():
+    cache = MemoryCache()
+    fetching, finish = threading.Event(), threading.Event()
+
+    class SlowSession(FakeSession):
+        def get(self, url, headers=None, timeout=None):
+            fetching.set()
+            finish.wait(5)
+            return super().get(url, headers, timeout)
+
+    owner = threading.Thread(target=make_store(SlowSession(b"a,1"), cache=cache).refresh_shared, args=("people",))
+    owner.start()
+    fetching.wait(5)
+    threading.Timer(0.3, finish.set).start()
+
+    session = FakeSession(b"a,1")
+    waiter = make_store(session, cache=cache)
+    assert waiter.refresh_shared("people") is True
+    owner.join()
+    assert waiter.get("people") == ("a,1",)
+    assert session.requests == []
+
+
+def test_shared_cold_start_falls_back_as_soon_as_owner_gives_up():
+    cache = MemoryCache()
+    key = f"sheet:{URL}"
+    assert cache.acquire(key, "other-worker", 60)
+    threading.Timer(0.3, cache.release, args=(key, "other-worker")).start()   # 아무것도 못 쓰고 실패
+
+    session = FakeSession(b"a,1")
+    store = make_store(session, cache=cache)
+    started = time.time()
+    assert store.refresh_shared("people") is True
+    assert time.time() - started < 5   # 잠금 기한(60초)까지 기다리지 않는다
+    assert store.get("people") == ("a,1",)
+    assert len(session.requests) == 1
+
+
+@pytest.fixture
+def sheet_server():
+    with SheetServer() as server:
+        yield server
+
+
+def test_local_sheet_server_answers_304(sheet_server):
+    session = requests.Session()
+    statuses = []
+    session.hooks["response"].append(lambda resp, *args, **kwargs: statuses.append(resp.status_code))
+    spec = SheetSpec(name="career", url=sheet_server.url("career"), parser=bytes)
+    store = SheetStore([spec], session=session, attempts=1)
+
+    assert store.refresh("career") is True
+    assert store.snapshot("career").last_modified
+    assert store.refresh("career") is False
+    assert statuses == [200, 304]
@@ -0,0 +1,69 @@
+import sqlite3
+
+import pytest
+
+from rate_limit import RateRule, SQLiteBackend
+from recommend import Place
+from recommend_store import RecommendationStore
+from shared_cache import SQLiteCache
+
+KEY = (1171000000, "맛집")   # 서울특별시 송파구
+
+
+def _track_connections(monkeypatch, cls):
+    opened = []
+    connect = cls._connect
+
+    def tracked(self):
+        conn = connect(self)
+        opened.append(conn)
+        return conn
+
+    monkeypatch.setattr(cls, "_connect", tracked)
+    return opened
+
+
+def _assert_all_closed(opened):
+    assert opened
+    for conn in opened:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+
+
+def test_recommendation_store_closes_connections_and_commits(tmp_path, monkeypatch):
+    opened = _track_connections(monkeypatch, RecommendationStore)
+    path = str(tmp_path / "recommendations.sqlite")
+    store = RecommendationStore(path)
+    store.put(KEY, (Place("백민식당", "한식"),), "raw")
+
+    assert store.get(KEY) == (Place("백민식당", "한식"),)
+    assert store.fresh_keys() == {KEY}
+    _assert_all_closed(opened)
+    # 다른 연결(다른 워커)에서도 보인다
+    assert RecommendationStore(path).get(KEY) == (Place("백민식당", "한식"),)
+
+
+def test_rate_limit_backend_closes_connections(tmp_path, monkeypatch):
+    opened = _track_connections(monkeypatch, SQLiteBackend)
+    backend = SQLiteBackend(str(tmp_path / "rate.sqlite"))
+    rule = RateRule(capacity=1, per=60)
+
+    assert backend.take("client", rule)[0] is True
+    assert backend.take("client", rule)[0] is False
+    backend.prune()
+    _assert_all_closed(opened)
+
+
+def test_shared_cache_closes_connections(tmp_path, monkeypatch):
+    opened = _track_connections(monkeypatch, SQLiteCache)
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    cache.put("answer:v1:q", "a", ttl=60)
+
+    assert cache.get("answer:v1:q") == "a"
+    assert [key for key, _, _ in cache.scan("answer:v1:")] == ["answer:v1:q"]
+    with cache.lease("sheet:x", 10) as owned:
+        assert owned
+        assert cache.held("sheet:x")
+    assert not cache.held("sheet:x")
+    cache.prune()
+    _assert_all_closed(opened)
@@ -0,0 +1,60 @@
+import functools
+import http.server
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from static_site import SiteHandler
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+_opener = urllib.request.build_opener(_NoRedirect)
+
+
+@pytest.fixture
+def site(tmp_path):
+    (tmp_path / "default").mkdir()
+    (tmp_path / "default" / "index.html").write_text("<p>home</p>", encoding="utf-8")
+    (tmp_path / "default" / "img").mkdir()
+    (tmp_path / "default" / "img" / "photo.abc123.jpg").write_bytes(b"jpg")
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".git" / "config").write_text("secret", encoding="utf-8")
+    (tmp_path / "default" / ".index.html.tmp").write_text("partial", encoding="utf-8")
+
+    handler_cls = type("Handler", (SiteHandler,), {"app_url": "http://app.test/", "log_message": lambda *a: None})
+    httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(handler_cls, directory=str(tmp_path)))
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _status(url):
+    try:
+        with _opener.open(url, timeout=5) as resp:
+            return resp.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_serves_exported_pages_and_routes(site):
+    assert _status(f"{site}/default/index.html") == 200
+    assert _status(f"{site}/default/img/photo.abc123.jpg") == 200
+    assert _status(f"{site}/?route=home") == 200
+    assert _status(f"{site}/?route=contact") == 302
+
+
+def test_directory_without_index_is_not_listed(site):
+    assert _status(f"{site}/default/img/") == 404
+    assert _status(f"{site}/default/") == 200   # index.html 이 있으면 그대로
+
+
+@pytest.mark.parametrize("path", ["/.git/config", "/default/.index.html.tmp", "/%2Egit/config", "/default/../.git/config"])
+def test_dotfiles_are_refused(site, path):
+    assert _status(site + path) == 404
@@ -0,0 +1,43 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from tracing import PROMETHEUS_CONTENT_TYPE, Tracer, serve_metrics
+
+
+@pytest.fixture
+def metrics_server():
+    tracer = Tracer(enabled=True)
+    tracer.observe("sheet.load", 0.02)
+    tracer.incr("sheet.circuit_open")
+    httpd = serve_metrics(tracer, 0, token="s3cret")
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _get(url, token=None):
+    request = urllib.request.Request(url)
+    if token:
+        request.add_header("Authorization", f"Bearer {token}")
+    return urllib.request.urlopen(request, timeout=5)
+
+
+def test_metrics_endpoint_serves_prometheus_text(metrics_server):
+    with _get(f"{metrics_server}/metrics", token="s3cret") as resp:
+        body = resp.read().decode()
+        assert resp.headers["Content-Type"] == PROMETHEUS_CONTENT_TYPE
+    assert 'qr_span_seconds_count{span="sheet.load"} 1' in body
+    assert 'qr_events_total{name="sheet.circuit_open"} 1' in body
+
+
+@pytest.mark.parametrize("path,token,status", [
+    ("/metrics", None, 401),
+    ("/metrics", "wrong", 401),
+    ("/", "s3cret", 404),
+])
+def test_metrics_endpoint_rejects(metrics_server, path, token, status):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _get(metrics_server + path, token=token)
+    assert excinfo.value.code == status
@@ -0,0 +1,239 @@
+"""가벼운 구간 계측 (시트 로드, 컨텍스트 생성, LLM 호출, 화면 렌더)
+
+    with span("sheet.load", sheet="profile"):
+        ...
+
+- 꺼져 있으면 span() 은 공용 no-op 객체를 돌려줄 뿐이라 비용이 거의 없다
+- 켜져 있으면 구간별 히스토그램을 모으고, 지정한 파일에 JSON-lines 로도 남긴다
+- render_prometheus() 로 Prometheus 텍스트 포맷 출력 — serve_metrics() 가 /metrics HTTP 엔드포인트로 내보낸다
+  (Streamlit 화면은 HTML 이라 Prometheus 가 긁어 갈 수 없다)
+
+환경변수: QR_LANDING_TRACING=1 (켜기), QR_LANDING_TRACE_LOG=경로 (JSON-lines 로그)
+"""
+import hmac
+import http.server
+import json
+import math
+import os
+import threading
+import time
+
+# 히스토그램 버킷 상한 (초)
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum")
+
+    def __init__(self):
+        self.counts = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, upper in enumerate(BUCKETS):
+            if value <= upper:
+                self.counts[i] += 1
+                break
+
+    def quantile(self, q):
+        """버킷 기준 근사 분위수 (해당 버킷 상한값)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for upper, n in zip(BUCKETS, self.counts):
+            seen += n
+            if seen >= target:
+                return upper if upper != math.inf else BUCKETS[-2]
+        return BUCKETS[-2]
+
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "attrs", "started")
+
+    def __init__(self, tracer, name, attrs):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        self.tracer.observe(self.name, time.perf_counter() - self.started, **self.attrs)
+        return False
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    def __init__(self, enabled=False, log_path=None):
+        self.enabled = enabled
+        self.log_path = log_path
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._gauges = {}
+        self._log = None
+
+    def span(self, name, **attrs):
+        if not self.enabled:
+            return _NOOP
+        return _Span(self, name, attrs)
+
+    def observe(self, name, seconds, **attrs):
+        """구간 소요 시간 기록 (span 없이 직접 재는 값 — 예: 첫 토큰까지 시간)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            hist = self._histograms.get(name)
+            if hist is None:
+                hist = self._histograms[name] = Histogram()
+            hist.observe(seconds)
+        if self.log_path:
+            self._write({"ts": round(time.time(), 3), "span": name, "ms": round(seconds * 1000, 2), **attrs})
+
+    def incr(self, name, n=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def register_gauge(self, name, fn):
+        # fn() → {지표명: 숫자} — 캐시 적중률 등 조회 시점에 읽는 값
+        self._gauges[name] = fn
+
+    def _write(self, record):
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            if self._log is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.log_path)), exist_ok=True)
+                self._log = open(self.log_path, "a", encoding="utf-8", buffering=1)
+            self._log.write(line)
+
+    # -----------------------------
+    # 조회 / 출력
+    # -----------------------------
+    def gauges(self):
+        values = {}
+        for prefix, fn in list(self._gauges.items()):
+            try:
+                for key, value in fn().items():
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        values[f"{prefix}.{key}"] = value
+            except Exception:
+                continue
+        return values
+
+    def summary(self):
+        with self._lock:
+            spans = {
+                name: {
+                    "count": h.count,
+                    "avg_ms": round(h.sum / h.count * 1000, 2) if h.count else 0.0,
+                    "p50_ms": round(h.quantile(0.5) * 1000, 1),
+                    "p95_ms": round(h.quantile(0.95) * 1000, 1),
+                    "p99_ms": round(h.quantile(0.99) * 1000, 1),
+                }
+                for name, h in sorted(self._histograms.items())
+            }
+            counters = dict(self._counters)
+        return {"enabled": self.enabled, "spans": spans, "counters": counters, "gauges": self.gauges()}
+
+    def histogram_rows(self):
+        """화면 표시용: (구간, 버킷 상한 ms, 누적 아님 개수) 목록"""
+        rows = []
+        with self._lock:
+            for name, h in sorted(self._histograms.items()):
+                for upper, n in zip(BUCKETS, h.counts):
+                    label = "+Inf" if upper == math.inf else f"≤{upper * 1000:g}ms"
+                    rows.append({"span": name, "bucket": label, "count": n})
+        return rows
+
+    def render_prometheus(self):
+        lines = [
+            "# HELP qr_span_seconds 구간 소요 시간",
+            "# TYPE qr_span_seconds histogram",
+        ]
+        with self._lock:
+            for name, h in sorted(self._histograms.items()):
+                cumulative = 0
+                for upper, n in zip(BUCKETS, h.counts):
+                    cumulative += n
+                    le = "+Inf" if upper == math.inf else f"{upper:g}"
+                    lines.append(f'qr_span_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+                lines.append(f'qr_span_seconds_sum{{span="{name}"}} {h.sum:.6f}')
+                lines.append(f'qr_span_seconds_count{{span="{name}"}} {h.count}')
+            counters = sorted(self._counters.items())
+        lines.append("# TYPE qr_events_total counter")
+        for name, value in counters:
+            lines.append(f'qr_events_total{{name="{name}"}} {value}')
+        lines.append("# TYPE qr_gauge gauge")
+        for name, value in sorted(self.gauges().items()):
+            lines.append(f'qr_gauge{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+tracer = Tracer(
+    enabled=os.environ.get("QR_LANDING_TRACING", "") == "1",
+    log_path=os.environ.get("QR_LANDING_TRACE_LOG") or None,
+)
+span = tracer.span
+
+
+# -----------------------------
+# Prometheus 엔드포인트
+# -----------------------------
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def serve_metrics(tracer, port, host="127.0.0.1", token=None):
+    """GET /metrics 로 tracer.render_prometheus() 를 내보내는 HTTP 서버 (데몬 스레드) → 서버
+
+    기본은 127.0.0.1 에만 연다. token 을 주면 Authorization: Bearer <token> 이 맞을 때만 응답한다.
+    워커 프로세스마다 지표가 따로라서 워커마다 다른 포트로 띄운다.
+    """
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] != "/metrics":
+                self.send_error(404)
+                return
+            if token and not hmac.compare_digest(self.headers.get("Authorization", ""), f"Bearer {token}"):
+                self.send_error(401)
+                return
+            body = tracer.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", PROMETHEUS_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = http.server.ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, name="metrics-http", daemon=True).start()
+    return httpd